@@ -15,10 +15,11 @@
 from typing import Tuple
 
 # Third-party imports
+import numpy as np
 from mxnet.gluon import nn
 
 # First-party imports
-from gluonts.core.component import validated
+from gluonts.core.component import DType, validated
 from gluonts.model.common import Tensor
 
 
@@ -30,12 +31,16 @@ class Scaler(nn.HybridBlock):
     ----------
     keepdims
         toggle to keep the dimension of the input tensor.
+    dtype
+        type of the input data; the scale of float16 data is computed in
+        float32, since the sums it involves easily overflow in float16.
     """
 
-    def __init__(self, keepdims: bool = False):
+    def __init__(self, keepdims: bool = False, dtype: DType = np.float32):
 
         super().__init__()
         self.keepdims = keepdims
+        self.dtype = dtype
 
     def compute_scale(self, F, data: Tensor, observed_indicator: Tensor):
         """
@@ -85,7 +90,19 @@ class Scaler(nn.HybridBlock):
             (N, 1, C) if ``keepdims == True``.
 
         """
-        scale = self.compute_scale(F, data, observed_indicator)
+        if self.dtype == np.float16:
+            scale = F.cast(
+                self.compute_scale(
+                    F,
+                    F.cast(data, dtype="float32"),
+                    F.cast(observed_indicator, dtype="float32"),
+                ),
+                dtype="float16",
+            )
+            # the smallest scales are not representable in float16
+            scale = F.maximum(scale, float(np.finfo(np.float16).tiny))
+        else:
+            scale = self.compute_scale(F, data, observed_indicator)
 
         if self.keepdims:
             scale = scale.expand_dims(axis=1)
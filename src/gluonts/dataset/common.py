@@ -12,6 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import itertools
 import shutil
 from enum import Enum
 from functools import lru_cache
@@ -195,8 +196,20 @@ class FileDataset(Dataset):
             raise OSError(f"no valid file found in {path}")
 
     def __iter__(self) -> Iterator[DataEntry]:
+        return self.shard(0, 1)
+
+    def shard(self, shard_id: int, num_shards: int) -> Iterator[DataEntry]:
+        """
+        Iterates over every `num_shards`-th entry of the dataset, starting at
+        `shard_id`; the lines of the other entries are not decoded.
+        """
+        entry_numbers = itertools.count()
+
+        def keep(line_number: int) -> bool:
+            return next(entry_numbers) % num_shards == shard_id
+
         for path in self.files():
-            for line in jsonl.JsonLinesFile(path):
+            for line in jsonl.JsonLinesFile(path).lines(keep):
                 data = self.process(line.content)
                 data["source"] = SourceContext(
                     source=line.span.path, row=line.span.line
@@ -451,6 +464,9 @@ def load_datasets(
     """
     Loads a dataset given metadata, train and test path.
 
+    The train and test paths may contain either JSON Lines files or a dataset
+    in the columnar binary format (see `gluonts.dataset.memmap`).
+
     Parameters
     ----------
     metadata
@@ -465,9 +481,17 @@ def load_datasets(
     TrainDatasets
         An object collecting metadata, training data, test data.
     """
+    # imported here, as gluonts.dataset.memmap depends on this module
+    from gluonts.dataset.memmap import MemmapDataset
+
+    def load_dataset(path: Path, freq: str) -> Dataset:
+        if MemmapDataset.is_valid(path):
+            return MemmapDataset(path, freq)
+        return FileDataset(path, freq)
+
     meta = MetaData.parse_file(Path(metadata) / "metadata.json")
-    train_ds = FileDataset(train, meta.freq)
-    test_ds = FileDataset(test, meta.freq) if test else None
+    train_ds = load_dataset(train, meta.freq)
+    test_ds = load_dataset(test, meta.freq) if test else None
 
     return TrainDatasets(metadata=meta, train=train_ds, test=test_ds)
 
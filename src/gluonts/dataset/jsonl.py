@@ -14,7 +14,7 @@
 # Standard library imports
 import functools
 from pathlib import Path
-from typing import NamedTuple
+from typing import Callable, Iterator, NamedTuple, Optional
 
 # Third-party imports
 import ujson as json
@@ -58,8 +58,20 @@ class JsonLinesFile:
         self.path = path
 
     def __iter__(self):
+        return self.lines()
+
+    def lines(
+        self, keep: Optional[Callable[[int], bool]] = None
+    ) -> Iterator[Line]:
+        """
+        Iterates over the lines of the file, or only over the ones whose
+        (1-based) number `keep` returns True for, if given: the other lines
+        are skipped without being decoded.
+        """
         with open(self.path) as jsonl_file:
             for line_number, raw in enumerate(jsonl_file, start=1):
+                if keep is not None and not keep(line_number):
+                    continue
                 span = Span(path=self.path, line=line_number)
                 try:
                     yield Line(json.loads(raw), span=span)
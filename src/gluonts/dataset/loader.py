@@ -13,8 +13,19 @@
 
 # Standard library imports
 import itertools
+import multiprocessing as mp
+import sys
+import traceback
 from collections import defaultdict
-from typing import Any, Dict, Iterable, Iterator, List, Optional  # noqa: F401
+from typing import (  # noqa: F401
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 # Third-party imports
 import mxnet as mx
@@ -22,8 +33,10 @@ import numpy as np
 
 # First-party imports
 from gluonts.core.component import DType
-from gluonts.dataset.common import DataEntry, Dataset
-from gluonts.transform import Transformation
+from gluonts.dataset.common import DataEntry, Dataset, FileDataset
+from gluonts.dataset.memmap import MemmapDataset
+from gluonts.support.shared_memory import ArrayRingBuffer
+from gluonts.transform import Chain, InstanceSplitter, Transformation
 
 DataBatch = Dict[str, Any]
 
@@ -59,10 +72,7 @@ class BatchBuffer:
 
     def stack(self, xs):
         if isinstance(xs[0], np.ndarray):
-            data = np.asarray(xs)
-            if data.dtype.kind == "f":
-                data = data.astype(self.dtype)
-            return mx.nd.array(data, dtype=data.dtype, ctx=self.ctx)
+            return self.as_nd(np.asarray(xs))
         elif isinstance(xs[0], mx.nd.NDArray):
             return mx.nd.stack(*xs)
         elif isinstance(xs[0], list):
@@ -78,6 +88,133 @@ class BatchBuffer:
             li = self._buffers[key]
             self._buffers[key] = [li[i] for i in perm]
 
+    def as_nd(self, data: np.ndarray) -> mx.nd.NDArray:
+        if data.dtype.kind == "f":
+            data = data.astype(self.dtype)
+        return mx.nd.array(data, dtype=data.dtype, ctx=self.ctx)
+
+
+class InstanceBatchBuffer(BatchBuffer):
+    """
+    Buffers the (entry, index) pairs yielded by
+    `InstanceSplitter.sample_instances`, and splits them with
+    `InstanceSplitter.split_batch` when a batch is emitted.
+    """
+
+    def __init__(
+        self,
+        splitter: InstanceSplitter,
+        batch_size: int,
+        ctx: mx.Context,
+        dtype: DType = np.float32,
+    ) -> None:
+        super().__init__(batch_size, ctx, dtype)
+        self.splitter = splitter
+        self._instances: List[Tuple[DataEntry, int]] = []
+
+    def add(self, instance: Tuple[DataEntry, int]):
+        self._instances.append(instance)
+        self._size += 1
+
+    def next_batch(self) -> DataBatch:
+        assert self._size > 0
+        n = min(self._size, self.batch_size)
+        data, indices = zip(*self._instances[:n])
+        self._instances = self._instances[n:]
+        self._size -= n
+        return {
+            k: self.as_nd(v) if isinstance(v, np.ndarray) else self.stack(v)
+            for k, v in self.splitter.split_batch(list(data), indices).items()
+        }
+
+    def shuffle(self):
+        perm = np.random.permutation(self._size)
+        self._instances = [self._instances[i] for i in perm]
+
+
+class WorkerError:
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def _iterate_forever(collection: Iterable[DataEntry]) -> Iterator[DataEntry]:
+    # iterate forever over the collection, the collection must be non empty
+    while True:
+        try:
+            first = next(iter(collection))
+        except StopIteration:
+            raise Exception("empty dataset")
+        else:
+            for x in itertools.chain([first], collection):
+                yield x
+
+
+class _DatasetShard(Iterable[DataEntry]):
+    """
+    Every `num_shards`-th entry of a dataset, starting at `shard_id`.
+
+    The entries of the datasets read from files are skipped before they are
+    decoded, so that each worker only parses its own shard; the other
+    datasets are iterated over in full.
+    """
+
+    def __init__(
+        self, dataset: Dataset, shard_id: int, num_shards: int
+    ) -> None:
+        self.dataset = dataset
+        self.shard_id = shard_id
+        self.num_shards = num_shards
+
+    def __iter__(self) -> Iterator[DataEntry]:
+        if isinstance(self.dataset, (FileDataset, MemmapDataset)):
+            return self.dataset.shard(self.shard_id, self.num_shards)
+        return itertools.islice(
+            iter(self.dataset), self.shard_id, None, self.num_shards
+        )
+
+
+def _train_worker_loop(
+    dataset: Dataset,
+    transform: Transformation,
+    output_queue: mp.Queue,
+    worker_id: int,
+    num_workers: int,
+    seed: int,
+    chunk_size: int,
+    output_buffer: Optional[ArrayRingBuffer] = None,
+    splitter: Optional[InstanceSplitter] = None,
+) -> None:
+    """
+    Worker loop for multiprocessing TrainDataLoader.
+    Transforms (in training mode) the shard of the dataset assigned to this
+    worker, forever, and writes chunks of transformed entries to output_queue,
+    passing their arrays through output_buffer if given. If a splitter is
+    given, the chunks contain the instances it samples from the transformed
+    entries instead.
+    A worker with an empty shard writes None and exits.
+    """
+
+    np.random.seed(seed)
+    shard = _DatasetShard(dataset, worker_id, num_workers)
+
+    try:
+        if next(iter(shard), None) is None:
+            output_queue.put(None)
+            return
+
+        transformed = transform(_iterate_forever(shard), is_train=True)
+        if splitter is not None:
+            transformed = splitter.sample_instances(transformed, is_train=True)
+        while True:
+            chunk = list(itertools.islice(transformed, chunk_size))
+            if output_buffer is not None:
+                chunk = output_buffer.pack(chunk)
+            output_queue.put(chunk)
+    except Exception:
+        output_queue.put(
+            WorkerError("".join(traceback.format_exception(*sys.exc_info())))
+        )
+
 
 class DataLoader(Iterable[DataEntry]):
     """
@@ -135,6 +272,34 @@ class TrainDataLoader(DataLoader):
         Number of batches to return in one complete iteration over this object.
     dtype
         Floating point type to use.
+    shuffle_for_training
+        Whether to shuffle the transformed entries before batching them.
+    num_batches_for_shuffling
+        Number of batches worth of transformed entries to shuffle together.
+    num_workers
+        Number of worker processes used to apply the transformation. Each
+        worker transforms a disjoint shard of the dataset, and the resulting
+        entries are consumed from the workers in a fixed round-robin order,
+        so that loading is deterministic given the state of `np.random`.
+        The workers only parse the entries of their shard if the dataset is
+        a `FileDataset` or a `MemmapDataset`; they iterate over any other
+        dataset in full.
+        If None or 0, the transformation is applied in the calling process
+        (default: None).
+    num_prefetch
+        Number of chunks of `batch_size` transformed entries that each worker
+        prepares ahead of time (default: 2).
+    shared_memory_size
+        Size in bytes of the shared memory used by each worker to pass the
+        arrays of the transformed entries; the remaining data, and chunks
+        which do not fit, are pickled. The buffers are allocated up front,
+        for each worker. If None, everything is pickled (default: None).
+    batched_split
+        Whether to apply the `InstanceSplitter` that ends the transformation
+        to whole batches at once, see `InstanceSplitter.split_batch`. The
+        batches are the same as without this option, but are created without
+        per-instance overhead. Requires the transformation to be an
+        `InstanceSplitter`, or a `Chain` ending with one (default: False).
     """
 
     def __init__(
@@ -147,15 +312,48 @@ class TrainDataLoader(DataLoader):
         dtype: DType = np.float32,
         shuffle_for_training: bool = True,
         num_batches_for_shuffling: int = 10,
+        num_workers: Optional[int] = None,
+        num_prefetch: int = 2,
+        shared_memory_size: Optional[int] = None,
+        batched_split: bool = False,
     ) -> None:
         super().__init__(dataset, transform, batch_size, ctx, dtype)
+        assert (
+            num_workers is None or num_workers >= 0
+        ), "The value of `num_workers` should be >= 0"
+        assert num_prefetch > 0, "The value of `num_prefetch` should be > 0"
+
         self.num_batches_per_epoch = num_batches_per_epoch
         self.shuffle_for_training = shuffle_for_training
+        self.num_workers = num_workers
+        self.num_prefetch = num_prefetch
+        self.shared_memory_size = shared_memory_size
         self._num_buffered_batches = (
             num_batches_for_shuffling if shuffle_for_training else 1
         )
         self._cur_iter: Optional[Iterator] = None
-        self._buffer = BatchBuffer(self.batch_size, ctx, dtype)
+        self._buffer: BatchBuffer
+        self._splitter: Optional[InstanceSplitter] = None
+        if batched_split:
+            transformations = (
+                transform.transformations
+                if isinstance(transform, Chain)
+                else [transform]
+            )
+            assert isinstance(transformations[-1], InstanceSplitter), (
+                "batched_split requires the transformation to end with "
+                "an InstanceSplitter"
+            )
+            # the splitter is applied by the buffer, the remaining
+            # transformations are applied as usual
+            self.transform = Chain(transformations[:-1])
+            self._splitter = transformations[-1]
+            self._buffer = InstanceBatchBuffer(
+                self._splitter, self.batch_size, ctx, dtype
+            )
+        else:
+            self._buffer = BatchBuffer(self.batch_size, ctx, dtype)
+        self._workers: List[mp.Process] = []
 
     def _emit_batches_while_buffer_larger_than(
         self, thresh
@@ -165,18 +363,73 @@ class TrainDataLoader(DataLoader):
         while len(self._buffer) > thresh:
             yield self._buffer.next_batch()
 
-    def _iterate_forever(
-        self, collection: Iterable[DataEntry]
-    ) -> Iterator[DataEntry]:
-        # iterate forever over the collection, the collection must be non empty
-        while True:
-            try:
-                first = next(iter(collection))
-            except StopIteration:
-                raise Exception("empty dataset")
-            else:
-                for x in itertools.chain([first], collection):
-                    yield x
+    def _iterate_workers(self) -> Iterator[DataEntry]:
+        # seeds are drawn here so that seeding np.random in the calling
+        # process makes the whole pipeline deterministic
+        seeds = np.random.randint(0, 2 ** 31 - 1, size=self.num_workers)
+        output_queues = [
+            mp.Queue(maxsize=self.num_prefetch)
+            for _ in range(self.num_workers)
+        ]
+        if self.shared_memory_size is not None:
+            output_buffers = [
+                ArrayRingBuffer(
+                    self.shared_memory_size // self.num_prefetch,
+                    num_slots=self.num_prefetch,
+                )
+                for _ in range(self.num_workers)
+            ]
+        else:
+            output_buffers = [None] * self.num_workers
+
+        for worker_id, out_q in enumerate(output_queues):
+            worker = mp.Process(
+                target=_train_worker_loop,
+                args=(
+                    self.dataset,
+                    self.transform,
+                    out_q,
+                    worker_id,
+                    self.num_workers,
+                    int(seeds[worker_id]),
+                    self.batch_size,
+                    output_buffers[worker_id],
+                    self._splitter,
+                ),
+            )
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+        active_workers = list(range(self.num_workers))
+        while active_workers:
+            for worker_id in list(active_workers):
+                chunk = output_queues[worker_id].get()
+                if isinstance(chunk, WorkerError):
+                    self.terminate()
+                    raise Exception(chunk.msg)
+                if chunk is None:
+                    active_workers.remove(worker_id)
+                    continue
+                output_buffer = output_buffers[worker_id]
+                if output_buffer is not None:
+                    chunk = output_buffer.unpack(chunk)
+                yield from chunk
+
+        self.terminate()
+        raise Exception("empty dataset")
+
+    def terminate(self) -> None:
+        """
+        Stops the worker processes, if any. The next iteration over this
+        object starts new ones.
+        """
+        for worker in self._workers:
+            worker.terminate()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self._cur_iter = None
 
     def __len__(self) -> int:
         return self.num_batches_per_epoch
@@ -184,9 +437,16 @@ class TrainDataLoader(DataLoader):
     def __iter__(self) -> Iterator[DataBatch]:
         batch_count = 0
         if self._cur_iter is None:
-            self._cur_iter = self.transform(
-                self._iterate_forever(self.dataset), is_train=True
-            )
+            if self.num_workers:
+                self._cur_iter = self._iterate_workers()
+            else:
+                self._cur_iter = self.transform(
+                    _iterate_forever(self.dataset), is_train=True
+                )
+                if self._splitter is not None:
+                    self._cur_iter = self._splitter.sample_instances(
+                        self._cur_iter, is_train=True
+                    )
         assert self._cur_iter is not None
         while True:
             data_entry = next(self._cur_iter)
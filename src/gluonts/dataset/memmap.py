@@ -0,0 +1,332 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Columnar binary dataset format, read through memory maps.
+
+A dataset in this format is a directory containing
+
+- ``index.json``: number of entries and description of the array fields,
+- ``<field>.values`` and ``<field>.offsets.npy`` for each time series field
+  (target and dynamic features) and each other array field: the values of
+  all entries, flattened and concatenated, and the offsets of the entries
+  in them,
+- ``<field>.npy`` for each static feature: a (num_entries, num_features)
+  matrix,
+- ``entries.json``: JSON Lines sidecar with the remaining fields of each
+  entry, e.g. start and item_id.
+"""
+
+# Standard library imports
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Third-party imports
+import numpy as np
+import ujson as json
+
+# First-party imports
+from gluonts.core.exception import GluonTSDataError
+from gluonts.dataset import jsonl
+from gluonts.dataset.common import (
+    DataEntry,
+    Dataset,
+    ProcessStartField,
+    SourceContext,
+    TrainDatasets,
+)
+from gluonts.dataset.field_names import FieldName
+
+INDEX_FILE_NAME = "index.json"
+ENTRIES_FILE_NAME = "entries.json"
+
+TIME_SERIES_FIELDS = {
+    FieldName.TARGET: np.float32,
+    FieldName.FEAT_DYNAMIC_CAT: np.int32,
+    FieldName.FEAT_DYNAMIC_REAL: np.float32,
+}
+
+STATIC_FIELDS = {
+    FieldName.FEAT_STATIC_CAT: np.int32,
+    FieldName.FEAT_STATIC_REAL: np.float32,
+}
+
+
+class MemmapDataset(Dataset):
+    """
+    Dataset that reads the columnar binary format written by
+    `save_memmap_dataset`.
+
+    The array fields of the yielded entries are views on memory maps of the
+    dataset files, so that no data is parsed or copied when iterating.
+    The maps are opened in copy-on-write mode: transformations may modify
+    the arrays in place without affecting the files.
+
+    Parameters
+    ----------
+    path
+        Directory containing the dataset files.
+    freq
+        Frequency of the observation in the time series.
+        Must be a valid Pandas frequency.
+    """
+
+    def __init__(self, path: Path, freq: str) -> None:
+        self.path = Path(path)
+        if not self.is_valid(self.path):
+            raise OSError(f"no memmap dataset found in {path}")
+
+        with open(self.path / INDEX_FILE_NAME) as fp:
+            index = json.load(fp)
+
+        self.num_entries: int = index["num_entries"]
+        self.time_series_fields: Dict[str, Dict] = index["time_series_fields"]
+        self.static_fields: List[str] = index["static_fields"]
+        self.process_start = ProcessStartField(freq=freq)
+
+    def __iter__(self) -> Iterator[DataEntry]:
+        return self.shard(0, 1)
+
+    def shard(self, shard_id: int, num_shards: int) -> Iterator[DataEntry]:
+        """
+        Iterates over every `num_shards`-th entry of the dataset, starting at
+        `shard_id`; the lines of the other entries are not decoded.
+        """
+        # the maps are opened for every iteration, so that in-place changes
+        # made during an iteration are not seen by the next ones
+        values = {
+            name: np.memmap(
+                self.path / f"{name}.values", dtype=info["dtype"], mode="c"
+            )
+            if info["size"] > 0
+            else np.empty(0, dtype=info["dtype"])
+            for name, info in self.time_series_fields.items()
+        }
+        offsets = {
+            name: np.load(self.path / f"{name}.offsets.npy", mmap_mode="r")
+            for name in self.time_series_fields
+        }
+        static = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="c")
+            for name in self.static_fields
+        }
+
+        entries = jsonl.JsonLinesFile(self.path / ENTRIES_FILE_NAME)
+        for line in entries.lines(
+            lambda line_number: (line_number - 1) % num_shards == shard_id
+        ):
+            i = line.span.line - 1
+            data = self.process_start(line.content)
+            for name, info in self.time_series_fields.items():
+                value = values[name][offsets[name][i] : offsets[name][i + 1]]
+                if info["num_rows"] is not None:
+                    value = value.reshape(info["num_rows"], -1)
+                data[name] = value
+            for name in self.static_fields:
+                data[name] = static[name][i]
+            data["source"] = SourceContext(
+                source=line.span.path, row=line.span.line
+            )
+            yield data
+
+    def __len__(self):
+        return self.num_entries
+
+    @classmethod
+    def is_valid(cls, path: Path) -> bool:
+        return (Path(path) / INDEX_FILE_NAME).exists()
+
+
+def _column_dtypes(data: DataEntry) -> Dict[str, np.dtype]:
+    """
+    Returns the fields of `data` stored as columns of values, with their
+    dtype: the time series fields, and the other fields holding arrays.
+    """
+    dtypes = {}
+    for name, value in data.items():
+        if name in STATIC_FIELDS or name == "source" or value is None:
+            continue
+        if name in TIME_SERIES_FIELDS:
+            dtypes[name] = np.dtype(TIME_SERIES_FIELDS[name])
+        elif isinstance(value, np.ndarray):
+            if value.dtype.hasobject or value.ndim not in (1, 2):
+                raise GluonTSDataError(
+                    f"Field `{name}` is an array of dtype {value.dtype} and "
+                    f"shape {value.shape}, only 1 or 2 dimensional arrays "
+                    f"of non-object dtype can be stored"
+                )
+            dtypes[name] = value.dtype
+    return dtypes
+
+
+def _json_value(name: str, value):
+    if name == FieldName.START:
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def save_memmap_dataset(dataset: Dataset, path: Path) -> None:
+    """
+    Writes a dataset in the columnar binary format read by `MemmapDataset`.
+
+    All entries must have the same fields, and a given array field must have
+    the same number of rows, and the same dtype for fields other than the
+    time series and static features, in all entries. The fields which are
+    neither arrays nor static features must be JSON serializable.
+
+    Parameters
+    ----------
+    dataset
+        The dataset to write, e.g. a `FileDataset`.
+    path
+        Directory in which to write the dataset; it is created if needed.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    dtypes: Dict[str, np.dtype] = {}
+    value_files: Dict = {}
+    offsets: Dict[str, List[int]] = {}
+    num_rows: Dict[str, Optional[int]] = {}
+    static: Dict[str, List[np.ndarray]] = {}
+    fields: Optional[set] = None
+    num_entries = 0
+
+    try:
+        with open(path / ENTRIES_FILE_NAME, "w") as entries_file:
+            for num_entries, data in enumerate(dataset, start=1):
+                entry_dtypes = _column_dtypes(data)
+                entry_fields = set(entry_dtypes) | {
+                    name
+                    for name, value in data.items()
+                    if name in STATIC_FIELDS and value is not None
+                }
+                if fields is None:
+                    fields = entry_fields
+                    dtypes = entry_dtypes
+                    for name in dtypes:
+                        value_files[name] = open(path / f"{name}.values", "wb")
+                        offsets[name] = [0]
+                    for name in fields & STATIC_FIELDS.keys():
+                        static[name] = []
+                elif entry_fields != fields:
+                    raise GluonTSDataError(
+                        f"Entry {num_entries} has fields "
+                        f"{sorted(entry_fields)}, expected {sorted(fields)}"
+                    )
+                elif entry_dtypes != dtypes:
+                    raise GluonTSDataError(
+                        f"Entry {num_entries} has array fields of dtypes "
+                        f"{entry_dtypes}, expected {dtypes}"
+                    )
+
+                for name, dtype in dtypes.items():
+                    value = np.asarray(data[name], dtype)
+                    rows = value.shape[0] if value.ndim == 2 else None
+                    if num_rows.setdefault(name, rows) != rows:
+                        raise GluonTSDataError(
+                            f"Field `{name}` of entry {num_entries} has "
+                            f"shape {value.shape}, inconsistent with the "
+                            f"previous entries"
+                        )
+                    value_files[name].write(
+                        np.ascontiguousarray(value).tobytes()
+                    )
+                    offsets[name].append(offsets[name][-1] + value.size)
+
+                for name in static:
+                    static[name].append(
+                        np.asarray(data[name], STATIC_FIELDS[name])
+                    )
+
+                entries_file.write(
+                    json.dumps(
+                        {
+                            name: _json_value(name, value)
+                            for name, value in data.items()
+                            if name not in fields
+                            and name != "source"
+                            and value is not None
+                        }
+                    )
+                )
+                entries_file.write("\n")
+    finally:
+        for value_file in value_files.values():
+            value_file.close()
+
+    for name, name_offsets in offsets.items():
+        np.save(path / f"{name}.offsets.npy", np.array(name_offsets, np.int64))
+
+    for name, values in static.items():
+        try:
+            np.save(path / f"{name}.npy", np.stack(values))
+        except ValueError:
+            raise GluonTSDataError(
+                f"Field `{name}` does not have the same length in all entries"
+            )
+
+    with open(path / INDEX_FILE_NAME, "w") as fp:
+        json.dump(
+            {
+                "num_entries": num_entries,
+                "time_series_fields": {
+                    name: {
+                        "dtype": dtypes[name].str,
+                        "num_rows": num_rows[name],
+                        "size": offsets[name][-1],
+                    }
+                    for name in offsets
+                },
+                "static_fields": sorted(static),
+            },
+            fp,
+        )
+
+
+def save_memmap_datasets(
+    dataset: TrainDatasets, path_str: str, overwrite=True
+) -> None:
+    """
+    Saves a TrainDatasets object in the columnar binary format, with the same
+    directory layout as `save_datasets`. The result can be loaded with
+    `load_datasets`.
+
+    This can be used to convert existing datasets, e.g.
+    ``save_memmap_datasets(load_datasets(metadata, train, test), path)``.
+
+    Parameters
+    ----------
+    dataset
+        The training datasets.
+    path_str
+        Where to save the dataset.
+    overwrite
+        Whether to delete previous version in this folder.
+    """
+    path = Path(path_str)
+
+    if overwrite:
+        shutil.rmtree(path, ignore_errors=True)
+
+    (path / "metadata").mkdir(parents=True)
+    with open(path / "metadata/metadata.json", "w") as f:
+        f.write(json.dumps(dataset.metadata.dict()))
+
+    save_memmap_dataset(dataset.train, path / "train")
+
+    if dataset.test is not None:
+        save_memmap_dataset(dataset.test, path / "test")
@@ -325,6 +325,7 @@ class LowrankMultivariateGaussianOutput(DistributionOutput):
             args_dim=self.args_dim,
             domain_map=gluon.nn.HybridLambda(self.domain_map),
             prefix=prefix,
+            dtype=self.dtype,
         )
 
     def distribution(
@@ -13,9 +13,12 @@
 
 # Standard library imports
 import logging
+import multiprocessing as mp
 import re
+from collections import deque
 from functools import lru_cache
-from itertools import chain, tee
+from pathlib import Path
+from itertools import chain, islice, tee
 from typing import (
     Any,
     Dict,
@@ -26,6 +29,7 @@ from typing import (
     Tuple,
     Union,
     Callable,
+    Deque,
 )
 
 # Third-party imports
@@ -33,7 +37,7 @@ import numpy as np
 import pandas as pd
 
 # First-party imports
-from gluonts.model.forecast import Forecast, Quantile
+from gluonts.model.forecast import Forecast, Quantile, SampleForecast
 from gluonts.gluonts_tqdm import tqdm
 
 
@@ -65,6 +69,142 @@ def get_seasonality(freq: str) -> int:
     return seasonality // multiple
 
 
+@lru_cache()
+def _to_offset(freq: str) -> pd.DateOffset:
+    return pd.tseries.frequencies.to_offset(freq)
+
+
+@lru_cache()
+def _masked_invalid_drops_empty_mask() -> bool:
+    # depending on the version of numpy, the mask of an array without invalid
+    # values is either an array of False or `nomask`, which changes how
+    # means are computed
+    return np.ma.masked_invalid(np.zeros(1)).mask is np.ma.nomask
+
+
+def _row_has_mask(mask: np.ndarray) -> np.ndarray:
+    """
+    Whether `np.ma.masked_invalid` applied to each row of a 2D-array, whose
+    invalid values are given by `mask`, returns an array with a mask.
+    """
+    if _masked_invalid_drops_empty_mask():
+        return np.any(mask, axis=1)
+    return np.ones(len(mask), dtype=bool)
+
+
+def _masked_mean(
+    values: np.ndarray, mask: np.ndarray, row_mask: np.ndarray
+) -> np.ndarray:
+    """
+    Computes, for each row of the 2D-array `values`, the mean of the masked
+    array with the given mask (`row_mask` tells whether the row has a mask)
+    with the same result as `np.mean` on that masked array. NaN is returned
+    for the rows whose values are all masked.
+    """
+    count = np.sum(~mask, axis=1)
+    # masked rows: sum of the unmasked values, divided in double precision
+    mean = np.sum(np.where(mask, 0, values), axis=1) * 1.0 / count
+    if values.dtype.kind == "f" and values.dtype.itemsize < 8:
+        # rows without mask: mean computed in the precision of the values
+        mean = np.where(row_mask, mean, mean.astype(values.dtype))
+    return mean
+
+
+def _masked_sum(
+    values: np.ndarray, mask: np.ndarray, row_mask: np.ndarray
+) -> np.ndarray:
+    """
+    Computes, for each row of the 2D-array `values`, the sum of the masked
+    array with the given mask, with the same result as `np.sum` on that
+    masked array. NaN is returned for the rows whose values are all masked.
+    """
+    result = np.sum(np.where(mask, 0, values), axis=1).astype(np.float64)
+    result[row_mask & np.all(mask, axis=1)] = np.nan
+    return result
+
+
+class _RunningAggregates:
+    """
+    Running sums and counts of the non-NaN values of the metrics of the time
+    series, from which their sums and means are computed like in
+    `Evaluator.get_aggregate_metrics`.
+    """
+
+    def __init__(self, agg_funs: Dict[str, str]) -> None:
+        self.num_rows = 0
+        self.sums = {key: 0.0 for key in agg_funs}
+        self.counts = {key: 0 for key in agg_funs}
+
+    def update(self, metrics: pd.DataFrame) -> None:
+        self.num_rows += len(metrics)
+        for key in self.sums:
+            values = metrics[key].values
+            self.sums[key] += np.nansum(values)
+            self.counts[key] += np.count_nonzero(~np.isnan(values))
+
+    def aggregate(self, key: str, agg: str) -> float:
+        if agg == "sum":
+            return self.sums[key]
+        assert agg == "mean", f"unsupported aggregation {agg}"
+        return (
+            self.sums[key] / self.counts[key] if self.counts[key] else np.nan
+        )
+
+
+class _ItemMetricsWriter:
+    """
+    Appends the metrics of successive chunks of time series to a CSV file, or
+    to a Parquet file if the path ends with ".parquet".
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.parquet = self.path.suffix == ".parquet"
+        self._writer = None
+
+    def write(self, metrics: pd.DataFrame) -> None:
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError(
+                    str(e) + ": writing the item metrics to a Parquet file "
+                    "requires `pyarrow`"
+                ) from e
+
+            table = pa.Table.from_pandas(metrics, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(str(self.path), table.schema)
+            self._writer.write_table(table)
+        else:
+            header = self._writer is None
+            if self._writer is None:
+                self._writer = open(self.path, "w", newline="")
+            metrics.to_csv(self._writer, header=header, index=False)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+_worker_evaluator: Optional["Evaluator"] = None
+
+
+def _worker_init(evaluator: "Evaluator") -> None:
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _worker_evaluate(
+    chunk: List[Tuple[Any, Forecast]]
+) -> Dict[str, Union[np.ndarray, List]]:
+    assert _worker_evaluator is not None
+    with np.errstate(invalid="ignore"):
+        return _worker_evaluator.get_metrics_per_chunk(chunk)
+
+
 class Evaluator:
     """
     Evaluator class, to compute accuracy metrics by comparing observations
@@ -85,6 +225,29 @@ class Evaluator:
         for alpha=0.05 the 95% considered is considered in the metric,
         see https://www.m4.unic.ac.cy/wp-content/uploads/2018/03/M4
         -Competitors-Guide.pdf for more detail on MSIS
+    chunk_size
+        if given, the time series are evaluated in chunks of this size: the
+        targets and forecast quantiles of a chunk are stacked into 2D arrays
+        and the metrics are computed for all of them at once. The results
+        are identical to evaluating the time series one at a time, which is
+        done if None and `num_workers` is not set (default: None).
+    num_workers
+        if given, the chunks are evaluated in a pool of this number of worker
+        processes, and their results are merged in order; the chunks then
+        have `chunk_size` time series, or 100 if `chunk_size` is None. If
+        there is a single chunk, it is evaluated in the calling process
+        (default: None).
+    streaming
+        if True, the time series are evaluated in chunks as above, and only
+        running sums and counts of the metrics are kept to compute the
+        aggregate metrics, instead of a DataFrame with the metrics of all the
+        time series; `__call__` then returns None in place of this DataFrame
+        (default: False).
+    item_metrics_path
+        in streaming mode, if given, the metrics of each chunk of time series
+        are appended to this CSV file as they are computed, or to a Parquet
+        file if the path ends with ".parquet", which requires `pyarrow`
+        (default: None).
     """
 
     default_quantiles = 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9
@@ -94,17 +257,35 @@ class Evaluator:
         quantiles: Iterable[Union[float, str]] = default_quantiles,
         seasonality: Optional[int] = None,
         alpha: float = 0.05,
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        streaming: bool = False,
+        item_metrics_path: Optional[str] = None,
     ) -> None:
+        assert (
+            chunk_size is None or chunk_size > 0
+        ), "The value of `chunk_size` should be > 0"
+        assert (
+            num_workers is None or num_workers >= 0
+        ), "The value of `num_workers` should be >= 0"
+        assert (
+            item_metrics_path is None or streaming
+        ), "`item_metrics_path` can only be used in streaming mode"
+
         self.quantiles = tuple(map(Quantile.parse, quantiles))
         self.seasonality = seasonality
         self.alpha = alpha
+        self.chunk_size = chunk_size
+        self.num_workers = num_workers
+        self.streaming = streaming
+        self.item_metrics_path = item_metrics_path
 
     def __call__(
         self,
         ts_iterator: Iterable[Union[pd.DataFrame, pd.Series]],
         fcst_iterator: Iterable[Forecast],
         num_series: Optional[int] = None,
-    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+    ) -> Tuple[Dict[str, float], Optional[pd.DataFrame]]:
         """
         Compute accuracy metrics by comparing actual data to the forecasts.
 
@@ -123,20 +304,63 @@ class Evaluator:
         dict
             Dictionary of aggregated metrics
         pd.DataFrame
-            DataFrame containing per-time-series metrics
+            DataFrame containing per-time-series metrics (None in streaming
+            mode)
         """
+        sink = (
+            _ItemMetricsWriter(self.item_metrics_path)
+            if self.item_metrics_path is not None
+            else None
+        )
+        try:
+            return self._evaluate(ts_iterator, fcst_iterator, num_series, sink)
+        finally:
+            if sink is not None:
+                sink.close()
+
+    def _evaluate(
+        self,
+        ts_iterator: Iterable[Union[pd.DataFrame, pd.Series]],
+        fcst_iterator: Iterable[Forecast],
+        num_series: Optional[int] = None,
+        sink: Optional[_ItemMetricsWriter] = None,
+        shared_aggregates: Optional[_RunningAggregates] = None,
+    ) -> Tuple[Dict[str, float], Optional[pd.DataFrame]]:
+        # same as __call__, where in streaming mode the metrics of the chunks
+        # are written to `sink`, and also added to `shared_aggregates`
         ts_iterator = iter(ts_iterator)
         fcst_iterator = iter(fcst_iterator)
 
         rows = []
+        chunks = []
+        aggregates = _RunningAggregates(self._aggregation_functions())
 
         with tqdm(
             zip(ts_iterator, fcst_iterator),
             total=num_series,
             desc="Running evaluation",
         ) as it, np.errstate(invalid="ignore"):
-            for ts, forecast in it:
-                rows.append(self.get_metrics_per_ts(ts, forecast))
+            if (
+                self.chunk_size is None
+                and not self.num_workers
+                and not self.streaming
+            ):
+                for ts, forecast in it:
+                    rows.append(self.get_metrics_per_ts(ts, forecast))
+            else:
+                chunk_size = self.chunk_size or 100
+                for chunk in self._evaluate_chunks(
+                    iter(lambda: list(islice(it, chunk_size)), [])
+                ):
+                    if not self.streaming:
+                        chunks.append(chunk)
+                        continue
+                    metrics = pd.DataFrame(chunk, dtype=np.float64)
+                    aggregates.update(metrics)
+                    if shared_aggregates is not None:
+                        shared_aggregates.update(metrics)
+                    if sink is not None:
+                        sink.write(metrics)
 
         assert not any(
             True for _ in ts_iterator
@@ -146,15 +370,34 @@ class Evaluator:
             True for _ in fcst_iterator
         ), "fcst_iterator has more elements than ts_iterator"
 
+        if self.streaming:
+            num_evaluated = aggregates.num_rows
+        elif chunks:
+            columns = {
+                key: list(chain.from_iterable(chunk[key] for chunk in chunks))
+                if key == "item_id"
+                else np.concatenate([chunk[key] for chunk in chunks])
+                for key in chunks[0]
+            }
+            num_evaluated = len(columns["item_id"])
+        else:
+            num_evaluated = len(rows)
+
         if num_series is not None:
             assert (
-                len(rows) == num_series
-            ), f"num_series={num_series} did not match number of elements={len(rows)}"
+                num_evaluated == num_series
+            ), f"num_series={num_series} did not match number of elements={num_evaluated}"
+
+        if self.streaming:
+            return self._get_running_aggregate_metrics(aggregates), None
 
         # If all entries of a target array are NaNs, the resulting metric will have value "masked". Pandas does not
         # handle masked values correctly. Thus we set dtype=np.float64 to convert masked values back to NaNs which
         # are handled correctly by pandas Dataframes during aggregation.
-        metrics_per_ts = pd.DataFrame(rows, dtype=np.float64)
+        if chunks:
+            metrics_per_ts = pd.DataFrame(columns, dtype=np.float64)
+        else:
+            metrics_per_ts = pd.DataFrame(rows, dtype=np.float64)
         return self.get_aggregate_metrics(metrics_per_ts)
 
     @staticmethod
@@ -235,14 +478,7 @@ class Evaluator:
             mean_fcst = None
         median_fcst = forecast.quantile(0.5)
         seasonal_error = self.seasonal_error(time_series, forecast)
-        # For MSIS: alpha/2 quantile may not exist. Find the closest.
-        lower_q = min(
-            self.quantiles, key=lambda q: abs(q.value - self.alpha / 2)
-        )
-        upper_q = min(
-            reversed(self.quantiles),
-            key=lambda q: abs(q.value - (1 - self.alpha / 2)),
-        )
+        lower_q, upper_q = self._msis_quantiles()
 
         metrics = {
             "item_id": forecast.item_id,
@@ -276,9 +512,280 @@ class Evaluator:
 
         return metrics
 
-    def get_aggregate_metrics(
-        self, metric_per_ts: pd.DataFrame
-    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+    def _evaluate_chunks(
+        self, chunk_iterator: Iterator[List[Tuple[Any, Forecast]]]
+    ) -> Iterator[Dict[str, Union[np.ndarray, List]]]:
+        if self.num_workers:
+            first_chunks = list(islice(chunk_iterator, 2))
+            if len(first_chunks) > 1:
+                yield from self._evaluate_chunks_in_parallel(
+                    chain(first_chunks, chunk_iterator)
+                )
+                return
+            chunk_iterator = iter(first_chunks)
+
+        for chunk in chunk_iterator:
+            yield self.get_metrics_per_chunk(chunk)
+
+    def _evaluate_chunks_in_parallel(
+        self, chunk_iterator: Iterator[List[Tuple[Any, Forecast]]]
+    ) -> Iterator[Dict[str, Union[np.ndarray, List]]]:
+        assert self.num_workers
+        with mp.Pool(
+            self.num_workers, initializer=_worker_init, initargs=(self,)
+        ) as pool:
+            # the number of chunks sent to the workers and not yet merged is
+            # bounded, so that the iterators are not consumed ahead of time
+            pending: Deque = deque()
+            for chunk in chunk_iterator:
+                pending.append(pool.apply_async(_worker_evaluate, (chunk,)))
+                if len(pending) > 2 * self.num_workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    def get_metrics_per_chunk(
+        self, chunk: List[Tuple[Union[pd.Series, pd.DataFrame], Forecast]]
+    ) -> Dict[str, Union[np.ndarray, List]]:
+        """
+        Computes the metrics of `get_metrics_per_ts` for a chunk of (time
+        series, forecast) pairs at once, with identical results.
+
+        Returns
+        -------
+        Dict[str, Union[np.ndarray, List]]
+            The metrics of the time series of the chunk, by metric name (the
+            item ids are returned as a list).
+        """
+        lower_q, upper_q = self._msis_quantiles()
+        levels = sorted(
+            {0.5, lower_q.value, upper_q.value}
+            | {quantile.value for quantile in self.quantiles}
+        )
+
+        targets = []
+        seasonal_errors = np.empty(len(chunk))
+        forecast_arrays: List[Optional[Tuple]] = []
+        groups: Dict[Tuple, List[int]] = {}
+        for k, (time_series, forecast) in enumerate(chunk):
+            target, past_values = self._extract_values(time_series, forecast)
+            targets.append(target)
+            seasonal_errors[k] = self._seasonal_error_values(
+                past_values, forecast.freq
+            )
+
+            # the targets and forecasts of a group are stacked, so that they
+            # must have the same shapes and dtypes
+            if (
+                type(forecast) is SampleForecast
+                and forecast._mean is None
+                and forecast.samples.ndim == 2
+            ):
+                forecast_arrays.append(None)
+                key: Tuple = (
+                    target.shape,
+                    target.dtype,
+                    forecast.samples.shape,
+                    forecast.samples.dtype,
+                )
+            else:
+                try:
+                    mean_fcst = forecast.mean
+                except:
+                    mean_fcst = None
+                quantile_fcsts = [forecast.quantile(q) for q in levels]
+                forecast_arrays.append((mean_fcst, quantile_fcsts))
+                key = (
+                    target.shape,
+                    target.dtype,
+                    None if mean_fcst is None else mean_fcst.dtype,
+                    tuple((a.shape, a.dtype) for a in quantile_fcsts),
+                )
+            groups.setdefault(key, []).append(k)
+
+        metrics: Dict[str, Union[np.ndarray, List]] = {
+            "item_id": [forecast.item_id for _, forecast in chunk]
+        }
+        for rows in groups.values():
+            target = np.stack([targets[k] for k in rows])
+            if forecast_arrays[rows[0]] is None:
+                samples = np.stack([chunk[k][1].samples for k in rows])
+                mean_fcst = np.mean(samples, axis=1)
+                sorted_samples = np.sort(samples, axis=1)
+                quantile_fcsts = {
+                    q: sorted_samples[
+                        :, int(np.round((samples.shape[1] - 1) * q)), :
+                    ]
+                    for q in levels
+                }
+            else:
+                mean_fcst = (
+                    None
+                    if forecast_arrays[rows[0]][0] is None
+                    else np.stack([forecast_arrays[k][0] for k in rows])
+                )
+                quantile_fcsts = {
+                    q: np.stack([forecast_arrays[k][1][i] for k in rows])
+                    for i, q in enumerate(levels)
+                }
+
+            group_metrics = self._get_metrics_per_group(
+                target,
+                mean_fcst,
+                quantile_fcsts,
+                seasonal_errors[rows],
+                lower_q,
+                upper_q,
+            )
+            for key, value in group_metrics.items():
+                if key not in metrics:
+                    metrics[key] = np.empty(len(chunk))
+                metrics[key][rows] = value
+
+        return metrics
+
+    def _get_metrics_per_group(
+        self,
+        target: np.ndarray,
+        mean_fcst: Optional[np.ndarray],
+        quantile_fcsts: Dict[float, np.ndarray],
+        seasonal_error: np.ndarray,
+        lower_q: Quantile,
+        upper_q: Quantile,
+    ) -> Dict[str, np.ndarray]:
+        # The metric functions are evaluated with the same operations as in
+        # `get_metrics_per_ts`, on 2D arrays with one time series per row.
+        # The reductions over the rows reproduce the results of the masked
+        # arrays used there, see `_masked_mean`.
+        mask = ~np.isfinite(target)
+        row_mask = _row_has_mask(mask)
+
+        def mean(values):
+            return _masked_mean(values, mask, row_mask)
+
+        def total(values):
+            return _masked_sum(values, mask, row_mask)
+
+        median_fcst = quantile_fcsts[0.5]
+
+        flag = seasonal_error == 0
+        mase = (mean(np.abs(target - median_fcst)) * (1 - flag)) / (
+            seasonal_error + flag
+        )
+
+        denominator = np.abs(target) + np.abs(median_fcst)
+        smape_flag = denominator == 0
+        smape = 2 * mean(
+            (np.abs(target - median_fcst) * (1 - smape_flag))
+            / (denominator + smape_flag)
+        )
+
+        lower_quantile = quantile_fcsts[lower_q.value]
+        upper_quantile = quantile_fcsts[upper_q.value]
+        msis_numerator = mean(
+            upper_quantile
+            - lower_quantile
+            + 2.0
+            / self.alpha
+            * (lower_quantile - target)
+            * (target < lower_quantile)
+            + 2.0
+            / self.alpha
+            * (target - upper_quantile)
+            * (target > upper_quantile)
+        )
+        msis = (msis_numerator * (1 - flag)) / (seasonal_error + flag)
+
+        metrics = {
+            "MSE": mean(np.square(target - mean_fcst))
+            if mean_fcst is not None
+            else np.full(len(target), np.nan),
+            "abs_error": total(np.abs(target - median_fcst)),
+            "abs_target_sum": total(np.abs(target)),
+            "abs_target_mean": mean(np.abs(target)),
+            "seasonal_error": seasonal_error,
+            "MASE": mase,
+            "sMAPE": smape,
+            "MSIS": msis,
+        }
+
+        for quantile in self.quantiles:
+            forecast_quantile = quantile_fcsts[quantile.value]
+
+            metrics[quantile.loss_name] = 2.0 * total(
+                np.abs(
+                    (forecast_quantile - target)
+                    * ((target <= forecast_quantile) - quantile.value)
+                )
+            )
+            metrics[quantile.coverage_name] = mean(target < forecast_quantile)
+
+        return metrics
+
+    def _msis_quantiles(self) -> Tuple[Quantile, Quantile]:
+        # For MSIS: alpha/2 quantile may not exist. Find the closest.
+        lower_q = min(
+            self.quantiles, key=lambda q: abs(q.value - self.alpha / 2)
+        )
+        upper_q = min(
+            reversed(self.quantiles),
+            key=lambda q: abs(q.value - (1 - self.alpha / 2)),
+        )
+        return lower_q, upper_q
+
+    def _extract_values(
+        self, time_series: Union[pd.Series, pd.DataFrame], forecast: Forecast
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the values of the time series in the prediction range, as
+        `extract_pred_target`, and before the prediction range, as used by
+        `seasonal_error`.
+
+        Regular time series with the frequency of the forecast are sliced by
+        position, which avoids the cost of indexing them by date.
+        """
+        index = time_series.index
+        if (
+            isinstance(index, pd.DatetimeIndex)
+            and index.freq is not None
+            and index.freq == _to_offset(forecast.freq)
+            and (
+                isinstance(time_series, pd.Series) or time_series.shape[1] == 1
+            )
+        ):
+            start = index.searchsorted(forecast.start_date)
+            end = start + forecast.prediction_length
+            if end <= len(index) and index[start] == forecast.start_date:
+                values = time_series.values
+                return (
+                    np.array(np.atleast_1d(np.squeeze(values[start:end]))),
+                    values[:start],
+                )
+
+        target = np.array(self.extract_pred_target(time_series, forecast))
+        forecast_date = pd.Timestamp(forecast.start_date, freq=forecast.freq)
+        date_before_forecast = forecast_date - 1 * forecast_date.freq
+        return target, time_series[:date_before_forecast].values
+
+    def _seasonal_error_values(self, values: np.ndarray, freq: str) -> float:
+        # computes `seasonal_error` from the values of the time series before
+        # the prediction range
+        seasonality = (
+            self.seasonality if self.seasonality else get_seasonality(freq)
+        )
+        forecast_freq = seasonality if seasonality < len(values) else 1
+
+        y_t = values[:-forecast_freq]
+        y_tm = values[forecast_freq:]
+        mask = ~np.isfinite(y_t) | ~np.isfinite(y_tm)
+        diff = np.abs(y_t - y_tm).reshape(1, -1)
+        mask = mask.reshape(1, -1)
+        row_mask = _row_has_mask(~np.isfinite(y_t).reshape(1, -1)) | (
+            _row_has_mask(~np.isfinite(y_tm).reshape(1, -1))
+        )
+        return _masked_mean(diff, mask, row_mask)[0]
+
+    def _aggregation_functions(self) -> Dict[str, str]:
         agg_funs = {
             "MSE": "mean",
             "abs_error": "sum",
@@ -292,6 +799,12 @@ class Evaluator:
         for quantile in self.quantiles:
             agg_funs[quantile.loss_name] = "sum"
             agg_funs[quantile.coverage_name] = "mean"
+        return agg_funs
+
+    def get_aggregate_metrics(
+        self, metric_per_ts: pd.DataFrame
+    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+        agg_funs = self._aggregation_functions()
 
         assert (
             set(metric_per_ts.columns) >= agg_funs.keys()
@@ -300,7 +813,20 @@ class Evaluator:
         totals = {
             key: metric_per_ts[key].agg(agg) for key, agg in agg_funs.items()
         }
+        return self._add_derived_metrics(totals), metric_per_ts
 
+    def _get_running_aggregate_metrics(
+        self, aggregates: _RunningAggregates
+    ) -> Dict[str, float]:
+        totals = {
+            key: aggregates.aggregate(key, agg)
+            for key, agg in self._aggregation_functions().items()
+        }
+        return self._add_derived_metrics(totals)
+
+    def _add_derived_metrics(
+        self, totals: Dict[str, float]
+    ) -> Dict[str, float]:
         # derived metrics based on previous aggregate metrics
         totals["RMSE"] = np.sqrt(totals["MSE"])
 
@@ -332,7 +858,7 @@ class Evaluator:
                 for q in self.quantiles
             ]
         )
-        return totals, metric_per_ts
+        return totals
 
     @staticmethod
     def mse(target, forecast):
@@ -457,6 +983,10 @@ class MultivariateEvaluator(Evaluator):
         alpha: float = 0.05,
         eval_dims: List[int] = None,
         target_agg_funcs: Dict[str, Callable] = {},
+        chunk_size: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        streaming: bool = False,
+        item_metrics_path: Optional[str] = None,
     ) -> None:
         """
 
@@ -478,9 +1008,31 @@ class MultivariateEvaluator(Evaluator):
             pass key-value pairs that define aggregation functions over the
             dimension axis. Useful to compute metrics over aggregated target
             and forecast (typically sum or mean).
+        chunk_size
+            if given, the time series are evaluated in chunks of this size,
+            see `Evaluator`.
+        num_workers
+            if given, the chunks are evaluated in a pool of this number of
+            worker processes, see `Evaluator`.
+        streaming
+            if True, only running sums and counts of the metrics of each
+            dimension, and of all dimensions, are kept to compute the
+            aggregate metrics, see `Evaluator`; `__call__` then returns None
+            in place of the per-time-series metrics. The time series and
+            forecasts are still buffered to be evaluated once per dimension.
+        item_metrics_path
+            in streaming mode, if given, the metrics of the time series of
+            each evaluated dimension are appended to this file, in the order
+            of the dimensions, see `Evaluator`.
         """
         super().__init__(
-            quantiles=quantiles, seasonality=seasonality, alpha=alpha
+            quantiles=quantiles,
+            seasonality=seasonality,
+            alpha=alpha,
+            chunk_size=chunk_size,
+            num_workers=num_workers,
+            streaming=streaming,
+            item_metrics_path=item_metrics_path,
         )
         self._eval_dims = eval_dims
         self.target_agg_funcs = target_agg_funcs
@@ -562,7 +1114,7 @@ class MultivariateEvaluator(Evaluator):
         Dict[str, float]
             dictionary with aggregate datasets metrics
         """
-        agg_metrics, _ = super(MultivariateEvaluator, self).__call__(
+        agg_metrics, _ = self._evaluate(
             self.extract_aggregate_target(ts_iterator, agg_fun),
             self.extract_aggregate_forecast(forecast_iterator, agg_fun),
         )
@@ -601,12 +1153,13 @@ class MultivariateEvaluator(Evaluator):
         ts_iterator: Iterable[pd.DataFrame],
         fcst_iterator: Iterable[Forecast],
         num_series=None,
-    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+    ) -> Tuple[Dict[str, float], Optional[pd.DataFrame]]:
         ts_iterator = iter(ts_iterator)
         fcst_iterator = iter(fcst_iterator)
 
         all_agg_metrics = dict()
         all_metrics_per_ts = list()
+        vector_aggregates = _RunningAggregates(self._aggregation_functions())
 
         peeked_forecast, fcst_iterator = self.peek(fcst_iterator)
         target_dimensionality = self.get_target_dimensionality(peeked_forecast)
@@ -619,23 +1172,38 @@ class MultivariateEvaluator(Evaluator):
             fcst_iterator, target_dimensionality + len(self.target_agg_funcs)
         )
 
-        for dim in eval_dims:
-            agg_metrics, metrics_per_ts = super(
-                MultivariateEvaluator, self
-            ).__call__(
-                self.extract_target_by_dim(ts_iterator_set[dim], dim),
-                self.extract_forecast_by_dim(fcst_iterator_set[dim], dim),
-            )
+        sink = (
+            _ItemMetricsWriter(self.item_metrics_path)
+            if self.item_metrics_path is not None
+            else None
+        )
+        try:
+            for dim in eval_dims:
+                agg_metrics, metrics_per_ts = self._evaluate(
+                    self.extract_target_by_dim(ts_iterator_set[dim], dim),
+                    self.extract_forecast_by_dim(fcst_iterator_set[dim], dim),
+                    sink=sink,
+                    shared_aggregates=vector_aggregates,
+                )
 
-            all_metrics_per_ts.append(metrics_per_ts)
+                all_metrics_per_ts.append(metrics_per_ts)
 
-            for metric, value in agg_metrics.items():
-                all_agg_metrics[f"{dim}_{metric}"] = value
+                for metric, value in agg_metrics.items():
+                    all_agg_metrics[f"{dim}_{metric}"] = value
+        finally:
+            if sink is not None:
+                sink.close()
 
-        all_metrics_per_ts = pd.concat(all_metrics_per_ts)
-        all_agg_metrics = self.calculate_aggregate_vector_metrics(
-            all_agg_metrics, all_metrics_per_ts
-        )
+        if self.streaming:
+            all_metrics_per_ts = None
+            all_agg_metrics.update(
+                self._get_running_aggregate_metrics(vector_aggregates)
+            )
+        else:
+            all_metrics_per_ts = pd.concat(all_metrics_per_ts)
+            all_agg_metrics = self.calculate_aggregate_vector_metrics(
+                all_agg_metrics, all_metrics_per_ts
+            )
 
         if self.target_agg_funcs:
             multivariate_metrics = {
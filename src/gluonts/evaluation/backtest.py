@@ -12,6 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import copy
 import logging
 import re
 from typing import Dict, Iterator, NamedTuple, Optional, Tuple, Union
@@ -125,6 +126,7 @@ def backtest_metrics(
     num_samples: int = 100,
     logging_file: Optional[str] = None,
     use_symbol_block_predictor: bool = False,
+    num_workers: Optional[int] = None,
 ):
     """
     Parameters
@@ -143,6 +145,10 @@ def backtest_metrics(
         If specified, information of the backtest is redirected to this file.
     use_symbol_block_predictor
         Use a :class:`SymbolBlockPredictor` during testing.
+    num_workers
+        If specified, the forecasts are evaluated in chunks by this number of
+        worker processes instead of the one set in `evaluator`, which is
+        advisable for large test datasets.
 
     Returns
     -------
@@ -201,6 +207,10 @@ def backtest_metrics(
         test_dataset, predictor=predictor, num_samples=num_samples
     )
 
+    if num_workers is not None:
+        evaluator = copy.copy(evaluator)
+        evaluator.num_workers = num_workers
+
     agg_metrics, item_metrics = evaluator(
         ts_it, forecast_it, num_series=maybe_len(test_dataset)
     )
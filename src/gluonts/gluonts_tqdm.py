@@ -26,6 +26,6 @@ from tqdm import tqdm as _tqdm
 def tqdm(*args, **kwargs):
     kwargs = kwargs.copy()
     if not sys.stdout.isatty():
-        kwargs.update(mininterval=10.0)
+        kwargs.setdefault("mininterval", 10.0)
 
     return _tqdm(*args, **kwargs)
@@ -110,9 +110,9 @@ class DeepARNetwork(mx.gluon.HybridBlock):
                 dtype=self.dtype,
             )
             if scaling:
-                self.scaler = MeanScaler(keepdims=True)
+                self.scaler = MeanScaler(keepdims=True, dtype=dtype)
             else:
-                self.scaler = NOPScaler(keepdims=True)
+                self.scaler = NOPScaler(keepdims=True, dtype=dtype)
 
     @staticmethod
     def get_lagged_subsequences(
@@ -22,7 +22,7 @@ from mxnet.gluon import HybridBlock
 from pandas.tseries.frequencies import to_offset
 
 # First-party imports
-from gluonts.core.component import validated
+from gluonts.core.component import DType, validated
 from gluonts.distribution import (
     DistributionOutput,
     StudentTOutput,
@@ -200,6 +200,9 @@ class DeepVAREstimator(GluonEstimator):
         Set maximum length for conditioning the marginal transformation
     use_marginal_transformation
         Whether marginal (empirical cdf, gaussian ppf) transformation is used.
+    dtype
+        Data type of the network; with np.float16, it is trained in mixed
+        precision (default: np.float32)
 
     """
 
@@ -226,9 +229,10 @@ class DeepVAREstimator(GluonEstimator):
         time_features: Optional[List[TimeFeature]] = None,
         conditioning_length: int = 200,
         use_marginal_transformation=False,
+        dtype: DType = np.float32,
         **kwargs,
     ) -> None:
-        super().__init__(trainer=trainer, **kwargs)
+        super().__init__(trainer=trainer, dtype=dtype, **kwargs)
 
         assert (
             prediction_length > 0
@@ -260,6 +264,7 @@ class DeepVAREstimator(GluonEstimator):
             self.distr_output = LowrankMultivariateGaussianOutput(
                 dim=target_dim, rank=rank
             )
+        self.distr_output.dtype = dtype
 
         self.prediction_length = prediction_length
         self.target_dim = target_dim
@@ -320,6 +325,7 @@ class DeepVAREstimator(GluonEstimator):
                 AsNumpyArray(
                     field=FieldName.TARGET,
                     expected_ndim=1 + len(self.distr_output.event_shape),
+                    dtype=self.dtype,
                 ),
                 # maps the target to (1, T)
                 # if the target data is uni dimensional
@@ -330,6 +336,7 @@ class DeepVAREstimator(GluonEstimator):
                 AddObservedValuesIndicator(
                     target_field=FieldName.TARGET,
                     output_field=FieldName.OBSERVED_VALUES,
+                    dtype=self.dtype,
                 ),
                 AddTimeFeatures(
                     start_field=FieldName.START,
@@ -384,6 +391,7 @@ class DeepVAREstimator(GluonEstimator):
             lags_seq=self.lags_seq,
             scaling=self.scaling,
             conditioning_length=self.conditioning_length,
+            dtype=self.dtype,
         )
 
     def create_predictor(
@@ -405,6 +413,7 @@ class DeepVAREstimator(GluonEstimator):
             lags_seq=self.lags_seq,
             scaling=self.scaling,
             conditioning_length=self.conditioning_length,
+            dtype=self.dtype,
         )
 
         copy_parameters(trained_network, prediction_network)
@@ -417,4 +426,5 @@ class DeepVAREstimator(GluonEstimator):
             prediction_length=self.prediction_length,
             ctx=self.trainer.ctx,
             output_transform=self.output_transform,
+            dtype=self.dtype,
         )
@@ -16,10 +16,11 @@ from typing import List, Optional, Tuple
 
 # Third-party imports
 import mxnet as mx
+import numpy as np
 
 # First-party imports
 from gluonts.block.scaler import NOPScaler, MeanScaler
-from gluonts.core.component import validated
+from gluonts.core.component import DType, validated
 from gluonts.distribution import DistributionOutput, Distribution
 from gluonts.model.common import Tensor
 from gluonts.support.util import weighted_average, assert_shape
@@ -67,6 +68,7 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
         cardinality: List[int] = [1],
         embedding_dimension: int = 1,
         scaling: bool = True,
+        dtype: DType = np.float32,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
@@ -84,6 +86,7 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
         self.scaling = scaling
         self.target_dim_sample = target_dim
         self.conditioning_length = conditioning_length
+        self.dtype = dtype
 
         assert len(set(lags_seq)) == len(
             lags_seq
@@ -108,16 +111,19 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
                 residual=residual,
                 dropout_rate=dropout_rate,
             )
+            self.rnn.cast(dtype=dtype)
 
             self.embed_dim = 1
             self.embed = mx.gluon.nn.Embedding(
-                input_dim=self.target_dim, output_dim=self.embed_dim
+                input_dim=self.target_dim,
+                output_dim=self.embed_dim,
+                dtype=dtype,
             )
 
             if scaling:
-                self.scaler = MeanScaler(keepdims=True)
+                self.scaler = MeanScaler(keepdims=True, dtype=dtype)
             else:
-                self.scaler = NOPScaler(keepdims=True)
+                self.scaler = NOPScaler(keepdims=True, dtype=dtype)
 
     @staticmethod
     def get_lagged_subsequences(
@@ -170,6 +176,19 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
             *lagged_values, num_args=len(indices), dim=1
         ).transpose(axes=(0, 2, 3, 1))
 
+    def default_begin_state(self, F, inputs: Tensor) -> List[Tensor]:
+        """
+        Returns the zero state of the RNN for `inputs`, in the data type of
+        the network (the RNN would otherwise start from float32 states).
+        """
+        return self.rnn.begin_state(
+            func=F.zeros,
+            dtype=self.dtype,
+            batch_size=inputs.shape[0]
+            if isinstance(inputs, mx.nd.NDArray)
+            else 0,
+        )
+
     def unroll(
         self,
         F,
@@ -247,7 +266,9 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
             length=unroll_length,
             layout="NTC",
             merge_outputs=True,
-            begin_state=begin_state,
+            begin_state=begin_state
+            if begin_state is not None
+            else self.default_begin_state(F, inputs),
         )
 
         assert_shape(outputs, (-1, unroll_length, self.num_cells))
@@ -623,7 +644,7 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
             )
 
             # (batch_size, 1, target_dim)
-            new_samples = distr.sample()
+            new_samples = distr.sample(dtype=self.dtype)
 
             # (batch_size, seq_len, target_dim)
             future_samples.append(new_samples)
@@ -171,7 +171,13 @@ class GluonEstimator(Estimator):
         raise NotImplementedError
 
     def train_model(
-        self, training_data: Dataset, validation_data: Optional[Dataset] = None
+        self,
+        training_data: Dataset,
+        validation_data: Optional[Dataset] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: int = 2,
+        batched_split: bool = False,
+        resume_from: Optional[str] = None,
     ) -> TrainOutput:
         transformation = self.create_transformation()
 
@@ -184,6 +190,9 @@ class GluonEstimator(Estimator):
             num_batches_per_epoch=self.trainer.num_batches_per_epoch,
             ctx=self.trainer.ctx,
             dtype=self.dtype,
+            num_workers=num_workers,
+            num_prefetch=num_prefetch,
+            batched_split=batched_split,
         )
 
         validation_data_loader = None
@@ -201,12 +210,16 @@ class GluonEstimator(Estimator):
         with self.trainer.ctx:
             trained_net = self.create_training_network()
 
-        self.trainer(
-            net=trained_net,
-            input_names=get_hybrid_forward_input_names(trained_net),
-            train_iter=training_data_loader,
-            validation_iter=validation_data_loader,
-        )
+        try:
+            self.trainer(
+                net=trained_net,
+                input_names=get_hybrid_forward_input_names(trained_net),
+                train_iter=training_data_loader,
+                validation_iter=validation_data_loader,
+                resume_from=resume_from,
+            )
+        finally:
+            training_data_loader.terminate()
 
         with self.trainer.ctx:
             # ensure that the prediction network is created within the same MXNet
@@ -218,6 +231,19 @@ class GluonEstimator(Estimator):
             )
 
     def train(
-        self, training_data: Dataset, validation_data: Optional[Dataset] = None
+        self,
+        training_data: Dataset,
+        validation_data: Optional[Dataset] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: int = 2,
+        batched_split: bool = False,
+        resume_from: Optional[str] = None,
     ) -> Predictor:
-        return self.train_model(training_data, validation_data).predictor
+        return self.train_model(
+            training_data,
+            validation_data,
+            num_workers,
+            num_prefetch,
+            batched_split,
+            resume_from,
+        ).predictor
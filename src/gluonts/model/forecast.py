@@ -282,25 +282,43 @@ class Forecast:
         """
         raise NotImplementedError()
 
-    def as_json_dict(self, config: "Config") -> dict:
+    def output_arrays(self, config: "Config") -> dict:
+        """
+        Returns the outputs selected by `config`, with the structure of
+        `as_json_dict` but as numpy arrays.
+        """
         result = {}
 
         if OutputType.mean in config.output_types:
-            result["mean"] = self.mean.tolist()
+            result["mean"] = self.mean
 
         if OutputType.quantiles in config.output_types:
             quantiles = map(Quantile.parse, config.quantiles)
 
             result["quantiles"] = {
-                quantile.name: self.quantile(quantile.value).tolist()
+                quantile.name: self.quantile(quantile.value)
                 for quantile in quantiles
             }
 
         if OutputType.samples in config.output_types:
-            result["samples"] = []
+            result["samples"] = np.empty(0)
 
         return result
 
+    def as_json_dict(self, config: "Config") -> dict:
+        result = self.output_arrays(config)
+
+        if "quantiles" in result:
+            result["quantiles"] = {
+                name: array.tolist()
+                for name, array in result["quantiles"].items()
+            }
+
+        return {
+            key: value if key == "quantiles" else value.tolist()
+            for key, value in result.items()
+        }
+
 
 class SampleForecast(Forecast):
     """
@@ -443,11 +461,11 @@ class SampleForecast(Forecast):
                 # shape: (num_samples, prediction_length, target_dim)
                 return self.samples.shape[2]
 
-    def as_json_dict(self, config: "Config") -> dict:
-        result = super().as_json_dict(config)
+    def output_arrays(self, config: "Config") -> dict:
+        result = super().output_arrays(config)
 
         if OutputType.samples in config.output_types:
-            result["samples"] = self.samples.tolist()
+            result["samples"] = self.samples
 
         return result
 
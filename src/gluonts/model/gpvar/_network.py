@@ -34,6 +34,7 @@ class GPVARNetwork(DeepVARNetwork):
             self.embed = mx.gluon.nn.Embedding(
                 input_dim=self.target_dim,
                 output_dim=4 * self.distr_output.rank,
+                dtype=self.dtype,
             )
 
     def unroll(
@@ -118,7 +119,7 @@ class GPVARNetwork(DeepVARNetwork):
                 merge_outputs=True,
                 begin_state=begin_state[i]
                 if begin_state is not None
-                else None,
+                else self.default_begin_state(F, inputs),
             )
             outputs.append(outputs_single_dim)
             states.append(state)
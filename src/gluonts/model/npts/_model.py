@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import Callable, Iterator, List, cast
+from typing import Callable, Iterator, List
 
 # Third-party imports
 import numpy as np
@@ -35,7 +35,7 @@ class NPTS:
         train_features: np.ndarray,
         pred_features: np.ndarray,
         target_isnan_positions: np.ndarray,
-        kernel: Callable[[np.ndarray, np.ndarray], float],
+        kernel: Callable[[np.ndarray, np.ndarray], np.ndarray],
         do_exp: bool = True,
     ) -> Iterator[np.ndarray]:
         """
@@ -47,7 +47,8 @@ class NPTS:
         the prediction for time step `pred_t` samples from all the training
         targets as well as predictions until `pred_t` - 1.
 
-        :return: iterator over sampling weights
+        The weights are the rows of `compute_weight_matrix`, without the
+        trailing zeros.
 
         Parameters
         ----------
@@ -67,6 +68,93 @@ class NPTS:
         -------
         iterator over sampling weights
         """
+        train_length = np.shape(train_features)[-1]
+        weight_matrix = NPTS.compute_weight_matrix(
+            train_features,
+            pred_features,
+            target_isnan_positions,
+            kernel,
+            do_exp,
+        )
+        for pred_t, sampling_weights in enumerate(weight_matrix):
+            yield sampling_weights[: train_length + pred_t]
+
+    @staticmethod
+    def compute_weight_matrix(
+        train_features: np.ndarray,
+        pred_features: np.ndarray,
+        target_isnan_positions: np.ndarray,
+        kernel: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        do_exp: bool = True,
+    ) -> np.ndarray:
+        """
+        Given the (logarithm of) kernel as well as training and prediction
+        range features, this method returns the sampling weights for all the
+        time steps in the prediction range.
+
+        Row `pred_t` contains the weights of the training targets and of the
+        predictions until `pred_t` - 1, and zeros for the predictions from
+        `pred_t` onwards.
+
+        Parameters
+        ----------
+        train_features
+            shape: (num_features, train_length)
+        pred_features
+            shape: (num_features, prediction_length)
+        target_isnan_positions:
+            an array of indices where the target is a NaN
+        kernel
+            kernel function that maps pairs of arrays to real numbers, applied
+            to all pairs of time points at once by broadcasting
+        do_exp:
+            exponentiate the weights in case of exponential kernel
+            (for numerical stability we do this here)
+
+        Returns
+        -------
+        sampling weights
+            shape: (prediction_length, train_length + prediction_length)
+        """
+
+        sampling_weights = NPTS.compute_kernel_matrix(
+            train_features, pred_features, kernel, do_exp
+        )
+        return NPTS.reset_nan_positions(
+            sampling_weights, target_isnan_positions
+        )
+
+    @staticmethod
+    def compute_kernel_matrix(
+        train_features: np.ndarray,
+        pred_features: np.ndarray,
+        kernel: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        do_exp: bool = True,
+    ) -> np.ndarray:
+        """
+        Computes the sampling weights of `compute_weight_matrix` before they
+        are reset at the positions where the target is NaN. These weights
+        only depend on the features, so they can be shared by all the time
+        series with the same features.
+
+        Parameters
+        ----------
+        train_features
+            shape: (num_features, train_length)
+        pred_features
+            shape: (num_features, prediction_length)
+        kernel
+            kernel function that maps pairs of arrays to real numbers, applied
+            to all pairs of time points at once by broadcasting
+        do_exp:
+            exponentiate the weights in case of exponential kernel
+            (for numerical stability we do this here)
+
+        Returns
+        -------
+        sampling weights
+            shape: (prediction_length, train_length + prediction_length)
+        """
 
         assert len(np.shape(train_features)) == 2, (
             "Train features should be 2D-array where the rows represent "
@@ -81,44 +169,76 @@ class NPTS:
         train_length = train_features.shape[1]
         prediction_length = pred_features.shape[1]
 
-        for pred_t in range(prediction_length):
-            # Prediction for `pred_t` samples from all the training targets
-            # as well as predictions until `pred_t` - 1
-            sampling_weights = np.zeros(train_length + pred_t)
-            for train_t in range(train_length):
-                sampling_weights[train_t] = kernel(
-                    train_features[:, train_t], pred_features[:, pred_t]
-                )
-
-            for t in range(pred_t):
-                sampling_weights[train_length + t] = kernel(
-                    pred_features[:, t], pred_features[:, pred_t]
-                )
-
-            if do_exp:
-                # To avoid numerical issues with exponentiation.
-                sampling_weights -= max(sampling_weights)
-                sampling_weights = np.exp(sampling_weights)
-
-            # reset kernel at positions where the target is NaN
-            sampling_weights[target_isnan_positions] = 0.0
-
-            # Sometimes (e.g. for a for seasonal climatological kernel ) all
-            # positions with non-zero probability are NaNs, so after resetting
-            # the weights at these positions sampling_weights has only zeroes.
-            # In this case, we want to sample uniformly from the observed
-            # positions.
-            if np.sum(sampling_weights) == 0:
-                sampling_weights[target_isnan_positions] = -1.0
-                sampling_weights += 1.0
-
-            yield sampling_weights
+        # Prediction for `pred_t` samples from all the training targets
+        # as well as predictions until `pred_t` - 1
+        features = np.concatenate([train_features, pred_features], axis=1)
+        is_sampled = _is_sampled_mask(train_length, prediction_length)
+
+        # shape: (prediction_length, train_length + prediction_length)
+        sampling_weights = np.asarray(
+            kernel(
+                features[:, np.newaxis, :], pred_features[:, :, np.newaxis]
+            ),
+            dtype=float,
+        )
+
+        if do_exp:
+            # To avoid numerical issues with exponentiation.
+            sampling_weights[~is_sampled] = -np.inf
+            sampling_weights -= np.max(sampling_weights, axis=1, keepdims=True)
+            sampling_weights = np.exp(sampling_weights)
+        else:
+            sampling_weights[~is_sampled] = 0.0
+
+        return sampling_weights
+
+    @staticmethod
+    def reset_nan_positions(
+        sampling_weights: np.ndarray, target_isnan_positions: np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns a copy of the weights computed by `compute_kernel_matrix`,
+        reset at the positions where the target is NaN.
+
+        Parameters
+        ----------
+        sampling_weights
+            shape: (prediction_length, train_length + prediction_length)
+        target_isnan_positions:
+            an array of indices where the target is a NaN
+
+        Returns
+        -------
+        sampling weights
+            shape: (prediction_length, train_length + prediction_length)
+        """
+        prediction_length, total_length = sampling_weights.shape
+        nan_positions = np.ravel(target_isnan_positions)
+
+        # reset kernel at positions where the target is NaN
+        sampling_weights = sampling_weights.copy()
+        sampling_weights[:, nan_positions] = 0.0
+
+        # Sometimes (e.g. for a for seasonal climatological kernel ) all
+        # positions with non-zero probability are NaNs, so after resetting
+        # the weights at these positions sampling_weights has only zeroes.
+        # In this case, we want to sample uniformly from the observed
+        # positions.
+        all_zeros = np.sum(sampling_weights, axis=1) == 0
+        if np.any(all_zeros):
+            observed = _is_sampled_mask(
+                total_length - prediction_length, prediction_length
+            )[all_zeros]
+            observed[:, nan_positions] = False
+            sampling_weights[all_zeros] = observed
+
+        return sampling_weights
 
     @staticmethod
     def predict(
         targets: pd.Series,
         prediction_length: int,
-        sampling_weights_iterator: Iterator[np.ndarray],
+        sampling_weights: np.ndarray,
         num_samples: int,
     ) -> SampleForecast:
         """
@@ -126,7 +246,7 @@ class NPTS:
         samples for `predcition_length` time points.
 
         Predictions are generated via weighted sampling where the weights are
-        specified in `sampling_weights_iterator`.
+        specified in `sampling_weights`.
 
         Parameters
         ----------
@@ -134,8 +254,9 @@ class NPTS:
             targets to predict
         prediction_length
             prediction length
-        sampling_weights_iterator
-            iterator over weights used for sampling
+        sampling_weights
+            weights used for sampling, as returned by `compute_weight_matrix`
+            shape: (prediction_length, train_length + prediction_length)
         num_samples
             number of samples to set in the :class:`SampleForecast` object
 
@@ -145,51 +266,128 @@ class NPTS:
            a :class:`SampleForecast` object for the given targets
         """
 
+        # samples_pred_range shape: (num_samples, prediction_length)
+        samples_pred_range = NPTS.sample_paths(
+            targets=targets.values[np.newaxis, :],
+            sampling_weights=sampling_weights,
+            uniform_samples=np.random.random(
+                (1, prediction_length, num_samples)
+            ),
+        )[0]
+
+        # Forecast takes as input the prediction range samples, the start date
+        # of the prediction range, and the frequency of the time series.
+        freq = targets.index.freq.freqstr
+        forecast_start = targets.index[-1] + 1 * targets.index.freq
+
+        return SampleForecast(
+            samples=samples_pred_range, start_date=forecast_start, freq=freq
+        )
+
+    @staticmethod
+    def sample_paths(
+        targets: np.ndarray,
+        sampling_weights: np.ndarray,
+        uniform_samples: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Generates prediction samples for several time series which share the
+        same sampling weights.
+
+        Parameters
+        ----------
+        targets
+            training targets of the time series
+            shape: (num_series, train_length)
+        sampling_weights
+            weights used for sampling, as returned by `compute_weight_matrix`
+            shape: (prediction_length, train_length + prediction_length)
+        uniform_samples
+            samples from U(0, 1) used to sample the positions, see
+            `WeightedSampler.sample_rows`
+            shape: (num_series, prediction_length, num_samples)
+
+        Returns
+        -------
+        prediction samples
+            shape: (num_series, num_samples, prediction_length)
+        """
+        num_series, train_length = targets.shape
+        _, prediction_length, num_samples = uniform_samples.shape
+
         # Note that to generate prediction from the second time step onwards,
         # we need the sample predicted for all the previous time steps in the
         # prediction range.
         # To make this simpler, we replicate the training targets for
         # `num_samples` times.
 
-        # samples shape: (num_samples, train_length + prediction_length)
-        samples = np.tile(
-            A=np.concatenate((targets.values, np.zeros(prediction_length))),
-            reps=(num_samples, 1),
+        # samples shape:
+        # (num_series, num_samples, train_length + prediction_length)
+        samples = np.repeat(
+            np.concatenate(
+                (targets, np.zeros((num_series, prediction_length))), axis=1
+            )[:, np.newaxis, :],
+            num_samples,
+            axis=1,
         )
 
-        train_length = len(targets)
-        for t, sampling_weights in enumerate(sampling_weights_iterator):
-            samples_ix = WeightedSampler.sample(sampling_weights, num_samples)
-            samples[:, train_length + t] = samples[
-                np.arange(num_samples), samples_ix
-            ]
+        # The sampled positions do not depend on the sampled values, so they
+        # are drawn for all the time steps at once.
+        # samples_ix shape: (num_series, prediction_length, num_samples)
+        # the row of time step t only covers the positions before it
+        samples_ix = WeightedSampler.sample_rows(
+            sampling_weights,
+            num_samples,
+            uniform_samples,
+            row_lengths=train_length + np.arange(prediction_length),
+        )
 
-        # Forecast takes as input the prediction range samples, the start date
-        # of the prediction range, and the frequency of the time series.
-        samples_pred_range = samples[:, train_length:]  # prediction range only
+        series_range = np.arange(num_series)[:, np.newaxis]
+        samples_range = np.arange(num_samples)[np.newaxis, :]
+        for t in range(prediction_length):
+            samples[:, :, train_length + t] = samples[
+                series_range, samples_range, samples_ix[:, t, :]
+            ]
 
-        freq = targets.index.freq.freqstr
-        forecast_start = targets.index[-1] + 1 * targets.index.freq
+        # prediction range only
+        return samples[:, :, train_length:]
 
-        return SampleForecast(
-            samples=samples_pred_range, start_date=forecast_start, freq=freq
-        )
+    # The kernels map feature arrays of shape (num_features, ...) to arrays
+    # with the broadcast shape of the remaining axes, so that they can be
+    # applied to single pairs of time points as well as to all pairs at once.
 
     @staticmethod
     def log_distance_kernel(
         alpha: float,
-    ) -> Callable[[np.ndarray, np.ndarray], float]:
-        return lambda x, y: cast(float, -alpha * np.sum(np.abs(x - y)))
+    ) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        return lambda x, y: -alpha * np.sum(np.abs(x - y), axis=0)
 
     @staticmethod
     def log_weighted_distance_kernel(
         kernel_weights: List[float],
-    ) -> Callable[[np.ndarray, np.ndarray], float]:
-        kernel_weights_nd = np.ndarray(kernel_weights, dtype=np.float32)
-        return lambda x, y: cast(
-            float, -np.sum(kernel_weights_nd * np.abs(x - y))
-        )
+    ) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        kernel_weights_nd = np.array(kernel_weights, dtype=np.float32)
+
+        def kernel(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+            distance = np.abs(x - y)
+            weights = kernel_weights_nd.reshape(
+                (-1,) + (1,) * (distance.ndim - 1)
+            )
+            return -np.sum(weights * distance, axis=0)
+
+        return kernel
 
     @staticmethod
-    def uniform_kernel() -> Callable[[np.ndarray, np.ndarray], float]:
-        return lambda x, y: 1.0 if np.sum(np.abs(x - y)) == 0.0 else 0.0
+    def uniform_kernel() -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+        return lambda x, y: (np.sum(np.abs(x - y), axis=0) == 0.0).astype(
+            float
+        )
+
+
+def _is_sampled_mask(train_length: int, prediction_length: int) -> np.ndarray:
+    # position `t` can be sampled for the prediction of time step `pred_t`
+    # iff t < train_length + pred_t
+    return (
+        np.arange(train_length + prediction_length)[np.newaxis, :]
+        < (train_length + np.arange(prediction_length))[:, np.newaxis]
+    )
@@ -12,8 +12,10 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import itertools
+from collections import OrderedDict
 from enum import Enum
-from typing import Iterator, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 # Third-party imports
 import numpy as np
@@ -22,7 +24,7 @@ import pandas as pd
 # First-party imports
 from gluonts.core.component import validated
 from gluonts.core.exception import GluonTSDataError
-from gluonts.dataset.common import Dataset
+from gluonts.dataset.common import DataEntry, Dataset
 from gluonts.model.forecast import SampleForecast
 from gluonts.model.predictor import RepresentablePredictor
 from gluonts.time_feature import time_features_from_frequency_str
@@ -152,6 +154,11 @@ class NPTSPredictor(RepresentablePredictor):
     feature_scale
         scale for time (seasonal) features in order to sample past seasons
         with higher probability
+    batch_size
+        number of time series that are read from the dataset at once; the
+        time series of a batch which have the same start and length (after
+        slicing to the context length) share their features and sampling
+        weights, which are then computed once
     """
 
     @validated()
@@ -166,7 +173,10 @@ class NPTSPredictor(RepresentablePredictor):
         use_default_time_features: bool = True,
         num_default_time_features: int = 1,
         feature_scale: float = 1000.0,
+        batch_size: int = 100,
     ) -> None:
+        assert batch_size > 0, "The value of `batch_size` should be > 0"
+
         self.prediction_length = prediction_length
         self.freq = freq
         # Similar to lag upper bound in AR2N2 we limit the context length to
@@ -180,6 +190,7 @@ class NPTSPredictor(RepresentablePredictor):
         self.use_seasonal_model = use_seasonal_model
         self.use_default_time_features = use_default_time_features
         self.feature_scale = feature_scale
+        self.batch_size = batch_size
 
         if not self._is_exp_kernel():
             self.kernel = NPTS.uniform_kernel()
@@ -199,30 +210,124 @@ class NPTSPredictor(RepresentablePredictor):
     def predict(
         self, dataset: Dataset, num_samples: int = 100, **kwargs
     ) -> Iterator[SampleForecast]:
-        for data in dataset:
-            start = pd.Timestamp(data["start"])
-            target = np.asarray(data["target"], np.float32)
-            index = pd.date_range(
-                start=start, freq=self.freq, periods=len(target)
+        data_it = iter(dataset)
+        while True:
+            batch = list(itertools.islice(data_it, self.batch_size))
+            if not batch:
+                return
+            yield from self._predict_batch(batch, num_samples)
+
+    def _get_inputs(
+        self, data: DataEntry
+    ) -> Tuple[pd.Series, Optional[np.ndarray]]:
+        start = pd.Timestamp(data["start"])
+        target = np.asarray(data["target"], np.float32)
+        index = pd.date_range(start=start, freq=self.freq, periods=len(target))
+
+        # Slice the time series until context_length or history length
+        # depending on which ever is minimum
+        train_length = min(len(target), self.context_length)
+        ts = pd.Series(index=index, data=target)[-train_length:]
+        if "feat_dynamic_real" in data.keys():
+            custom_features = np.array(
+                [
+                    dynamic_feature[-train_length - self.prediction_length :]
+                    for dynamic_feature in data["feat_dynamic_real"]
+                ]
             )
+        else:
+            custom_features = None
 
-            # Slice the time series until context_length or history length
-            # depending on which ever is minimum
-            train_length = min(len(target), self.context_length)
-            ts = pd.Series(index=index, data=target)[-train_length:]
-            if "feat_dynamic_real" in data.keys():
-                custom_features = np.array(
-                    [
-                        dynamic_feature[
-                            -train_length - self.prediction_length :
-                        ]
-                        for dynamic_feature in data["feat_dynamic_real"]
-                    ]
+        return ts, custom_features
+
+    def _predict_batch(
+        self, batch: List[DataEntry], num_samples: int
+    ) -> List[SampleForecast]:
+        """
+        Predicts the time series of `batch`, with the same result as calling
+        `predict_time_series` on each of them in turn.
+
+        The time series with the same index share their features (unless
+        they have custom features) and thus their sampling weights. These
+        are computed once per group, and the samples of the whole group are
+        drawn at once.
+        """
+        inputs = [self._get_inputs(data) for data in batch]
+
+        # drawn series after series, as `predict_time_series` would draw them
+        uniform_samples = np.random.random(
+            (len(batch), self.prediction_length, num_samples)
+        )
+
+        groups: Dict[Any, List[int]] = OrderedDict()
+        for k, (ts, custom_features) in enumerate(inputs):
+            self._check_target(ts)
+            key = (
+                k
+                if custom_features is not None and self.use_seasonal_model
+                else (ts.index[0], len(ts))
+            )
+            groups.setdefault(key, []).append(k)
+
+        forecasts: List[SampleForecast] = []
+        samples = np.empty((len(batch), num_samples, self.prediction_length))
+        for members in groups.values():
+            ts, custom_features = inputs[members[0]]
+            train_features, predict_features = self._get_features(
+                ts.index, self.prediction_length, custom_features
+            )
+            kernel_weights = NPTS.compute_kernel_matrix(
+                train_features=train_features,
+                pred_features=predict_features,
+                kernel=self.kernel,
+                do_exp=self._is_exp_kernel(),
+            )
+
+            targets = np.stack([inputs[k][0].values for k in members])
+            isnan = np.isnan(targets)
+            has_nans = np.any(isnan, axis=1)
+
+            # the time series without NaNs share the same sampling weights
+            no_nans = np.array(members)[~has_nans]
+            if len(no_nans) > 0:
+                samples[no_nans] = NPTS.sample_paths(
+                    targets=targets[~has_nans],
+                    sampling_weights=NPTS.reset_nan_positions(
+                        kernel_weights, np.empty(0, dtype=int)
+                    ),
+                    uniform_samples=uniform_samples[no_nans],
+                )
+
+            for j in np.flatnonzero(has_nans):
+                k = members[j]
+                samples[k] = NPTS.sample_paths(
+                    targets=targets[j : j + 1],
+                    sampling_weights=NPTS.reset_nan_positions(
+                        kernel_weights, np.argwhere(isnan[j])
+                    ),
+                    uniform_samples=uniform_samples[k : k + 1],
+                )[0]
+
+        for k, (ts, _) in enumerate(inputs):
+            forecasts.append(
+                SampleForecast(
+                    samples=samples[k],
+                    start_date=ts.index[-1] + 1 * ts.index.freq,
+                    freq=ts.index.freq.freqstr,
                 )
-            else:
-                custom_features = None
+            )
 
-            yield self.predict_time_series(ts, num_samples, custom_features)
+        return forecasts
+
+    def _check_target(self, ts: pd.Series) -> None:
+        if np.all(np.isnan(ts.values[-self.context_length :])):
+            raise GluonTSDataError(
+                f"The last {self.context_length} positions of the target time "
+                f"series are all NaN. Please increase the `context_length` "
+                f"parameter of your NPTS model so the last "
+                f"{self.context_length} positions of each target contain at "
+                f"least one non-NaN value."
+            )
 
     def predict_time_series(
         self,
@@ -251,23 +356,16 @@ class NPTSPredictor(RepresentablePredictor):
           A prediction for the supplied `ts` and `custom_features`.
         """
 
-        if np.all(np.isnan(ts.values[-self.context_length :])):
-            raise GluonTSDataError(
-                f"The last {self.context_length} positions of the target time "
-                f"series are all NaN. Please increase the `context_length` "
-                f"parameter of your NPTS model so the last "
-                f"{self.context_length} positions of each target contain at "
-                f"least one non-NaN value."
-            )
+        self._check_target(ts)
 
         # Get the features for both training and prediction ranges
         train_features, predict_features = self._get_features(
             ts.index, self.prediction_length, custom_features
         )
 
-        # Compute weights for sampling for each time step `t` in the
+        # Compute weights for sampling for all time steps `t` in the
         # prediction range
-        sampling_weights_iterator = NPTS.compute_weights(
+        sampling_weights = NPTS.compute_weight_matrix(
             train_features=train_features,
             pred_features=predict_features,
             target_isnan_positions=np.argwhere(np.isnan(ts.values)),
@@ -277,7 +375,7 @@ class NPTSPredictor(RepresentablePredictor):
 
         # Generate forecasts
         forecast = NPTS.predict(
-            ts, self.prediction_length, sampling_weights_iterator, num_samples
+            ts, self.prediction_length, sampling_weights, num_samples
         )
 
         return forecast
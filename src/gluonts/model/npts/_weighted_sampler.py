@@ -55,3 +55,63 @@ class WeightedSampler:
         )
 
         return samples_ix
+
+    @staticmethod
+    def sample_rows(
+        weights, num_samples, uniform_samples=None, row_lengths=None
+    ):
+        """
+        Sample indices according to each row of the 2D-array `weights`, with
+        the same result as calling `sample` on each row in turn: row `r` of
+        the result contains the `num_samples` indices sampled according to
+        `weights`[`r`].
+
+        Rows whose weights are all zero are sampled uniformly among their
+        first `row_lengths`[`r`] indices, or among all indices if
+        `row_lengths` is None. This is the same as calling `sample` on the
+        rows trimmed to these lengths, e.g. when the rows are padded with
+        zero weights.
+
+        If `uniform_samples` from U(0, 1) are given, with shape
+        (..., `num_rows`, `num_samples`), they are used instead of new random
+        draws. Each of the leading indices then corresponds to an independent
+        sampling with the same weights, and the result has the same shape as
+        `uniform_samples`.
+
+        :param weights:
+        :param num_samples:
+        :param uniform_samples:
+        :param row_lengths:
+        :return:
+        """
+        assert np.all(weights >= 0.0), "Sampling weights must be non-negative"
+        num_rows, num_cols = weights.shape
+        if row_lengths is None:
+            row_lengths = np.full(num_rows, num_cols)
+        is_valid = (
+            np.arange(num_cols)[np.newaxis, :]
+            < np.asarray(row_lengths)[:, np.newaxis]
+        )
+        weights = np.where(
+            np.sum(weights, axis=1, keepdims=True) == 0.0,
+            is_valid.astype(float),
+            weights,
+        )
+
+        cumsum_weights = np.cumsum(weights, axis=1)
+        total_weights = cumsum_weights[:, -1:]
+
+        # The uniform samples are drawn row after row, as `sample` would
+        # draw them.
+        if uniform_samples is None:
+            uniform_samples = np.random.random((len(weights), num_samples))
+        uniform_samples = total_weights * uniform_samples
+
+        # A single search per row, for all the samples of that row.
+        samples_ix = np.empty(uniform_samples.shape, dtype=int)
+        for r in range(len(weights)):
+            samples_ix[..., r, :] = np.searchsorted(
+                cumsum_weights[r], uniform_samples[..., r, :], side="left"
+            )
+
+        return samples_ix
@@ -29,6 +29,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -55,6 +56,7 @@ from gluonts.dataset.common import DataEntry, Dataset, ListDataset
 from .forecast_generator import ForecastGenerator, SampleForecastGenerator
 from gluonts.dataset.loader import DataBatch, InferenceDataLoader
 from gluonts.model.forecast import Forecast
+from gluonts.support.shared_memory import ArrayRingBuffer
 
 from gluonts.support.util import (
     export_repr_block,
@@ -291,18 +293,51 @@ class GluonPredictor(Predictor):
         raise NotImplementedError
 
     def predict(
-        self, dataset: Dataset, num_samples: Optional[int] = None
+        self,
+        dataset: Dataset,
+        num_samples: Optional[int] = None,
+        wrap_data_loader: Optional[
+            Callable[[Iterable[DataBatch]], Iterable[DataBatch]]
+        ] = None,
+        wrap_prediction_net: Optional[Callable[[Callable], Callable]] = None,
     ) -> Iterator[Forecast]:
-        inference_data_loader = InferenceDataLoader(
+        """
+        Compute forecasts for the time series in the provided dataset.
+
+        Parameters
+        ----------
+        dataset
+            The dataset containing the time series to predict.
+        num_samples
+            Number of sample paths of the forecasts, for sampling predictors.
+        wrap_data_loader
+            If given, the batches are read from the result of this function
+            applied to the inference data loader, e.g. to time the input
+            transformation.
+        wrap_prediction_net
+            If given, the network is called through the result of this
+            function applied to it, e.g. to time the forward passes.
+
+        Returns
+        -------
+        Iterator[Forecast]
+            An iterator of the forecasts, in the order of the time series.
+        """
+        inference_data_loader: Iterable[DataBatch] = InferenceDataLoader(
             dataset,
             self.input_transform,
             self.batch_size,
             ctx=self.ctx,
             dtype=self.dtype,
         )
+        prediction_net: Callable = self.prediction_net
+        if wrap_data_loader is not None:
+            inference_data_loader = wrap_data_loader(inference_data_loader)
+        if wrap_prediction_net is not None:
+            prediction_net = wrap_prediction_net(prediction_net)
         yield from self.forecast_generator(
             inference_data_loader=inference_data_loader,
-            prediction_net=self.prediction_net,
+            prediction_net=prediction_net,
             input_names=self.input_names,
             freq=self.freq,
             output_transform=self.output_transform,
@@ -517,27 +552,53 @@ class WorkerError:
         self.msg = msg
 
 
+def _forecasts_to_states(forecasts: List[Forecast]) -> List[Tuple[type, Dict]]:
+    # exposes the arrays of the forecasts (e.g. samples) to the shared memory
+    # transport, which only looks into dicts, lists and tuples
+    return [(type(forecast), dict(vars(forecast))) for forecast in forecasts]
+
+
+def _forecasts_from_states(states: List[Tuple[type, Dict]]) -> List[Forecast]:
+    forecasts = []
+    for cls, state in states:
+        forecast = cls.__new__(cls)
+        forecast.__dict__.update(state)
+        forecasts.append(forecast)
+    return forecasts
+
+
 def _worker_loop(
     predictor_path: Path,
     input_queue: mp.Queue,
     output_queue: mp.Queue,
     worker_id,
+    input_buffer: Optional[ArrayRingBuffer] = None,
+    output_buffer: Optional[ArrayRingBuffer] = None,
     **kwargs,
 ):
     """
     Worker loop for multiprocessing Predictor.
     Loads the predictor serialized in predictor_path
     reads inputs from input_queue and writes forecasts to output_queue
+
+    If shared memory buffers are given, the arrays of the inputs and of the
+    forecasts are passed through them rather than through the queues.
     """
 
     predictor = Predictor.deserialize(predictor_path)
     while True:
-        idx, data_chunk = input_queue.get()
+        idx, message = input_queue.get()
         if idx is None:
             output_queue.put((None, None, None))
             break
         try:
+            if input_buffer is not None:
+                data_chunk = input_buffer.unpack(message, copy=False)
+            else:
+                data_chunk = message
             result = list(predictor.predict(data_chunk, **kwargs))
+            if output_buffer is not None:
+                result = output_buffer.pack(_forecasts_to_states(result))
         except Exception:
             we = WorkerError(
                 "".join(traceback.format_exception(*sys.exc_info()))
@@ -545,6 +606,12 @@ def _worker_loop(
             output_queue.put((we, None, None))
             break
         output_queue.put((idx, worker_id, result))
+        # The parent sends the next chunk to this worker only after having
+        # received this result, so with at least two slots the slot of this
+        # chunk is not overwritten before the result has been pickled, even
+        # if the forecasts hold views on the inputs.
+        if input_buffer is not None:
+            input_buffer.release(message)
 
 
 class ParallelizedPredictor(Predictor):
@@ -568,6 +635,14 @@ class ParallelizedPredictor(Predictor):
         None, one worker per CPU will be used.
     chunk_size
         Number of items to pass per call
+    shared_memory_size
+        Size in bytes of the shared memory used to pass the arrays of the
+        inputs (e.g. targets) to each worker, and the same for the arrays of
+        the forecasts (e.g. samples) from each worker. Only the remaining
+        data is pickled through the queues, as are chunks whose arrays do not
+        fit in half of this size. The buffers are allocated up front, for
+        each worker. If set to None (default), everything is pickled through
+        the queues.
     """
 
     def __init__(
@@ -575,6 +650,7 @@ class ParallelizedPredictor(Predictor):
         base_predictor: Predictor,
         num_workers: Optional[int] = None,
         chunk_size=1,
+        shared_memory_size: Optional[int] = None,
     ) -> None:
         super().__init__(base_predictor.prediction_length, base_predictor.freq)
 
@@ -583,6 +659,7 @@ class ParallelizedPredictor(Predictor):
             num_workers if num_workers is not None else mp.cpu_count()
         )
         self._chunk_size = chunk_size
+        self._shared_memory_size = shared_memory_size
         self._num_running_workers = 0
         self._input_queues = []
         self._output_queue = None
@@ -607,16 +684,36 @@ class ParallelizedPredictor(Predictor):
             predictor_path = Path(tempdir)
             self._base_predictor.serialize(predictor_path)
 
-            # TODO: Consider using shared memory for the data transfer.
-
             self._input_queues = [mp.Queue() for _ in range(self._num_workers)]
             self._output_queue = mp.Queue()
 
+            if self._shared_memory_size is not None:
+                # two slots per buffer, see _worker_loop
+                slot_size = self._shared_memory_size // 2
+                input_buffers = [
+                    ArrayRingBuffer(slot_size, num_slots=2)
+                    for _ in range(self._num_workers)
+                ]
+                output_buffers = [
+                    ArrayRingBuffer(slot_size, num_slots=2)
+                    for _ in range(self._num_workers)
+                ]
+            else:
+                input_buffers = [None] * self._num_workers
+                output_buffers = [None] * self._num_workers
+
             workers = []
             for worker_id, in_q in enumerate(self._input_queues):
                 worker = mp.Process(
                     target=_worker_loop,
-                    args=(predictor_path, in_q, self._output_queue, worker_id),
+                    args=(
+                        predictor_path,
+                        in_q,
+                        self._output_queue,
+                        worker_id,
+                        input_buffers[worker_id],
+                        output_buffers[worker_id],
+                    ),
                     kwargs=kwargs,
                 )
 
@@ -643,6 +740,11 @@ class ParallelizedPredictor(Predictor):
                     self.terminate()
                     raise Exception(idx.msg)
                 if idx is not None:
+                    output_buffer = output_buffers[worker_id]
+                    if output_buffer is not None:
+                        result = _forecasts_from_states(
+                            output_buffer.unpack(result)
+                        )
                     self._data_buffer[idx] = result
                 return idx, worker_id, result
 
@@ -655,6 +757,9 @@ class ParallelizedPredictor(Predictor):
 
             def send(worker_id, chunk):
                 q = self._input_queues[worker_id]
+                input_buffer = input_buffers[worker_id]
+                if input_buffer is not None:
+                    chunk = input_buffer.pack(chunk)
                 q.put((self._send_idx, chunk))
                 self._send_idx += 1
 
@@ -15,10 +15,11 @@
 from typing import List, Optional
 
 # Third-party imports
+import numpy as np
 from mxnet.gluon import HybridBlock
 
 # First-party imports
-from gluonts.core.component import validated
+from gluonts.core.component import DType, validated
 from gluonts.dataset.field_names import FieldName
 from gluonts.distribution import StudentTOutput, DistributionOutput
 from gluonts.model.estimator import GluonEstimator
@@ -115,6 +116,9 @@ class TransformerEstimator(GluonEstimator):
         num_parallel_samples
             Number of evaluation samples per time series to increase parallelism during inference.
             This is a model optimization that does not affect the accuracy (default: 100)
+        dtype
+            Data type of the network; with np.float16, it is trained in mixed
+            precision (default: np.float32)
     """
 
     @validated()
@@ -140,8 +144,9 @@ class TransformerEstimator(GluonEstimator):
         use_feat_dynamic_real: bool = False,
         use_feat_static_cat: bool = False,
         num_parallel_samples: int = 100,
+        dtype: DType = np.float32,
     ) -> None:
-        super().__init__(trainer=trainer)
+        super().__init__(trainer=trainer, dtype=dtype)
 
         assert (
             prediction_length > 0
@@ -169,6 +174,7 @@ class TransformerEstimator(GluonEstimator):
             context_length if context_length is not None else prediction_length
         )
         self.distr_output = distr_output
+        self.distr_output.dtype = dtype
         self.dropout_rate = dropout_rate
         self.use_feat_dynamic_real = use_feat_dynamic_real
         self.use_feat_static_cat = use_feat_static_cat
@@ -226,10 +232,12 @@ class TransformerEstimator(GluonEstimator):
                     field=FieldName.TARGET,
                     # in the following line, we add 1 for the time dimension
                     expected_ndim=1 + len(self.distr_output.event_shape),
+                    dtype=self.dtype,
                 ),
                 AddObservedValuesIndicator(
                     target_field=FieldName.TARGET,
                     output_field=FieldName.OBSERVED_VALUES,
+                    dtype=self.dtype,
                 ),
                 AddTimeFeatures(
                     start_field=FieldName.START,
@@ -243,6 +251,7 @@ class TransformerEstimator(GluonEstimator):
                     output_field=FieldName.FEAT_AGE,
                     pred_length=self.prediction_length,
                     log_scale=True,
+                    dtype=self.dtype,
                 ),
                 VstackFeatures(
                     output_field=FieldName.FEAT_TIME,
@@ -282,6 +291,7 @@ class TransformerEstimator(GluonEstimator):
             embedding_dimension=self.embedding_dimension,
             lags_seq=self.lags_seq,
             scaling=True,
+            dtype=self.dtype,
         )
 
         return training_network
@@ -302,6 +312,7 @@ class TransformerEstimator(GluonEstimator):
             lags_seq=self.lags_seq,
             scaling=True,
             num_parallel_samples=self.num_parallel_samples,
+            dtype=self.dtype,
         )
 
         copy_parameters(trained_network, prediction_network)
@@ -313,4 +324,5 @@ class TransformerEstimator(GluonEstimator):
             freq=self.freq,
             prediction_length=self.prediction_length,
             ctx=self.trainer.ctx,
+            dtype=self.dtype,
         )
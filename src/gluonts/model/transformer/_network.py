@@ -16,11 +16,12 @@ from typing import Tuple, List, Optional
 
 # Third-party imports
 import mxnet as mx
+import numpy as np
 
 # First-party imports
 from gluonts.block.scaler import NOPScaler, MeanScaler
 from gluonts.block.feature import FeatureEmbedder
-from gluonts.core.component import validated
+from gluonts.core.component import DType, validated
 from gluonts.distribution import DistributionOutput
 from gluonts.model.common import Tensor
 from gluonts.model.transformer.trans_encoder import TransformerEncoder
@@ -51,6 +52,7 @@ class TransformerNetwork(mx.gluon.HybridBlock):
         embedding_dimension: int,
         lags_seq: List[int],
         scaling: bool = True,
+        dtype: DType = np.float32,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
@@ -62,6 +64,7 @@ class TransformerNetwork(mx.gluon.HybridBlock):
         self.cardinality = cardinality
         self.embedding_dimension = embedding_dimension
         self.distr_output = distr_output
+        self.dtype = dtype
 
         assert len(set(lags_seq)) == len(
             lags_seq
@@ -75,16 +78,19 @@ class TransformerNetwork(mx.gluon.HybridBlock):
         with self.name_scope():
             self.proj_dist_args = distr_output.get_args_proj()
             self.encoder = encoder
+            self.encoder.cast(dtype=dtype)
             self.decoder = decoder
+            self.decoder.cast(dtype=dtype)
             self.embedder = FeatureEmbedder(
                 cardinalities=cardinality,
                 embedding_dims=[embedding_dimension for _ in cardinality],
+                dtype=dtype,
             )
 
             if scaling:
-                self.scaler = MeanScaler(keepdims=True)
+                self.scaler = MeanScaler(keepdims=True, dtype=dtype)
             else:
-                self.scaler = NOPScaler(keepdims=True)
+                self.scaler = NOPScaler(keepdims=True, dtype=dtype)
 
     @staticmethod
     def get_lagged_subsequences(
@@ -229,11 +235,12 @@ class TransformerNetwork(mx.gluon.HybridBlock):
         return inputs, scale, static_feat
 
     @staticmethod
-    def upper_triangular_mask(F, d):
+    def upper_triangular_mask(F, d, dtype: DType = np.float32):
         mask = F.zeros_like(F.eye(d))
         for k in range(d - 1):
             mask = mask + F.eye(d, d, k + 1)
-        return mask * LARGE_NEGATIVE_VALUE
+        # scaled in float32, since 0 * LARGE_NEGATIVE_VALUE is nan in float16
+        return F.cast(mask * LARGE_NEGATIVE_VALUE, dtype=dtype)
 
     def hybrid_forward(self, F, x, *args, **kwargs):
         raise NotImplementedError
@@ -294,7 +301,9 @@ class TransformerTrainingNetwork(TransformerNetwork):
         dec_output = self.decoder(
             dec_input,
             enc_out,
-            self.upper_triangular_mask(F, self.prediction_length),
+            self.upper_triangular_mask(
+                F, self.prediction_length, dtype=self.dtype
+            ),
         )
 
         # compute loss
@@ -405,7 +414,7 @@ class TransformerPredictionNetwork(TransformerNetwork):
             )
 
             # (batch_size * num_samples, 1, *target_shape)
-            new_samples = distr.sample()
+            new_samples = distr.sample(dtype=self.dtype)
 
             # (batch_size * num_samples, seq_len, *target_shape)
             repeated_past_target = F.concat(
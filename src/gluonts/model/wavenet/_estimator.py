@@ -260,7 +260,13 @@ class WaveNetEstimator(GluonEstimator):
         )
 
     def train(
-        self, training_data: Dataset, validation_data: Optional[Dataset] = None
+        self,
+        training_data: Dataset,
+        validation_data: Optional[Dataset] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: int = 2,
+        batched_split: bool = False,
+        resume_from: Optional[str] = None,
     ) -> Predictor:
         has_negative_data = any(np.any(d["target"] < 0) for d in training_data)
         low = -10.0 if has_negative_data else 0
@@ -286,6 +292,9 @@ class WaveNetEstimator(GluonEstimator):
             batch_size=self.trainer.batch_size,
             num_batches_per_epoch=self.trainer.num_batches_per_epoch,
             ctx=self.trainer.ctx,
+            num_workers=num_workers,
+            num_prefetch=num_prefetch,
+            batched_split=batched_split,
         )
 
         validation_data_loader = None
@@ -305,12 +314,16 @@ class WaveNetEstimator(GluonEstimator):
             params.update(pred_length=self.train_window_length)
             trained_net = WaveNet(**params)
 
-        self.trainer(
-            net=trained_net,
-            input_names=get_hybrid_forward_input_names(trained_net),
-            train_iter=training_data_loader,
-            validation_iter=validation_data_loader,
-        )
+        try:
+            self.trainer(
+                net=trained_net,
+                input_names=get_hybrid_forward_input_names(trained_net),
+                train_iter=training_data_loader,
+                validation_iter=validation_data_loader,
+                resume_from=resume_from,
+            )
+        finally:
+            training_data_loader.terminate()
 
         # ensure that the prediction network is created within the same MXNet
         # context as the one that was used during training
@@ -105,8 +105,20 @@ def cli() -> None:
         '"forecaster" option is present.'
     ),
 )
+@click.option(
+    "--backend",
+    type=click.Choice(["gunicorn", "async"]),
+    envvar="GLUONTS_SERVE_BACKEND",
+    default="gunicorn",
+    help=(
+        "The server running the inference service: 'gunicorn' forks several "
+        "workers serving one request at a time, while 'async' serves "
+        "concurrent requests in a single process using asyncio, sharing one "
+        "predictor (requires aiohttp)."
+    ),
+)
 def serve_command(
-    data_path: str, forecaster: Optional[str], force_static: bool
+    data_path: str, forecaster: Optional[str], force_static: bool, backend: str
 ) -> None:
     from gluonts.shell import serve
 
@@ -119,12 +131,15 @@ def serve_command(
     else:
         forecaster_type = None
 
-    gunicorn_app = serve.make_gunicorn_app(
+    make_server_app = (
+        serve.make_async_app if backend == "async" else serve.make_gunicorn_app
+    )
+    server_app = make_server_app(
         env=ServeEnv(Path(data_path)),
         forecaster_type=forecaster_type,
         settings=Settings(),
     )
-    gunicorn_app.run()
+    server_app.run()
 
 
 @cli.command(name="train")
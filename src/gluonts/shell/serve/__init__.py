@@ -12,12 +12,15 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import gc
 import logging
 import multiprocessing
 from ipaddress import IPv4Address
-from typing import Optional, Type, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Type, Union
 
 # Third-party imports
+import numpy as np
 from flask import Flask
 from gunicorn.app.base import BaseApplication
 from pydantic import BaseSettings
@@ -26,11 +29,21 @@ from pydantic import BaseSettings
 import gluonts
 from gluonts.core import fqname_for
 from gluonts.core.component import check_gpu_support
+from gluonts.dataset.common import ListDataset
+from gluonts.dataset.loader import InferenceDataLoader
 from gluonts.model.estimator import Estimator
-from gluonts.model.predictor import Predictor
+from gluonts.model.predictor import GluonPredictor, Predictor
 from gluonts.shell.sagemaker import ServeEnv
 
+from .admission import AdmissionController
 from .app import make_app
+from .batching import RequestBatcher
+from .cache import LRUCache, ResultCache, configuration_key, model_digest
+from .metrics import ServiceMetrics, predict_with_metrics
+from .models import ModelRegistry, UnknownModel
+
+if TYPE_CHECKING:  # aiohttp is only needed by the async backend
+    from .async_app import AsyncApplication
 
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +62,7 @@ class Settings(BaseSettings):
         env_prefix = ""
 
     model_server_workers: Optional[int] = None
+    model_server_threads: Optional[int] = None
     max_content_length: int = 6 * MB
 
     sagemaker_server_address: IPv4Address = IPv4Address("0.0.0.0")
@@ -61,6 +75,44 @@ class Settings(BaseSettings):
     sagemaker_max_payload_in_mb: int = 6
     sagemaker_max_concurrent_transforms: int = 2 ** 32 - 1
 
+    # requests arriving within this window (0 disables batching) are
+    # predicted together, up to the given number of time series
+    gluonts_batch_window_ms: float = 0.0
+    gluonts_batch_max_series: int = 32
+
+    # in dynamic mode, the predictors built for the last configurations are
+    # cached and reused (0 disables the cache), for up to the given number of
+    # seconds if set
+    gluonts_predictor_cache_size: int = 16
+    gluonts_predictor_cache_ttl: Optional[float] = None
+
+    # in static mode, hybridize and run the predictor on a dummy time series
+    # before serving requests
+    gluonts_warm_up: bool = True
+
+    # requests are rejected with a 503 response, asking to retry after the
+    # given number of seconds, when the total number of values (series x
+    # prediction length x samples) of the requests processed by all the
+    # workers would exceed the given budget (0 disables the limit)
+    gluonts_max_inflight_items: int = 0
+    gluonts_retry_after: int = 1
+
+    # the forecasts of single time series are cached, up to the given size
+    # in memory (0 disables the cache), and in the given directory if set;
+    # if a seed is set, each time series is predicted on its own with a seed
+    # derived from its content, so that the cached forecasts of sampling
+    # predictors are reproducible
+    gluonts_result_cache_mb: float = 0.0
+    gluonts_result_cache_dir: Optional[Path] = None
+    gluonts_result_cache_seed: Optional[int] = None
+
+    # in multi-model mode, the model directory contains one model per
+    # subdirectory, and each request is routed to the model named by the
+    # "model" field of its configuration; the models are loaded when first
+    # requested and are evicted when they exceed the given memory budget
+    gluonts_multi_model: bool = False
+    gluonts_model_cache_mb: float = 1024.0
+
     @property
     def sagemaker_server_bind(self) -> str:
         return f"{self.sagemaker_server_address}:{self.sagemaker_server_port}"
@@ -90,6 +142,18 @@ class Settings(BaseSettings):
             logger.info(f"Using {cpu_count} workers")
             return cpu_count
 
+    @property
+    def number_of_threads(self) -> int:
+        if self.model_server_threads:
+            return self.model_server_threads
+
+        elif self.gluonts_batch_window_ms > 0:
+            # each request waiting for its batch occupies a thread
+            return self.gluonts_batch_max_series
+
+        else:
+            return 1
+
 
 class Application(BaseApplication):
     def __init__(self, app, config) -> None:
@@ -112,13 +176,59 @@ class Application(BaseApplication):
         logger.info("Shutting down GluonTS scoring service")
 
 
-def make_gunicorn_app(
+def warm_up(predictor: Predictor) -> bool:
+    """
+    Hybridizes the network of a `GluonPredictor` and predicts a dummy time
+    series, so that the lazily initialized state of the predictor (e.g. the
+    cached graph of the network) is built once, before the server forks its
+    workers or serves its first request.
+
+    Returns whether the warm-up succeeded; a failure, e.g. because the model
+    requires features that the dummy time series does not have, is logged
+    and otherwise ignored.
+    """
+    dataset = ListDataset(
+        [
+            {
+                "start": "2000-01-01 00:00:00",
+                "target": np.zeros(predictor.prediction_length),
+            }
+        ],
+        freq=predictor.freq,
+    )
+
+    try:
+        if isinstance(predictor, GluonPredictor):
+            batch = next(
+                iter(
+                    InferenceDataLoader(
+                        dataset,
+                        predictor.input_transform,
+                        predictor.batch_size,
+                        ctx=predictor.ctx,
+                        dtype=predictor.dtype,
+                    )
+                )
+            )
+            predictor.hybridize(batch)
+
+        for _ in predictor.predict(dataset, num_samples=1):
+            pass
+    except Exception as error:
+        logger.warning(f"Failed to warm up the predictor: {error!r}")
+        return False
+
+    logger.info("Warmed up the predictor")
+    return True
+
+
+def make_predictor_factory(
     env: ServeEnv,
     forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
     settings: Settings,
-) -> Application:
-    check_gpu_support()
-
+    predictor_cache: Optional[LRUCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+) -> Callable[[dict], Predictor]:
     if forecaster_type is not None:
         logger.info(f"Using dynamic predictor factory")
 
@@ -128,7 +238,30 @@ def make_gunicorn_app(
         forecaster_version = forecaster_type.__version__
 
         def predictor_factory(request) -> Predictor:
-            return ctor(**request["configuration"])
+            configuration = request["configuration"]
+            if predictor_cache is None:
+                return ctor(**configuration)
+            return predictor_cache.get_or_create(
+                configuration_key(configuration), lambda: ctor(**configuration)
+            )
+
+    elif model_registry is not None:
+        logger.info(
+            f"Using multi-model predictor factory with "
+            f"{len(model_registry.model_names())} models"
+        )
+        logger.info(f"Using gluonts v{gluonts.__version__}")
+
+        def predictor_factory(request) -> Predictor:
+            name = request["configuration"].get("model")
+            if name is None:
+                raise UnknownModel(
+                    'The "model" field of the configuration is required in '
+                    "multi-model mode"
+                )
+            return model_registry.get(str(name))
+
+        return predictor_factory
 
     else:
         logger.info(f"Using static predictor factory")
@@ -139,22 +272,157 @@ def make_gunicorn_app(
         forecaster_fq_name = fqname_for(type(predictor))
         forecaster_version = predictor.__version__
 
+        if settings.gluonts_warm_up:
+            warm_up(predictor)
+
         def predictor_factory(request) -> Predictor:
             return predictor
 
     logger.info(f"Using gluonts v{gluonts.__version__}")
     logger.info(f"Using forecaster {forecaster_fq_name} v{forecaster_version}")
 
-    execution_params = {
+    return predictor_factory
+
+
+def make_execution_params(settings: Settings) -> dict:
+    return {
         "MaxConcurrentTransforms": settings.number_of_workers,
         "BatchStrategy": settings.sagemaker_batch_strategy,
         "MaxPayloadInMB": settings.sagemaker_max_payload_in_mb,
     }
 
+
+def make_predictor_cache(
+    forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
+    settings: Settings,
+) -> Optional[LRUCache]:
+    if forecaster_type is None or settings.gluonts_predictor_cache_size <= 0:
+        return None
+
+    return LRUCache(
+        max_size=settings.gluonts_predictor_cache_size,
+        ttl=settings.gluonts_predictor_cache_ttl,
+    )
+
+
+def make_result_cache(
+    env: ServeEnv,
+    forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
+    settings: Settings,
+) -> Optional[ResultCache]:
+    if settings.gluonts_result_cache_mb <= 0:
+        return None
+
+    if forecaster_type is not None:
+        # the configuration, which is part of the keys, defines the model
+        model_id = (
+            f"{fqname_for(forecaster_type)}:{forecaster_type.__version__}"
+        )
+    else:
+        # in multi-model mode, the configuration names the model, and the
+        # models are too many to read them all
+        model_id = model_digest(
+            env.path.model, content=not settings.gluonts_multi_model
+        )
+
+    if settings.gluonts_result_cache_seed is None:
+        logger.warning(
+            "Caching the forecasts without GLUONTS_RESULT_CACHE_SEED, the "
+            "cached forecasts of sampling predictors are not reproducible"
+        )
+
+    return ResultCache(
+        max_bytes=int(settings.gluonts_result_cache_mb * MB),
+        model_id=model_id,
+        path=settings.gluonts_result_cache_dir,
+        seed=settings.gluonts_result_cache_seed,
+    )
+
+
+def make_model_registry(
+    env: ServeEnv,
+    forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
+    settings: Settings,
+    metrics: ServiceMetrics,
+) -> Optional[ModelRegistry]:
+    if forecaster_type is not None or not settings.gluonts_multi_model:
+        return None
+
+    return ModelRegistry(
+        env.path.model,
+        max_bytes=int(settings.gluonts_model_cache_mb * MB),
+        metrics=metrics,
+    )
+
+
+def make_admission_controller(
+    settings: Settings,
+) -> Optional[AdmissionController]:
+    if settings.gluonts_max_inflight_items <= 0:
+        return None
+
+    logger.info(
+        f"Admitting up to {settings.gluonts_max_inflight_items} in-flight "
+        f"items, shared by the workers"
+    )
+    return AdmissionController(
+        max_items=settings.gluonts_max_inflight_items,
+        retry_after=settings.gluonts_retry_after,
+    )
+
+
+def make_batcher(
+    settings: Settings, metrics: ServiceMetrics
+) -> Optional[RequestBatcher]:
+    if settings.gluonts_batch_window_ms <= 0:
+        return None
+
+    logger.info(
+        f"Batching requests within {settings.gluonts_batch_window_ms}ms "
+        f"of each other, up to {settings.gluonts_batch_max_series} series"
+    )
+    return RequestBatcher(
+        max_delay=settings.gluonts_batch_window_ms / 1000,
+        max_batch_size=settings.gluonts_batch_max_series,
+        predict_fn=lambda predictor, entries, num_samples: (
+            predict_with_metrics(predictor, entries, num_samples, metrics)
+        ),
+    )
+
+
+def make_gunicorn_app(
+    env: ServeEnv,
+    forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
+    settings: Settings,
+) -> Application:
+    check_gpu_support()
+
+    metrics = ServiceMetrics()
+    predictor_cache = make_predictor_cache(forecaster_type, settings)
+    model_registry = make_model_registry(
+        env, forecaster_type, settings, metrics
+    )
+    predictor_factory = make_predictor_factory(
+        env, forecaster_type, settings, predictor_cache, model_registry
+    )
+
+    # objects surviving a collection, such as the predictor, are moved to a
+    # generation which the collector ignores, so that it does not write to
+    # their memory pages in the workers, which are shared until written to
+    gc.collect()
+    if hasattr(gc, "freeze"):  # Python >= 3.7
+        gc.freeze()
+
     flask_app = make_app(
         predictor_factory,
-        execution_params,
+        make_execution_params(settings),
         batch_transform_config=env.batch_config,
+        batcher=make_batcher(settings, metrics),
+        predictor_cache=predictor_cache,
+        metrics=metrics,
+        admission=make_admission_controller(settings),
+        result_cache=make_result_cache(env, forecaster_type, settings),
+        model_registry=model_registry,
     )
 
     gunicorn_app = Application(
@@ -162,8 +430,53 @@ def make_gunicorn_app(
         config={
             "bind": settings.sagemaker_server_bind,
             "workers": settings.number_of_workers,
+            "threads": settings.number_of_threads,
             "timeout": settings.sagemaker_server_timeout,
         },
     )
 
     return gunicorn_app
+
+
+def make_async_app(
+    env: ServeEnv,
+    forecaster_type: Optional[Type[Union[Estimator, Predictor]]],
+    settings: Settings,
+) -> "AsyncApplication":
+    """
+    Creates the asynchronous variant of the scoring service, which runs in a
+    single process with one predictor. The predictions run in a pool of
+    `settings.number_of_workers` threads.
+    """
+    from .async_app import AsyncApplication, make_app as make_aiohttp_app
+
+    check_gpu_support()
+
+    metrics = ServiceMetrics()
+    predictor_cache = make_predictor_cache(forecaster_type, settings)
+    model_registry = make_model_registry(
+        env, forecaster_type, settings, metrics
+    )
+    predictor_factory = make_predictor_factory(
+        env, forecaster_type, settings, predictor_cache, model_registry
+    )
+
+    aiohttp_app = make_aiohttp_app(
+        predictor_factory,
+        make_execution_params(settings),
+        batch_transform_config=env.batch_config,
+        max_workers=settings.number_of_workers,
+        max_content_length=settings.max_content_length,
+        batcher=make_batcher(settings, metrics),
+        predictor_cache=predictor_cache,
+        metrics=metrics,
+        admission=make_admission_controller(settings),
+        result_cache=make_result_cache(env, forecaster_type, settings),
+        model_registry=model_registry,
+    )
+
+    return AsyncApplication(
+        app=aiohttp_app,
+        host=str(settings.sagemaker_server_address),
+        port=settings.sagemaker_server_port,
+    )
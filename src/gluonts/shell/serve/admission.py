@@ -0,0 +1,133 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import multiprocessing as mp
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is rejected because the server is at capacity.
+    """
+
+    def __init__(self, cost: int, retry_after: int) -> None:
+        super().__init__(
+            f"The server is at capacity, retry in {retry_after}s "
+            f"(the request costs {cost} items)."
+        )
+        self.cost = cost
+        self.retry_after = retry_after
+
+
+def request_cost(
+    num_series: int, prediction_length: int, num_samples: int
+) -> int:
+    """
+    Returns the number of values a prediction request makes the predictor
+    compute, which is used as a measure of its load.
+    """
+    # in dynamic mode, the number of samples may come from the
+    # hyperparameters, which are strings
+    return int(num_series) * int(prediction_length) * max(int(num_samples), 1)
+
+
+class AdmissionController:
+    """
+    Bounds the total cost (see `request_cost`) of the requests processed at
+    the same time, so that a burst of large requests is rejected right away,
+    instead of piling up until all of them time out.
+
+    A request costing more than the whole budget is admitted when no other
+    request is in flight, so that it can still be served.
+
+    The state of the controller is kept in shared memory, so that the budget
+    is shared by the processes forked after its creation, e.g. the gunicorn
+    workers: a worker serving one request at a time then rejects the
+    requests it accepts while the other workers use up the budget.
+
+    Parameters
+    ----------
+    max_items
+        Maximum total cost of the requests in flight.
+    retry_after
+        Time, in seconds, after which clients are asked to retry a rejected
+        request.
+    """
+
+    def __init__(self, max_items: int, retry_after: int = 1) -> None:
+        assert max_items > 0, "The value of `max_items` should be > 0"
+        assert retry_after >= 0, "The value of `retry_after` should be >= 0"
+
+        self.max_items = max_items
+        self.retry_after = retry_after
+        # in-flight items, in-flight requests and rejected requests
+        self._state = mp.Array("q", 3)
+
+    def acquire(self, cost: int) -> None:
+        """
+        Reserves `cost` items of the budget, or raises `Overloaded` if they
+        are not available. The items must be given back with `release`.
+        """
+        with self._state.get_lock():
+            in_flight_items, in_flight_requests, _ = self._state
+            if (
+                in_flight_requests > 0
+                and in_flight_items + cost > self.max_items
+            ):
+                self._state[2] += 1
+                raise Overloaded(cost, self.retry_after)
+            self._state[0] += cost
+            self._state[1] += 1
+
+    def release(self, cost: int) -> None:
+        with self._state.get_lock():
+            self._state[0] -= cost
+            self._state[1] -= 1
+
+    @contextmanager
+    def admit(self, cost: int) -> Iterator[None]:
+        """
+        Reserves `cost` items of the budget while the context is active, or
+        raises `Overloaded` if they are not available.
+        """
+        self.acquire(cost)
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+    def load(self) -> Dict[str, int]:
+        with self._state.get_lock():
+            in_flight_items, in_flight_requests, rejected = self._state
+        return {
+            "InFlightItems": in_flight_items,
+            "InFlightRequests": in_flight_requests,
+            "MaxInFlightItems": self.max_items,
+            "RejectedRequests": rejected,
+        }
+
+
+@contextmanager
+def admitted(
+    admission: Optional[AdmissionController], cost: int
+) -> Iterator[None]:
+    """
+    Same as ``admission.admit(cost)``, which does nothing if `admission` is
+    None.
+    """
+    if admission is None:
+        yield
+    else:
+        with admission.admit(cost):
+            yield
@@ -15,14 +15,20 @@ import logging
 import json
 import time
 import traceback
-from typing import Tuple, Iterable, List
+from itertools import chain
+from typing import Tuple, Iterable, Iterator, List, Optional, Union
 
-from flask import Flask, Response, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from pydantic import BaseModel
 
-from gluonts.dataset.common import ListDataset
+from gluonts.dataset.common import ListDataset, ProcessDataEntry
 from gluonts.model.forecast import Config as ForecastConfig
-from .util import jsonify_floats
+from .admission import AdmissionController, Overloaded, admitted, request_cost
+from .batching import RequestBatcher
+from .cache import LRUCache, ResultCache
+from .metrics import ServiceMetrics, predict_with_metrics
+from .models import ModelRegistry, UnknownModel
+from .util import ARRAY_ENCODINGS, encode_forecast
 
 
 logger = logging.getLogger("gluonts.serve")
@@ -72,98 +78,365 @@ def log_throughput(instances, timings):
         )
 
 
-def get_base_app(execution_params):
+def service_stats(
+    predictor_cache: Optional[LRUCache],
+    result_cache: Optional[ResultCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+) -> dict:
+    # the statistics are the ones of the process serving the request
+    stats = {}
+    if predictor_cache is not None:
+        stats["predictor_cache"] = predictor_cache.stats()
+    if result_cache is not None:
+        stats["result_cache"] = result_cache.stats()
+    if model_registry is not None:
+        stats["models"] = model_registry.stats()
+    return stats
+
+
+def overloaded_response_headers(error: Overloaded) -> dict:
+    return {"Retry-After": str(error.retry_after)}
+
+
+def get_base_app(
+    execution_params,
+    predictor_cache=None,
+    metrics=None,
+    admission=None,
+    result_cache=None,
+    model_registry=None,
+):
     app = Flask("GluonTS scoring service")
 
     @app.errorhandler(Exception)
     def handle_error(error) -> Tuple[str, int]:
         return traceback.format_exc(), 500
 
+    @app.errorhandler(Overloaded)
+    def handle_overloaded(error: Overloaded) -> Tuple[str, int, dict]:
+        return str(error), 503, overloaded_response_headers(error)
+
+    @app.errorhandler(UnknownModel)
+    def handle_unknown_model(error: UnknownModel) -> Tuple[str, int]:
+        return str(error), 404
+
     @app.route("/ping")
     def ping() -> Response:
         return ""
 
     @app.route("/execution-parameters")
     def execution_parameters() -> Response:
-        return jsonify(execution_params)
+        return jsonify(current_execution_params(execution_params, admission))
+
+    @app.route("/stats")
+    def stats() -> Response:
+        return jsonify(
+            service_stats(predictor_cache, result_cache, model_registry)
+        )
+
+    @app.route("/metrics")
+    def prometheus_metrics() -> Response:
+        return Response(
+            metrics.to_prometheus() if metrics is not None else "",
+            mimetype="text/plain; version=0.0.4",
+        )
 
     return app
 
 
-def handle_predictions(predictor, instances, configuration):
+def current_execution_params(
+    execution_params: dict, admission: Optional[AdmissionController]
+) -> dict:
+    # the load is the one of all the workers, see AdmissionController
+    if admission is None:
+        return execution_params
+    return {**execution_params, **admission.load()}
+
+
+def get_array_encoding(configuration) -> str:
+    """
+    Returns the encoding of the forecast arrays requested by the
+    "array_encoding" field of the configuration: "json" (default) or
+    "base64" (see `encode_array`).
+    """
+    encoding = configuration.dict().get("array_encoding", "json")
+    if encoding not in ARRAY_ENCODINGS:
+        raise ValueError(
+            f"Unknown array encoding {encoding!r}, "
+            f"expected one of {ARRAY_ENCODINGS}"
+        )
+    return encoding
+
+
+def encode_predictions(predictions: List[str]) -> str:
+    return '{"predictions":[' + ",".join(predictions) + "]}"
+
+
+def handle_predictions(
+    predictor,
+    instances,
+    configuration,
+    batcher=None,
+    metrics: Optional[ServiceMetrics] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> List[str]:
+    """
+    Returns the forecasts for the instances, encoded as JSON objects. If a
+    result cache is given, only the instances missing from it are predicted;
+    if the cache is seeded, each of them is predicted on its own, see
+    `ResultCache`.
+    """
+    metrics = metrics if metrics is not None else ServiceMetrics()
+    encoding = get_array_encoding(configuration)
+
+    if result_cache is None:
+        return predict_and_encode(
+            predictor, instances, configuration, encoding, batcher, metrics
+        )
+
+    keys = [
+        result_cache.key(instance, configuration) for instance in instances
+    ]
+    predictions = [result_cache.get(key) for key in keys]
+    missing = [idx for idx, value in enumerate(predictions) if value is None]
+
+    if not missing:
+        return predictions
+
+    if result_cache.seed is None:
+        new_predictions = predict_and_encode(
+            predictor,
+            [instances[idx] for idx in missing],
+            configuration,
+            encoding,
+            batcher,
+            metrics,
+        )
+    else:
+        # the seed of a time series only depends on its key, so that its
+        # forecast does not depend on the other ones; the batcher is not
+        # used, as the random state is held while waiting for a batch
+        new_predictions = []
+        for idx in missing:
+            with result_cache.random_state(keys[idx]):
+                new_predictions.extend(
+                    predict_and_encode(
+                        predictor,
+                        [instances[idx]],
+                        configuration,
+                        encoding,
+                        None,
+                        metrics,
+                    )
+                )
+
+    for idx, prediction in zip(missing, new_predictions):
+        result_cache.put(keys[idx], prediction)
+        predictions[idx] = prediction
+
+    return predictions
+
+
+def predict_and_encode(
+    predictor,
+    instances,
+    configuration,
+    encoding: str,
+    batcher: Optional[RequestBatcher],
+    metrics: ServiceMetrics,
+) -> List[str]:
+    with metrics.timer("process"):
+        # the time series are processed in place: they are copied, so that
+        # the instances (and their cache keys) are left unchanged
+        dataset = ListDataset(
+            [dict(instance) for instance in instances], predictor.freq
+        )
+
+    if batcher is not None:
+        # the time series are processed here, so that invalid instances only
+        # fail their own request
+        forecasts = batcher.predict(
+            predictor, list(dataset), num_samples=configuration.num_samples
+        )
+        with metrics.timer("serialize"):
+            return [
+                encode_forecast(forecast, configuration, encoding)
+                for forecast in forecasts
+            ]
+
     # create the forecasts
     forecasts = ThrougputIter(
-        predictor.predict(
-            ListDataset(instances, predictor.freq),
-            num_samples=configuration.num_samples,
+        predict_with_metrics(
+            predictor, dataset, configuration.num_samples, metrics
         )
     )
 
-    predictions = [
-        forecast.as_json_dict(configuration) for forecast in forecasts
-    ]
+    predictions = []
+    for forecast in forecasts:
+        with metrics.timer("serialize"):
+            predictions.append(
+                encode_forecast(forecast, configuration, encoding)
+            )
 
     log_throughput(instances, forecasts.timings)
     return predictions
 
 
-def inference_invocations(predictor_factory) -> Flask:
-    def invocations() -> Response:
-        predictor = predictor_factory(request.json)
-        req = InferenceRequest.parse_obj(request.json)
+def inference_invocations(
+    predictor_factory,
+    batcher: Optional[RequestBatcher] = None,
+    metrics: Optional[ServiceMetrics] = None,
+    admission: Optional[AdmissionController] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> Flask:
+    metrics = metrics if metrics is not None else ServiceMetrics()
 
-        predictions = handle_predictions(
-            predictor, req.instances, req.configuration
-        )
-        return jsonify(predictions=jsonify_floats(predictions))
+    def invocations() -> Response:
+        with metrics.request_timer():
+            with metrics.timer("parse"):
+                predictor = predictor_factory(request.json)
+                req = InferenceRequest.parse_obj(request.json)
+
+            cost = request_cost(
+                len(req.instances),
+                predictor.prediction_length,
+                req.configuration.num_samples,
+            )
+            with admitted(admission, cost):
+                predictions = handle_predictions(
+                    predictor,
+                    req.instances,
+                    req.configuration,
+                    batcher,
+                    metrics,
+                    result_cache,
+                )
+            with metrics.timer("serialize"):
+                body = encode_predictions(predictions)
+        return Response(body, mimetype="application/json")
 
     return invocations
 
 
-def batch_inference_invocations(predictor_factory, configuration) -> Flask:
+def parse_instances(lines: Iterable[Union[str, bytes]]) -> Iterator[dict]:
+    """
+    Parses the JSON Lines of a batch transform request one at a time.
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def handle_batch_predictions(
+    predictor,
+    instances: Iterable[dict],
+    configuration,
+    metrics: Optional[ServiceMetrics] = None,
+) -> Iterator[str]:
+    """
+    Yields the JSON Lines of the response to a batch transform request as
+    the forecasts are produced. The instances are processed lazily as well,
+    so that neither the whole input nor the whole output is held in memory.
+    """
+    metrics = metrics if metrics is not None else ServiceMetrics()
     DEBUG = configuration.dict().get("DEBUG")
-    predictor = predictor_factory({"configuration": configuration.dict()})
+    encoding = get_array_encoding(configuration)
+    process = ProcessDataEntry(predictor.freq)
+
+    # we have to take this as the initial start-time since the first
+    # forecast is produced before the loop in predictor.predict
+    start = time.time()
+
+    forecast_iter = predict_with_metrics(
+        predictor,
+        metrics.time_iterator(
+            "process", map(process, metrics.time_iterator("parse", instances))
+        ),
+        configuration.num_samples,
+        metrics,
+    )
 
-    def invocations() -> Response:
-        request_data = request.data.decode("utf8").strip()
-        instances = list(map(json.loads, request_data.splitlines()))
-        predictions = []
+    for idx, forecast in enumerate(forecast_iter):
+        end = time.time()
+        with metrics.timer("serialize"):
+            line = encode_forecast(
+                forecast,
+                configuration,
+                encoding,
+                extra={"debug": {"timing": end - start}} if DEBUG else None,
+            )
+        # the lines are separated, not terminated, by newlines
+        yield line if idx == 0 else "\n" + line
 
-        # we have to take this as the initial start-time since the first
-        # forecast is produced before the loop in predictor.predict
         start = time.time()
 
-        forecast_iter = predictor.predict(
-            ListDataset(instances, predictor.freq),
-            num_samples=configuration.num_samples,
-        )
 
-        for forecast in forecast_iter:
-            end = time.time()
-            prediction = forecast.as_json_dict(configuration)
+def timed_request(
+    metrics: ServiceMetrics, lines: Iterator[str]
+) -> Iterator[str]:
+    with metrics.request_timer():
+        yield from lines
 
-            if DEBUG:
-                prediction["debug"] = {"timing": end - start}
 
-            predictions.append(prediction)
+def batch_inference_invocations(
+    predictor_factory, configuration, metrics: Optional[ServiceMetrics] = None
+) -> Flask:
+    metrics = metrics if metrics is not None else ServiceMetrics()
+    predictor = predictor_factory({"configuration": configuration.dict()})
 
-            start = time.time()
+    def invocations() -> Response:
+        lines = timed_request(
+            metrics,
+            handle_batch_predictions(
+                predictor,
+                parse_instances(request.stream),
+                configuration,
+                metrics,
+            ),
+        )
 
-        lines = list(map(json.dumps, map(jsonify_floats, predictions)))
-        return Response("\n".join(lines), mimetype="application/jsonlines")
+        # the first line is computed before responding, so that errors in
+        # the input or the model still lead to an error response
+        first_line = next(lines, "")
+
+        return Response(
+            stream_with_context(chain([first_line], lines)),
+            mimetype="application/jsonlines",
+        )
 
     return invocations
 
 
-def make_app(predictor_factory, execution_params, batch_transform_config):
-    app = get_base_app(execution_params)
+def make_app(
+    predictor_factory,
+    execution_params,
+    batch_transform_config,
+    batcher: Optional[RequestBatcher] = None,
+    predictor_cache: Optional[LRUCache] = None,
+    metrics: Optional[ServiceMetrics] = None,
+    admission: Optional[AdmissionController] = None,
+    result_cache: Optional[ResultCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+):
+    metrics = metrics if metrics is not None else ServiceMetrics()
+    app = get_base_app(
+        execution_params,
+        predictor_cache,
+        metrics,
+        admission,
+        result_cache,
+        model_registry,
+    )
 
     if batch_transform_config is not None:
         invocations_fn = batch_inference_invocations(
-            predictor_factory, batch_transform_config
+            predictor_factory, batch_transform_config, metrics
         )
     else:
-        invocations_fn = inference_invocations(predictor_factory)
+        invocations_fn = inference_invocations(
+            predictor_factory, batcher, metrics, admission, result_cache
+        )
 
     app.route("/invocations", methods=["POST"])(invocations_fn)
     return app
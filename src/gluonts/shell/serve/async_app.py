@@ -0,0 +1,264 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Asynchronous variant of the scoring service in `app`, served by a single
+process: requests are parsed and responses are encoded on the event loop,
+while the predictions run in a bounded thread pool and share one predictor.
+The forward passes of its network run one at a time, see `network_lock`.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from aiohttp import web
+
+from .admission import AdmissionController, Overloaded, request_cost
+from .app import (
+    InferenceRequest,
+    current_execution_params,
+    handle_batch_predictions,
+    encode_predictions,
+    handle_predictions,
+    overloaded_response_headers,
+    parse_instances,
+    service_stats,
+    timed_request,
+)
+from .batching import RequestBatcher
+from .cache import LRUCache, ResultCache
+from .metrics import ServiceMetrics
+from .models import ModelRegistry, UnknownModel
+
+logger = logging.getLogger("gluonts.serve")
+
+
+@web.middleware
+async def handle_error(request: web.Request, handler) -> web.StreamResponse:
+    try:
+        return await handler(request)
+    except web.HTTPException:
+        raise
+    except Overloaded as error:
+        return web.Response(
+            text=str(error),
+            status=503,
+            headers=overloaded_response_headers(error),
+        )
+    except UnknownModel as error:
+        return web.Response(text=str(error), status=404)
+    except Exception:
+        return web.Response(text=traceback.format_exc(), status=500)
+
+
+def get_base_app(
+    execution_params,
+    max_content_length,
+    predictor_cache: Optional[LRUCache] = None,
+    metrics: Optional[ServiceMetrics] = None,
+    admission: Optional[AdmissionController] = None,
+    result_cache: Optional[ResultCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+) -> web.Application:
+    app = web.Application(
+        middlewares=[handle_error], client_max_size=max_content_length
+    )
+
+    async def ping(request: web.Request) -> web.Response:
+        return web.Response(text="")
+
+    async def execution_parameters(request: web.Request) -> web.Response:
+        return web.json_response(
+            current_execution_params(execution_params, admission)
+        )
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(
+            service_stats(predictor_cache, result_cache, model_registry)
+        )
+
+    async def prometheus_metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            text=metrics.to_prometheus() if metrics is not None else "",
+            headers={"Content-Type": "text/plain; version=0.0.4"},
+        )
+
+    app.router.add_get("/ping", ping)
+    app.router.add_get("/execution-parameters", execution_parameters)
+    app.router.add_get("/stats", stats)
+    app.router.add_get("/metrics", prometheus_metrics)
+    return app
+
+
+def inference_invocations(
+    predictor_factory,
+    executor: ThreadPoolExecutor,
+    batcher: Optional[RequestBatcher] = None,
+    metrics: Optional[ServiceMetrics] = None,
+    admission: Optional[AdmissionController] = None,
+    result_cache: Optional[ResultCache] = None,
+):
+    metrics = metrics if metrics is not None else ServiceMetrics()
+
+    async def invocations(request: web.Request) -> web.Response:
+        with metrics.request_timer():
+            body = await request.read()
+            with metrics.timer("parse"):
+                data = json.loads(body)
+                req = InferenceRequest.parse_obj(data)
+
+            loop = asyncio.get_event_loop()
+            # the predictor may have to be loaded, which is done outside of
+            # both the event loop and the bounded pool of the predictions
+            predictor = await loop.run_in_executor(
+                None, predictor_factory, data
+            )
+
+            # the request is admitted before it waits for a thread of the
+            # pool, so that the waiting requests count against the budget
+            cost = request_cost(
+                len(req.instances),
+                predictor.prediction_length,
+                req.configuration.num_samples,
+            )
+            if admission is not None:
+                admission.acquire(cost)
+            try:
+                future = loop.run_in_executor(
+                    executor,
+                    handle_predictions,
+                    predictor,
+                    req.instances,
+                    req.configuration,
+                    batcher,
+                    metrics,
+                    result_cache,
+                )
+            except BaseException:
+                # e.g. the executor is shut down: the budget is shared by
+                # the workers, so that it must not leak
+                if admission is not None:
+                    admission.release(cost)
+                raise
+            if admission is not None:
+                # the budget is given back when the prediction is done, even
+                # if the request is cancelled in the meantime
+                release = admission.release
+                future.add_done_callback(lambda _: release(cost))
+            predictions = await future
+            with metrics.timer("serialize"):
+                text = encode_predictions(predictions)
+        return web.Response(text=text, content_type="application/json")
+
+    return invocations
+
+
+def batch_inference_invocations(
+    predictor_factory,
+    configuration,
+    executor: ThreadPoolExecutor,
+    metrics: Optional[ServiceMetrics] = None,
+):
+    metrics = metrics if metrics is not None else ServiceMetrics()
+    predictor = predictor_factory({"configuration": configuration.dict()})
+
+    async def invocations(request: web.Request) -> web.StreamResponse:
+        loop = asyncio.get_event_loop()
+        lines = timed_request(
+            metrics,
+            handle_batch_predictions(
+                predictor,
+                parse_instances(io.BytesIO(await request.read())),
+                configuration,
+                metrics,
+            ),
+        )
+
+        # the lines are produced in the executor; the first one before
+        # responding, so that errors still lead to an error response
+        line = await loop.run_in_executor(executor, next, lines, None)
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/jsonlines"}
+        )
+        await response.prepare(request)
+        while line is not None:
+            await response.write(line.encode("utf-8"))
+            line = await loop.run_in_executor(executor, next, lines, None)
+        await response.write_eof()
+        return response
+
+    return invocations
+
+
+def make_app(
+    predictor_factory,
+    execution_params,
+    batch_transform_config,
+    max_workers: int,
+    max_content_length: int,
+    batcher: Optional[RequestBatcher] = None,
+    predictor_cache: Optional[LRUCache] = None,
+    metrics: Optional[ServiceMetrics] = None,
+    admission: Optional[AdmissionController] = None,
+    result_cache: Optional[ResultCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+) -> web.Application:
+    metrics = metrics if metrics is not None else ServiceMetrics()
+    app = get_base_app(
+        execution_params,
+        max_content_length,
+        predictor_cache,
+        metrics,
+        admission,
+        result_cache,
+        model_registry,
+    )
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    if batch_transform_config is not None:
+        invocations_fn = batch_inference_invocations(
+            predictor_factory, batch_transform_config, executor, metrics
+        )
+    else:
+        invocations_fn = inference_invocations(
+            predictor_factory,
+            executor,
+            batcher,
+            metrics,
+            admission,
+            result_cache,
+        )
+
+    async def shutdown_executor(app: web.Application) -> None:
+        logger.info("Shutting down GluonTS scoring service")
+        executor.shutdown(wait=True)
+
+    app.router.add_post("/invocations", invocations_fn)
+    app.on_cleanup.append(shutdown_executor)
+    return app
+
+
+class AsyncApplication:
+    def __init__(self, app: web.Application, host: str, port: int) -> None:
+        self.app = app
+        self.host = host
+        self.port = port
+
+    def run(self) -> None:
+        web.run_app(self.app, host=self.host, port=self.port, print=None)
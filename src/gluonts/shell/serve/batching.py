@@ -0,0 +1,152 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from gluonts.dataset.common import DataEntry
+from gluonts.model.forecast import Forecast
+from gluonts.model.predictor import Predictor
+
+logger = logging.getLogger("gluonts.serve")
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.entries: List[DataEntry] = []
+        self.forecasts: List[Forecast] = []
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class RequestBatcher:
+    """
+    Coalesces the prediction requests made concurrently, from different
+    threads, for the same predictor into a single call of
+    `predictor.predict`, so that the network runs on full batches instead of
+    one batch per request.
+
+    The first request of a batch waits for up to `max_delay` seconds, or until
+    the batch contains `max_batch_size` time series, and then runs the batch;
+    the requests arriving in the meantime add their time series to the batch
+    and wait for its forecasts. An error raised while predicting is raised
+    in all the requests of the batch.
+
+    Parameters
+    ----------
+    max_delay
+        Maximum time, in seconds, that a request waits for other requests.
+    max_batch_size
+        Maximum number of time series in a batch; a request with more time
+        series is run in a batch of its own.
+    predict_fn
+        Function called with the predictor, the time series of a batch and
+        the number of samples to predict the batch; by default, it calls
+        `predictor.predict`.
+    """
+
+    def __init__(
+        self,
+        max_delay: float,
+        max_batch_size: int,
+        predict_fn: Optional[
+            Callable[
+                [Predictor, List[DataEntry], Optional[int]], Iterable[Forecast]
+            ]
+        ] = None,
+    ) -> None:
+        assert max_delay >= 0, "The value of `max_delay` should be >= 0"
+        assert (
+            max_batch_size > 0
+        ), "The value of `max_batch_size` should be > 0"
+
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.predict_fn = predict_fn or (
+            lambda predictor, entries, num_samples: predictor.predict(
+                entries, num_samples=num_samples
+            )
+        )
+        self._condition = threading.Condition()
+        # open batches, by predictor id and number of samples
+        self._batches: Dict[Tuple[int, Optional[int]], _Batch] = {}
+
+    def _close(self, key: Tuple[int, Optional[int]]) -> None:
+        del self._batches[key]
+        self._condition.notify_all()
+
+    def predict(
+        self,
+        predictor: Predictor,
+        entries: List[DataEntry],
+        num_samples: Optional[int] = None,
+    ) -> List[Forecast]:
+        """
+        Returns the forecasts of `predictor` for `entries`, which are
+        computed together with the ones of concurrent calls.
+        """
+        key = (id(predictor), num_samples)
+
+        with self._condition:
+            batch = self._batches.get(key)
+            if (
+                batch is not None
+                and len(batch.entries) + len(entries) > self.max_batch_size
+            ):
+                # the time series do not fit in the open batch, which is run
+                # right away
+                self._close(key)
+                batch = None
+
+            is_first = batch is None
+            if batch is None:
+                batch = _Batch()
+                self._batches[key] = batch
+
+            start = len(batch.entries)
+            batch.entries.extend(entries)
+            if len(batch.entries) >= self.max_batch_size:
+                self._close(key)
+
+            if is_first:
+                deadline = time.monotonic() + self.max_delay
+                while self._batches.get(key) is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._close(key)
+                        break
+                    self._condition.wait(remaining)
+
+        if is_first:
+            try:
+                start_time = time.time()
+                batch.forecasts = list(
+                    self.predict_fn(predictor, batch.entries, num_samples)
+                )
+                logger.info(
+                    f"Inference took {time.time() - start_time:.2f}s for a "
+                    f"batch of {len(batch.entries)} items."
+                )
+            except Exception as error:
+                batch.error = error
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        return batch.forecasts[start : start + len(entries)]
@@ -0,0 +1,265 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import mxnet as mx
+import numpy as np
+
+logger = logging.getLogger("gluonts.serve")
+
+# the random number generators are global, so seeded predictions must not
+# run concurrently
+_random_state_lock = threading.Lock()
+
+
+def configuration_key(configuration: dict) -> str:
+    """
+    Returns a hash of a JSON configuration that does not depend on the order
+    of its keys.
+    """
+    return hashlib.sha256(
+        json.dumps(configuration, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class LRUCache:
+    """
+    A thread-safe cache holding at most `max_size` values, which evicts the
+    least recently used value when full, and the values older than `ttl`
+    seconds if given.
+
+    Parameters
+    ----------
+    max_size
+        Maximum number of values in the cache.
+    ttl
+        Time, in seconds, after which a value expires.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        assert max_size > 0, "The value of `max_size` should be > 0"
+        assert ttl is None or ttl > 0, "The value of `ttl` should be > 0"
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # values with their creation time, by key, least recently used first
+        self._values: "OrderedDict[Hashable, Tuple[Any, float]]" = (
+            OrderedDict()
+        )
+
+    def get_or_create(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """
+        Returns the value cached for `key`, or the one returned by `create`,
+        which is then cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if key in self._values:
+                value, created = self._values[key]
+                if self.ttl is None or now - created < self.ttl:
+                    self._values.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._values[key]
+            self.misses += 1
+
+        # values are created without holding the lock, so that concurrent
+        # requests for other keys are not blocked
+        value = create()
+
+        with self._lock:
+            self._values[key] = value, now
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+def model_digest(path: Path, content: bool = True) -> str:
+    """
+    Returns a hash of the files of a serialized model, or of a directory of
+    models: of their content, or only of their size and modification time
+    if `content` is False.
+    """
+    digest = hashlib.sha256()
+    for file in sorted(path.rglob("*")):
+        if file.is_file():
+            digest.update(str(file.relative_to(path)).encode("utf-8"))
+            if content:
+                digest.update(file.read_bytes())
+            else:
+                stat = file.stat()
+                digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A thread-safe cache of the encoded forecasts of single time series, keyed
+    by a hash of the time series, of the configuration of the request and of
+    the model, so that a time series which is requested again skips the
+    prediction.
+
+    The forecasts are held in memory, up to `max_bytes` of encoded forecasts,
+    evicting the least recently used ones first; if `path` is given, they
+    are also stored in files in that directory, which is not bounded in
+    size and is shared by the processes of the server and its restarts.
+
+    The forecasts of a sampling predictor are random, so that a cached
+    forecast is only one of the possible results of the request. If `seed`
+    is given, each time series is predicted on its own, with the random
+    number generators reset to a seed derived from `seed` and from its key
+    (see `random_state`): its forecast is then reproducible, and does not
+    depend on the other time series of the request. Seeded predictions do
+    not run concurrently, and are not batched with other requests.
+
+    Parameters
+    ----------
+    max_bytes
+        Maximum total size of the forecasts held in memory.
+    model_id
+        Identifier of the model, part of the keys.
+    path
+        Directory of the disk tier of the cache.
+    seed
+        Seed of the random number generators.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        model_id: str = "",
+        path: Optional[Path] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        assert max_bytes > 0, "The value of `max_bytes` should be > 0"
+
+        self.max_bytes = max_bytes
+        self.model_id = model_id
+        self.path = path
+        self.seed = seed
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.num_bytes = 0
+        self._lock = threading.Lock()
+        self._values: "OrderedDict[str, str]" = OrderedDict()
+
+        if path is not None:
+            path.mkdir(parents=True, exist_ok=True)
+
+    def key(self, instance: dict, configuration: Any) -> str:
+        return configuration_key(
+            {
+                "instance": instance,
+                "configuration": configuration.dict(),
+                "model": self.model_id,
+            }
+        )
+
+    def _put_in_memory(self, key: str, value: str) -> None:
+        with self._lock:
+            if key in self._values:
+                self.num_bytes -= len(self._values.pop(key))
+            self._values[key] = value
+            self.num_bytes += len(value)
+            while self.num_bytes > self.max_bytes:
+                _, evicted = self._values.popitem(last=False)
+                self.num_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self.hits += 1
+                return self._values[key]
+
+        if self.path is not None:
+            try:
+                value = (self.path / key).read_text(encoding="utf-8")
+            except FileNotFoundError:
+                pass
+            else:
+                self._put_in_memory(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        self._put_in_memory(key, value)
+
+        if self.path is not None:
+            try:
+                # written to a temporary file first, so that concurrent
+                # readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=self.path)
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    file.write(value)
+                os.replace(tmp_path, self.path / key)
+            except OSError as error:
+                logger.warning(f"Failed to write to the result cache: {error}")
+
+    @contextmanager
+    def random_state(self, key: str = "") -> Iterator[None]:
+        """
+        Resets the random number generators, for the predictions made in the
+        context, to a seed derived from `seed`, if given, and from `key`,
+        e.g. the key of the time series being predicted.
+        """
+        if self.seed is None:
+            yield
+            return
+
+        digest = hashlib.sha256(f"{self.seed}:{key}".encode("utf-8"))
+        seed = int.from_bytes(digest.digest()[:4], "little")
+        with _random_state_lock:
+            mx.random.seed(seed)
+            np.random.seed(seed)
+            yield
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self),
+            "bytes": self.num_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
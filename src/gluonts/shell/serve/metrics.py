@@ -0,0 +1,241 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from gluonts.dataset.common import Dataset
+from gluonts.model.forecast import Forecast
+from gluonts.model.predictor import GluonPredictor, Predictor
+
+# upper bounds, in seconds, of the buckets of the histograms
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# stages of the processing of a request, in order
+STAGES = (
+    "parse",
+    "load",
+    "process",
+    "transform",
+    "forward",
+    "forecast",
+    "serialize",
+)
+
+
+class Histogram:
+    """
+    Distribution of observed values, counted in buckets with the given upper
+    bounds and an unbounded last bucket, like a Prometheus histogram.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_prometheus(self, name: str, labels: str = "") -> List[str]:
+        lines = []
+        cumulative_count = 0
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, self.counts):
+            cumulative_count += count
+            lines.append(
+                f'{name}_bucket{{{labels}le="{bound}"}} {cumulative_count}'
+            )
+        labels = "{" + labels.rstrip(",") + "}" if labels else ""
+        lines.append(f"{name}_sum{labels} {self.sum!r}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class ServiceMetrics:
+    """
+    Latency histograms of the requests of the scoring service, and of the
+    stages of their processing (see `STAGES`).
+
+    The time of a stage excludes the time of the stages nested in it, e.g.
+    the time spent parsing the input of a batch transform request while
+    the input transformation pulls the next instance. Stages are nested when
+    they are timed in the same thread.
+
+    With gunicorn, each worker process has its own metrics.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.requests = Histogram(buckets)
+        self.stages: Dict[str, Histogram] = {
+            stage: Histogram(buckets) for stage in STAGES
+        }
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[float]:
+        # time spent in nested stages, for each stage being timed
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            nested_duration = stack.pop()
+            if stack:
+                stack[-1] += duration
+            with self._lock:
+                self.stages[stage].observe(duration - nested_duration)
+
+    @contextmanager
+    def request_timer(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.requests.observe(duration)
+
+    def time_iterator(self, stage: str, iterable: Iterable) -> Iterator:
+        """
+        Times the production of each element of `iterable` as `stage`.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.timer(stage):
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    return
+            yield element
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the histograms in the Prometheus text exposition format.
+        """
+        with self._lock:
+            lines = [
+                "# HELP gluonts_request_duration_seconds Time to process "
+                "a request.",
+                "# TYPE gluonts_request_duration_seconds histogram",
+                *self.requests.to_prometheus(
+                    "gluonts_request_duration_seconds"
+                ),
+                "# HELP gluonts_stage_duration_seconds Time spent in a stage "
+                "of the processing of the requests, excluding nested stages.",
+                "# TYPE gluonts_stage_duration_seconds histogram",
+            ]
+            for stage, histogram in self.stages.items():
+                lines.extend(
+                    histogram.to_prometheus(
+                        "gluonts_stage_duration_seconds", f'stage="{stage}",'
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
+
+_network_locks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_network_locks_lock = threading.Lock()
+
+
+def network_lock(net) -> threading.Lock:
+    """
+    Returns the lock serializing the forward passes of the network `net`,
+    whose cached graph cannot be run by several threads at the same time.
+    """
+    with _network_locks_lock:
+        lock = _network_locks.get(net)
+        if lock is None:
+            lock = _network_locks[net] = threading.Lock()
+        return lock
+
+
+def predict_with_metrics(
+    predictor: Predictor,
+    dataset: Dataset,
+    num_samples: Optional[int],
+    metrics: ServiceMetrics,
+) -> Iterator[Forecast]:
+    """
+    Equivalent of ``predictor.predict(dataset, num_samples=num_samples)``
+    which times the input transformation, the forward pass of the network
+    and the generation of the forecasts of a `GluonPredictor`, through the
+    hooks of `GluonPredictor.predict`. For other predictors, and for
+    predictors whose `predict` does not take these hooks, the whole
+    prediction is timed as forecast generation.
+
+    The network runs asynchronously, so that the forward pass only times the
+    scheduling of its computation, which is waited for, and timed, when the
+    forecasts are generated.
+
+    The forward passes of a network run one at a time (see `network_lock`),
+    while the other stages of concurrent predictions run in parallel.
+    """
+    if not isinstance(predictor, GluonPredictor) or (
+        "wrap_prediction_net"
+        not in inspect.signature(predictor.predict).parameters
+    ):
+        yield from metrics.time_iterator(
+            "forecast", predictor.predict(dataset, num_samples=num_samples)
+        )
+        return
+
+    lock = network_lock(predictor.prediction_net)
+
+    def wrap_prediction_net(prediction_net: Callable) -> Callable:
+        def timed_prediction_net(*inputs):
+            with lock, metrics.timer("forward"):
+                return prediction_net(*inputs)
+
+        return timed_prediction_net
+
+    yield from metrics.time_iterator(
+        "forecast",
+        predictor.predict(
+            dataset,
+            num_samples=num_samples,
+            wrap_data_loader=functools.partial(
+                metrics.time_iterator, "transform"
+            ),
+            wrap_prediction_net=wrap_prediction_net,
+        ),
+    )
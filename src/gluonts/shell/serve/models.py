@@ -0,0 +1,177 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gluonts.model.predictor import Predictor
+
+from .metrics import ServiceMetrics
+
+logger = logging.getLogger("gluonts.serve")
+
+
+class UnknownModel(Exception):
+    """
+    Raised when a request is routed to a model which does not exist.
+    """
+
+
+def model_size(path: Path) -> int:
+    """
+    Returns the size of the files of a serialized model, which is used as an
+    estimate of the memory used by the deserialized model.
+    """
+    return sum(
+        file.stat().st_size for file in path.rglob("*") if file.is_file()
+    )
+
+
+class ModelRegistry:
+    """
+    The models serialized in the subdirectories of `path`, which are
+    deserialized when first requested, and kept in memory as long as the
+    total size of the models in memory (see `model_size`) does not exceed
+    `max_bytes`: the least recently used models are evicted first. The most
+    recently used model is kept even if it is larger than the budget.
+
+    Parameters
+    ----------
+    path
+        Directory containing one serialized model per subdirectory, named
+        after the model.
+    max_bytes
+        Memory budget of the models.
+    metrics
+        Metrics of the service, in which the time to load the models is
+        recorded as the "load" stage.
+    load
+        Function deserializing a model; `Predictor.deserialize` by default.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int,
+        metrics: Optional[ServiceMetrics] = None,
+        load: Callable[[Path], Predictor] = Predictor.deserialize,
+    ) -> None:
+        assert max_bytes > 0, "The value of `max_bytes` should be > 0"
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self.load = load
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+        self.num_bytes = 0
+        self._lock = threading.Lock()
+        # loaded models with their size, least recently used first
+        self._models: "OrderedDict[str, Tuple[Predictor, int]]" = (
+            OrderedDict()
+        )
+        # a model is loaded by one request at a time
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def model_names(self) -> List[str]:
+        return sorted(
+            child.name for child in self.path.iterdir() if child.is_dir()
+        )
+
+    def _model_path(self, name: str) -> Path:
+        # only the direct subdirectories are models, which excludes names
+        # such as "." or "../other"
+        model_path = self.path / name
+        if (
+            name in ("", ".", "..")
+            or model_path.name != name
+            or not model_path.is_dir()
+        ):
+            raise UnknownModel(f"Unknown model {name!r}")
+        return model_path
+
+    def _get_loaded(self, name: str) -> Optional[Predictor]:
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return self._models[name][0]
+            return None
+
+    def get(self, name: str) -> Predictor:
+        """
+        Returns the model with the given name, which is loaded if needed.
+        """
+        predictor = self._get_loaded(name)
+        if predictor is not None:
+            return predictor
+
+        model_path = self._model_path(name)
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # the model may have been loaded while waiting for the lock
+            predictor = self._get_loaded(name)
+            if predictor is not None:
+                return predictor
+
+            start = time.perf_counter()
+            if self.metrics is not None:
+                with self.metrics.timer("load"):
+                    predictor = self.load(model_path)
+            else:
+                predictor = self.load(model_path)
+            load_time = time.perf_counter() - start
+            size = model_size(model_path)
+            logger.info(f"Loaded model {name!r} in {load_time:.2f}s")
+
+            with self._lock:
+                self.misses += 1
+                self.load_time += load_time
+                self._models[name] = predictor, size
+                self.num_bytes += size
+                while (
+                    self.num_bytes > self.max_bytes and len(self._models) > 1
+                ):
+                    evicted, (_, evicted_size) = self._models.popitem(
+                        last=False
+                    )
+                    self.num_bytes -= evicted_size
+                    self.evictions += 1
+                    logger.info(f"Evicted model {evicted!r}")
+
+        return predictor
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "size": len(self),
+                "bytes": self.num_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / requests if requests else None,
+                "load_time": self.load_time,
+            }
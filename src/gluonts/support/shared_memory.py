@@ -0,0 +1,196 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Standard library imports
+import ctypes
+import multiprocessing as mp
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+# alignment (in bytes) of the arrays written to the buffer
+ALIGNMENT = 64
+
+
+class ArrayRef(NamedTuple):
+    """
+    Placeholder for the array with the given index in a message.
+    """
+
+    index: int
+
+
+class ArrayLayout(NamedTuple):
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def extract_arrays(obj: Any, arrays: List[np.ndarray], refs: Dict) -> Any:
+    """
+    Returns a copy of `obj` in which the numpy arrays nested in dicts, lists
+    and tuples are replaced by `ArrayRef` placeholders. The arrays are
+    appended to `arrays`; `refs` maps the ids of the arrays already seen to
+    their placeholder, so that shared arrays are extracted once.
+    """
+    if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        if id(obj) not in refs:
+            refs[id(obj)] = ArrayRef(len(arrays))
+            arrays.append(obj)
+        return refs[id(obj)]
+    elif type(obj) in (dict, OrderedDict):
+        return type(obj)(
+            (k, extract_arrays(v, arrays, refs)) for k, v in obj.items()
+        )
+    elif type(obj) in (list, tuple):
+        return type(obj)(extract_arrays(v, arrays, refs) for v in obj)
+    else:
+        return obj
+
+
+def insert_arrays(obj: Any, arrays: List[np.ndarray]) -> Any:
+    """
+    Inverse of `extract_arrays`.
+    """
+    if isinstance(obj, ArrayRef):
+        return arrays[obj.index]
+    elif type(obj) in (dict, OrderedDict):
+        return type(obj)((k, insert_arrays(v, arrays)) for k, v in obj.items())
+    elif type(obj) in (list, tuple):
+        return type(obj)(insert_arrays(v, arrays) for v in obj)
+    else:
+        return obj
+
+
+class ArrayRingBuffer:
+    """
+    A ring of fixed-size slots in shared memory, used to pass the numpy
+    arrays contained in (possibly nested) dicts, lists and tuples from one
+    sending process to one receiving process without pickling them.
+
+    The sender calls `pack` on an object and puts the resulting message on a
+    queue; only the message, which contains the object with its arrays
+    replaced by placeholders, is pickled. The receiver gets the message from
+    the queue and calls `unpack` to restore the object. Objects whose arrays
+    do not fit in a slot are put in the message as they are.
+
+    A slot is reused only after the receiver has released it, so the sender
+    blocks when all slots are in use. Messages must be unpacked in the order
+    in which they were packed.
+
+    The buffer must be created before the processes are started and passed
+    to them as an argument.
+
+    Parameters
+    ----------
+    slot_size
+        Size of each slot, in bytes.
+    num_slots
+        Number of slots in the ring.
+    """
+
+    def __init__(self, slot_size: int, num_slots: int = 2) -> None:
+        assert slot_size > 0, "The value of `slot_size` should be > 0"
+        assert num_slots > 0, "The value of `num_slots` should be > 0"
+
+        self.slot_size = slot_size
+        self.num_slots = num_slots
+        self._buffer = mp.RawArray(ctypes.c_uint8, slot_size * num_slots)
+        self._free_slots = mp.Semaphore(num_slots)
+        # only used by the sending process
+        self._next_slot = 0
+
+    def _slot_buffer(self, slot: int) -> np.ndarray:
+        start = slot * self.slot_size
+        return np.frombuffer(self._buffer, dtype=np.uint8)[
+            start : start + self.slot_size
+        ]
+
+    def pack(self, obj: Any) -> Tuple[Optional[int], Any, List[ArrayLayout]]:
+        """
+        Writes the arrays contained in `obj` to the next free slot and
+        returns the message to send to the receiving process.
+        """
+        arrays: List[np.ndarray] = []
+        skeleton = extract_arrays(obj, arrays, {})
+
+        layouts = []
+        offset = 0
+        for array in arrays:
+            layouts.append(
+                ArrayLayout(
+                    offset=offset, shape=array.shape, dtype=array.dtype.str
+                )
+            )
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        if not arrays or offset > self.slot_size:
+            return None, obj, []
+
+        self._free_slots.acquire()
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.num_slots
+
+        slot_buffer = self._slot_buffer(slot)
+        for array, layout in zip(arrays, layouts):
+            np.ndarray(
+                shape=layout.shape,
+                dtype=layout.dtype,
+                buffer=slot_buffer,
+                offset=layout.offset,
+            )[...] = array
+
+        return slot, skeleton, layouts
+
+    def unpack(
+        self, message: Tuple[Optional[int], Any, List[ArrayLayout]], copy=True
+    ) -> Any:
+        """
+        Restores the object sent with `message`.
+
+        If `copy` is False, the arrays of the returned object are views on
+        the shared memory, which remain valid until `release` is called with
+        the same message. Otherwise, the arrays are copied and the slot is
+        released immediately.
+        """
+        slot, skeleton, layouts = message
+        if slot is None:
+            return skeleton
+
+        slot_buffer = self._slot_buffer(slot)
+        arrays = [
+            np.ndarray(
+                shape=layout.shape,
+                dtype=layout.dtype,
+                buffer=slot_buffer,
+                offset=layout.offset,
+            )
+            for layout in layouts
+        ]
+        if copy:
+            arrays = [array.copy() for array in arrays]
+            self.release(message)
+
+        return insert_arrays(skeleton, arrays)
+
+    def release(
+        self, message: Tuple[Optional[int], Any, List[ArrayLayout]]
+    ) -> None:
+        """
+        Marks the slot used by `message`, if any, as free.
+        """
+        slot, _, _ = message
+        if slot is not None:
+            self._free_slots.release()
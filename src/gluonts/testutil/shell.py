@@ -29,7 +29,7 @@ from gluonts.dataset.repository.datasets import materialize_dataset
 from gluonts.model.predictor import Predictor
 from gluonts.shell.sagemaker import ServeEnv, ServePaths, TrainEnv, TrainPaths
 from gluonts.shell.sagemaker.params import encode_sagemaker_parameters
-from gluonts.shell.serve import Settings, make_gunicorn_app
+from gluonts.shell.serve import Settings, make_async_app, make_gunicorn_app
 
 
 class ServerFacade:
@@ -64,6 +64,24 @@ class ServerFacade:
         else:
             raise RuntimeError(f"Unexpected {response.status_code} response")
 
+    def stats(self) -> dict:
+        response = requests.get(
+            url=self.url("/stats"), headers={"Accept": "application/json"}
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise RuntimeError(response.content.decode("utf-8"))
+
+    def metrics(self) -> str:
+        response = requests.get(url=self.url("/metrics"))
+
+        if response.status_code == 200:
+            return response.text
+        else:
+            raise RuntimeError(response.content.decode("utf-8"))
+
     def invocations(
         self, data_entries: Iterable[DataEntry], configuration: dict
     ) -> List[dict]:
@@ -113,6 +131,7 @@ def temporary_server(
     env: ServeEnv,
     forecaster_type: Optional[Type[Predictor]],
     settings: Settings = Settings(),
+    backend: str = "gunicorn",
 ) -> ContextManager[ServerFacade]:
     """
     A context manager that instantiates a Gunicorn inference server in a
@@ -128,6 +147,8 @@ def temporary_server(
         Either `env` or `forecaster_type` must be set.
     settings
         Settings to use when instantiating the Gunicorn server.
+    backend
+        Either "gunicorn" or "async", the server to use.
 
     Returns
     -------
@@ -136,8 +157,11 @@ def temporary_server(
         wrapping the spawned inference server.
     """
 
-    gunicorn_app = make_gunicorn_app(env, forecaster_type, settings)
-    process = Process(target=gunicorn_app.run)
+    make_server_app = (
+        make_async_app if backend == "async" else make_gunicorn_app
+    )
+    server_app = make_server_app(env, forecaster_type, settings)
+    process = Process(target=server_app.run)
     process.start()
 
     endpoint = ServerFacade(
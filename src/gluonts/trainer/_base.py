@@ -14,10 +14,12 @@
 # Standard library imports
 import logging
 import os
+import shutil
 import tempfile
 import time
 import uuid
-from typing import Any, List, NamedTuple, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
 
 # Third-party imports
 import mxnet as mx
@@ -34,6 +36,17 @@ from gluonts.gluonts_tqdm import tqdm
 
 # Relative imports
 from . import learning_rate_scheduler as lrs
+from .checkpoint import (
+    TrainingState,
+    latest_checkpoint,
+    load_training_state,
+    save_checkpoint,
+)
+from .loss_scaling import (
+    DynamicLossScaler,
+    has_float16_parameters,
+    reset_master_weights,
+)
 
 logger = logging.getLogger("trainer")
 
@@ -62,6 +75,33 @@ class BestEpochInfo(NamedTuple):
     metric_value: float
 
 
+class ParameterSnapshot:
+    """
+    A copy, in memory, of the parameters of a network, which can be restored
+    without reading a parameters file.
+
+    The copies are made asynchronously by the MXNet engine, on the first
+    context of each parameter.
+    """
+
+    def __init__(self, net: nn.Block) -> None:
+        # the parameters are named as in the files of `net.save_parameters`
+        self.arrays: Dict[str, mx.nd.NDArray] = {
+            name: param.data(param.list_ctx()[0]).copy()
+            for name, param in net._collect_params_with_prefix().items()
+        }
+
+    def restore(self, net: nn.Block) -> None:
+        for name, param in net._collect_params_with_prefix().items():
+            param.set_data(self.arrays[name])
+
+    def save(self, path: str) -> None:
+        """
+        Writes the parameters to a file readable by `net.load_parameters`.
+        """
+        mx.nd.save(path, self.arrays)
+
+
 class Trainer:
     r"""
     A trainer specifies how a network is going to be trained.
@@ -74,6 +114,15 @@ class Trainer:
     Parameters
     ----------
     ctx
+    contexts
+        Contexts over which each batch is split for data-parallel training
+        (default: only `ctx`). If `ctx` is not given, it is the first one of
+        the contexts, which holds the batches before they are split.
+    kvstore
+        Key-value store aggregating the gradients computed on the contexts
+        (default: "device"); the parameters are then updated on each context.
+        With a synchronous distributed key-value store, e.g. "dist_sync", the
+        training runs on all the hosts of an MXNet cluster.
     epochs
         Number of epochs that the network will train (default: 1).
     batch_size
@@ -96,12 +145,44 @@ class Trainer:
     init
         Initializer of the weights of the network (default: "xavier").
     hybridize
+    in_memory_snapshots
+        Whether to keep the parameters of the best epoch as a snapshot in
+        memory, instead of writing them to a file which is read back whenever
+        the learning rate decays (default: False).
+    checkpoint_dir
+        Directory to which a checkpoint of the training, from which it can be
+        resumed, is written every `checkpoint_interval` epochs; only the
+        latest checkpoint is kept (default: no checkpoints).
+    checkpoint_interval
+        Number of epochs between two checkpoints (default: 1).
+    loss_sync_interval
+        Number of batches after which the loss is copied from the device to
+        compute the average epoch loss shown in the progress bar (default:
+        1). Reading the loss waits for the computations queued in the MXNet
+        engine, so that larger values let the engine run the next batches
+        in the meantime; the loss is always read at the end of an epoch.
+        In mixed precision (see `initial_loss_scale`), the gradients are
+        checked for overflow after every batch, which waits for the batch
+        anyway, so that larger values only save the copies of the loss.
+    progress_bar_refresh_interval
+        Minimum time, in seconds, between two refreshes of the progress bar
+        (default: 0.1 in a terminal, 10 otherwise).
+    initial_loss_scale
+        Initial scale of the loss of networks with float16 parameters, which
+        are trained in mixed precision: the optimizer updates float32 copies
+        of the parameters, and the loss is scaled dynamically (see
+        `DynamicLossScaler`) so that small gradients do not underflow
+        (default: :math:`2^{15}`). Updates overflowing on a worker are
+        skipped by that worker only, so that mixed precision should not be
+        combined with a distributed key-value store.
     """
 
     @validated()
     def __init__(
         self,
         ctx: Optional[mx.Context] = None,
+        contexts: Optional[List[mx.Context]] = None,
+        kvstore: str = "device",
         epochs: int = 100,
         batch_size: int = 32,
         num_batches_per_epoch: int = 50,
@@ -113,6 +194,12 @@ class Trainer:
         weight_decay: float = 1e-8,
         init: Union[str, mx.initializer.Initializer] = "xavier",
         hybridize: bool = True,
+        in_memory_snapshots: bool = False,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_interval: int = 1,
+        loss_sync_interval: int = 1,
+        progress_bar_refresh_interval: Optional[float] = None,
+        initial_loss_scale: float = 2.0 ** 15,
     ) -> None:
 
         assert (
@@ -134,6 +221,22 @@ class Trainer:
         ), "The value of `minimum_learning_rate` should be >= 0"
         assert 0 < clip_gradient, "The value of `clip_gradient` should be > 0"
         assert 0 <= weight_decay, "The value of `weight_decay` should be => 0"
+        assert (
+            contexts is None or len(contexts) > 0
+        ), "The value of `contexts` should not be empty"
+        assert (
+            0 < checkpoint_interval
+        ), "The value of `checkpoint_interval` should be > 0"
+        assert (
+            0 < loss_sync_interval
+        ), "The value of `loss_sync_interval` should be > 0"
+        assert (
+            progress_bar_refresh_interval is None
+            or 0 <= progress_bar_refresh_interval
+        ), "The value of `progress_bar_refresh_interval` should be >= 0"
+        assert (
+            0 < initial_loss_scale
+        ), "The value of `initial_loss_scale` should be > 0"
 
         self.epochs = epochs
         self.batch_size = batch_size
@@ -146,7 +249,17 @@ class Trainer:
         self.weight_decay = weight_decay
         self.init = init
         self.hybridize = hybridize
-        self.ctx = ctx if ctx is not None else get_mxnet_context()
+        self.in_memory_snapshots = in_memory_snapshots
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_interval = checkpoint_interval
+        self.loss_sync_interval = loss_sync_interval
+        self.progress_bar_refresh_interval = progress_bar_refresh_interval
+        self.initial_loss_scale = initial_loss_scale
+        if ctx is None:
+            ctx = contexts[0] if contexts else get_mxnet_context()
+        self.ctx = ctx
+        self.contexts = contexts if contexts else [ctx]
+        self.kvstore = kvstore
         self.halt = False
 
     def set_halt(self, signum: int, stack_frame: Any) -> None:
@@ -167,7 +280,12 @@ class Trainer:
         input_names: List[str],
         train_iter: TrainDataLoader,
         validation_iter: Optional[ValidationDataLoader] = None,
+        resume_from: Optional[str] = None,
     ) -> None:  # TODO: we may want to return some training information here
+        """
+        Trains the network, resuming the training from the latest checkpoint
+        in the directory `resume_from` if there is one.
+        """
         is_validation_available = validation_iter is not None
         self.halt = False
 
@@ -183,7 +301,7 @@ class Trainer:
 
             logging.info("Start model training")
 
-            net.initialize(ctx=self.ctx, init=self.init)
+            net.initialize(ctx=self.contexts, init=self.init)
 
             with HybridContext(
                 net=net,
@@ -198,6 +316,21 @@ class Trainer:
                     epoch_no=-1,
                     metric_value=np.Inf,
                 )
+                best_snapshot: Optional[ParameterSnapshot] = None
+
+                def load_best_parameters() -> None:
+                    logging.info(
+                        f"Loading parameters from best epoch "
+                        f"({best_epoch_info.epoch_no})"
+                    )
+                    if best_snapshot is not None:
+                        best_snapshot.restore(net)
+                    else:
+                        net.load_parameters(
+                            best_epoch_info.params_path, self.contexts
+                        )
+                    if loss_scaler is not None:
+                        reset_master_weights(trainer)
 
                 lr_scheduler = lrs.MetricAttentiveScheduler(
                     objective="min",
@@ -206,17 +339,38 @@ class Trainer:
                     min_lr=self.minimum_learning_rate,
                 )
 
+                loss_scaler: Optional[DynamicLossScaler] = None
+                if has_float16_parameters(net):
+                    logging.info("Training in mixed precision")
+                    loss_scaler = DynamicLossScaler(self.initial_loss_scale)
+
                 optimizer = mx.optimizer.Adam(
                     learning_rate=self.learning_rate,
                     lr_scheduler=lr_scheduler,
                     wd=self.weight_decay,
                     clip_gradient=self.clip_gradient,
+                    # float32 copies of the float16 parameters are updated
+                    multi_precision=loss_scaler is not None,
                 )
 
+                # the gradients are summed over the workers of a distributed
+                # key-value store, so that each step is normalized by the
+                # size of the batches of all the workers
+                kvstore: Union[str, mx.kvstore.KVStore] = self.kvstore
+                num_kvstore_workers = 1
+                if "dist" in self.kvstore:
+                    kvstore = mx.kv.create(self.kvstore)
+                    num_kvstore_workers = kvstore.num_workers
+
+                # the parameters are updated on each context rather than in
+                # the key-value store: restoring the parameters of the best
+                # epoch would otherwise reset the key-value store, losing the
+                # states of the optimizer, which fails for a distributed one
                 trainer = mx.gluon.Trainer(
                     net.collect_params(),
                     optimizer=optimizer,
-                    kvstore="device",  # FIXME: initialize properly
+                    kvstore=kvstore,
+                    update_on_kvstore=False,
                 )
 
                 def loop(
@@ -225,38 +379,89 @@ class Trainer:
                     tic = time.time()
 
                     epoch_loss = mx.metric.Loss()
+                    # losses not yet added to `epoch_loss`, which are kept on
+                    # the device until the next synchronization
+                    pending_losses: List[mx.nd.NDArray] = []
 
-                    with tqdm(batch_iter) as it:
+                    tqdm_kwargs = {}
+                    if self.progress_bar_refresh_interval is not None:
+                        tqdm_kwargs[
+                            "mininterval"
+                        ] = self.progress_bar_refresh_interval
+
+                    with tqdm(batch_iter, **tqdm_kwargs) as it:
                         for batch_no, data_entry in enumerate(it, start=1):
                             if self.halt:
                                 break
 
                             inputs = [data_entry[k] for k in input_names]
 
-                            with mx.autograd.record():
-                                output = net(*inputs)
-
-                                # network can returns several outputs, the first being always the loss
-                                # when having multiple outputs, the forward returns a list in the case of hybrid and a
-                                # tuple otherwise
-                                # we may wrap network outputs in the future to avoid this type check
-                                if isinstance(output, (list, tuple)):
-                                    loss = output[0]
-                                else:
-                                    loss = output
-
-                            if is_training:
-                                loss.backward()
-                                trainer.step(batch_size)
-
-                            epoch_loss.update(None, preds=loss)
-                            it.set_postfix(
-                                ordered_dict={
-                                    ("" if is_training else "validation_")
-                                    + "avg_epoch_loss": loss_value(epoch_loss)
-                                },
-                                refresh=False,
+                            # each context gets a slice of the batch
+                            contexts = self.contexts[: inputs[0].shape[0]]
+                            shards = zip(
+                                *(
+                                    mx.gluon.utils.split_and_load(
+                                        data, contexts, even_split=False
+                                    )
+                                    for data in inputs
+                                )
                             )
+
+                            losses = []
+                            with mx.autograd.record():
+                                for shard in shards:
+                                    output = net(*shard)
+
+                                    # network can returns several outputs, the first being always the loss
+                                    # when having multiple outputs, the forward returns a list in the case of hybrid and a
+                                    # tuple otherwise
+                                    # we may wrap network outputs in the future to avoid this type check
+                                    if isinstance(output, (list, tuple)):
+                                        losses.append(output[0])
+                                    else:
+                                        losses.append(output)
+
+                                if loss_scaler is not None:
+                                    # scaled in float32, where it cannot
+                                    # overflow
+                                    scaled_losses = [
+                                        loss.astype("float32")
+                                        * loss_scaler.loss_scale
+                                        for loss in losses
+                                    ]
+
+                            if is_training and loss_scaler is None:
+                                for loss in losses:
+                                    loss.backward()
+                                trainer.step(batch_size * num_kvstore_workers)
+                            elif is_training:
+                                for loss in scaled_losses:
+                                    loss.backward()
+                                # an overflowing update must be skipped
+                                # before it runs, so that this waits for the
+                                # batch whatever the `loss_sync_interval`
+                                overflow = loss_scaler.has_overflow(net)
+                                if not overflow:
+                                    trainer.step(
+                                        batch_size
+                                        * num_kvstore_workers
+                                        * loss_scaler.loss_scale
+                                    )
+                                loss_scaler.update(overflow)
+
+                            pending_losses.extend(losses)
+                            if batch_no % self.loss_sync_interval == 0:
+                                epoch_loss.update(None, preds=pending_losses)
+                                pending_losses = []
+                                it.set_postfix(
+                                    ordered_dict={
+                                        ("" if is_training else "validation_")
+                                        + "avg_epoch_loss": loss_value(
+                                            epoch_loss
+                                        )
+                                    },
+                                    refresh=False,
+                                )
                             # print out parameters of the network at the first pass
                             if batch_no == 1 and epoch_no == 0:
                                 net_name = type(net).__name__
@@ -264,6 +469,9 @@ class Trainer:
                                 logging.info(
                                     f"Number of parameters in {net_name}: {num_model_param}"
                                 )
+                    if pending_losses:
+                        epoch_loss.update(None, preds=pending_losses)
+
                     # mark epoch end time and log time cost of current epoch
                     toc = time.time()
                     logging.info(
@@ -282,7 +490,46 @@ class Trainer:
                     )
                     return epoch_loss
 
-                for epoch_no in range(self.epochs):
+                start_epoch_no = 0
+                checkpoint = (
+                    latest_checkpoint(Path(resume_from))
+                    if resume_from is not None
+                    else None
+                )
+                if checkpoint is not None:
+                    logging.info(f"Resuming training from {checkpoint}")
+                    state = load_training_state(checkpoint)
+                    start_epoch_no = state.epoch_no
+
+                    net.load_parameters(
+                        str(checkpoint / "best.params"), self.contexts
+                    )
+                    best_epoch_info = BestEpochInfo(
+                        params_path="%s-%04d.params"
+                        % (base_path(), state.best_epoch_no),
+                        epoch_no=state.best_epoch_no,
+                        metric_value=state.best_metric_value,
+                    )
+                    if self.in_memory_snapshots:
+                        best_snapshot = ParameterSnapshot(net)
+                    else:
+                        net.save_parameters(best_epoch_info.params_path)
+
+                    net.load_parameters(
+                        str(checkpoint / "params"), self.contexts
+                    )
+                    trainer.load_states(str(checkpoint / "trainer.states"))
+                    # the optimizer, and so the learning rate scheduler, are
+                    # replaced by the ones saved with the states
+                    lr_scheduler = trainer.optimizer.lr_scheduler
+
+                def save_best_parameters(path: str) -> None:
+                    if best_snapshot is not None:
+                        best_snapshot.save(path)
+                    else:
+                        shutil.copyfile(best_epoch_info.params_path, path)
+
+                for epoch_no in range(start_epoch_no, self.epochs):
                     if self.halt:
                         logging.info(
                             f"Epoch[{epoch_no}] Interrupting training"
@@ -303,37 +550,54 @@ class Trainer:
                     lr_scheduler.step(loss_value(epoch_loss))
 
                     if loss_value(epoch_loss) < best_epoch_info.metric_value:
+                        previous_params_path = best_epoch_info.params_path
                         best_epoch_info = BestEpochInfo(
                             params_path="%s-%04d.params"
                             % (base_path(), epoch_no),
                             epoch_no=epoch_no,
                             metric_value=loss_value(epoch_loss),
                         )
-                        net.save_parameters(
-                            best_epoch_info.params_path
-                        )  # TODO: handle possible exception
+                        if self.in_memory_snapshots:
+                            best_snapshot = ParameterSnapshot(net)
+                        else:
+                            net.save_parameters(
+                                best_epoch_info.params_path
+                            )  # TODO: handle possible exception
+                            # only the parameters of the best epoch are kept
+                            if os.path.exists(previous_params_path):
+                                os.remove(previous_params_path)
 
                     if not trainer.learning_rate == curr_lr:
-                        logging.info(
-                            f"Loading parameters from best epoch "
-                            f"({best_epoch_info.epoch_no})"
-                        )
-                        net.load_parameters(
-                            best_epoch_info.params_path, self.ctx
+                        load_best_parameters()
+
+                    # an interrupted epoch is not saved, so that it is
+                    # trained again when resuming
+                    if (
+                        self.checkpoint_dir is not None
+                        and not self.halt
+                        and (epoch_no + 1) % self.checkpoint_interval == 0
+                    ):
+                        save_checkpoint(
+                            Path(self.checkpoint_dir),
+                            TrainingState(
+                                epoch_no=epoch_no + 1,
+                                best_epoch_no=best_epoch_info.epoch_no,
+                                best_metric_value=best_epoch_info.metric_value,
+                            ),
+                            net,
+                            trainer,
+                            save_best_parameters,
                         )
 
-                logging.info(
-                    f"Loading parameters from best epoch "
-                    f"({best_epoch_info.epoch_no})"
-                )
-                net.load_parameters(best_epoch_info.params_path, self.ctx)
+                load_best_parameters()
 
                 logging.info(
                     f"Final loss: {best_epoch_info.metric_value} "
                     f"(occurred at epoch {best_epoch_info.epoch_no})"
                 )
 
-                # save net parameters
-                net.save_parameters(best_epoch_info.params_path)
+                if not self.in_memory_snapshots:
+                    # save net parameters
+                    net.save_parameters(best_epoch_info.params_path)
 
                 logging.getLogger().info("End model training")
@@ -0,0 +1,156 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+Checkpoints of the state of a training, from which an interrupted training
+can be resumed.
+
+A checkpoint is a directory containing
+
+- the parameters of the network (``params``),
+- the parameters of the best epoch so far (``best.params``),
+- the states of the optimizer (``trainer.states``), which include the
+  learning rate scheduler,
+- the number of epochs done and the best epoch (``state.json``),
+- the states of the random number generators (``random.pkl``).
+"""
+
+# Standard library imports
+import json
+import logging
+import os
+import pickle
+import random
+import shutil
+import uuid
+from itertools import chain
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+# Third-party imports
+import mxnet as mx
+import numpy as np
+
+logger = logging.getLogger("trainer")
+
+CHECKPOINT_PREFIX = "checkpoint-"
+
+
+class TrainingState(NamedTuple):
+    # number of epochs done
+    epoch_no: int
+    best_epoch_no: int
+    best_metric_value: float
+
+
+def latest_checkpoint(checkpoint_dir: Path) -> Optional[Path]:
+    """
+    Returns the most recent checkpoint in `checkpoint_dir`, if any.
+    """
+    if not checkpoint_dir.is_dir():
+        return None
+    checkpoints = sorted(checkpoint_dir.glob(CHECKPOINT_PREFIX + "*"))
+    return checkpoints[-1] if checkpoints else None
+
+
+def save_random_state(path: Path) -> None:
+    # the state of the MXNet generators cannot be read, so they are reseeded
+    # from the numpy generator, with a seed which is saved
+    mx_seed = np.random.randint(2 ** 31 - 1)
+    mx.random.seed(mx_seed)
+    with path.open("wb") as fp:
+        pickle.dump(
+            {
+                "random": random.getstate(),
+                "numpy": np.random.get_state(),
+                "mxnet_seed": mx_seed,
+            },
+            fp,
+        )
+
+
+def load_random_state(path: Path) -> None:
+    with path.open("rb") as fp:
+        state = pickle.load(fp)
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy"])
+    mx.random.seed(state["mxnet_seed"])
+
+
+def save_checkpoint(
+    checkpoint_dir: Path,
+    state: TrainingState,
+    net: mx.gluon.Block,
+    trainer: mx.gluon.Trainer,
+    save_best_params: Callable[[str], None],
+) -> Path:
+    """
+    Writes a checkpoint of the training to `checkpoint_dir`, and removes the
+    previous ones. The checkpoint is written to a temporary directory first,
+    so that an interruption never leaves a partial checkpoint.
+
+    Parameters
+    ----------
+    checkpoint_dir
+        Directory of the checkpoints.
+    state
+        Progress of the training.
+    net
+        Network being trained.
+    trainer
+        Trainer of the network.
+    save_best_params
+        Function writing the parameters of the best epoch to the given path.
+
+    Returns
+    -------
+    Path
+        The path of the checkpoint.
+    """
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_dir / f"tmp-{uuid.uuid4()}"
+    tmp_path.mkdir()
+
+    net.save_parameters(str(tmp_path / "params"))
+    save_best_params(str(tmp_path / "best.params"))
+    trainer.save_states(str(tmp_path / "trainer.states"))
+    with (tmp_path / "state.json").open("w") as fp:
+        json.dump(state._asdict(), fp)
+    save_random_state(tmp_path / "random.pkl")
+
+    path = checkpoint_dir / f"{CHECKPOINT_PREFIX}{state.epoch_no:04d}"
+    if path.exists():
+        shutil.rmtree(path)
+    os.rename(tmp_path, path)
+
+    # the previous checkpoints, and the partial ones left by an interruption
+    for previous in chain(
+        checkpoint_dir.glob(CHECKPOINT_PREFIX + "*"),
+        checkpoint_dir.glob("tmp-*"),
+    ):
+        if previous != path:
+            shutil.rmtree(previous)
+
+    logger.info(f"Saved checkpoint {path}")
+    return path
+
+
+def load_training_state(path: Path) -> TrainingState:
+    """
+    Returns the progress of the training saved in the checkpoint at `path`,
+    and restores the states of the random number generators.
+    """
+    with (path / "state.json").open() as fp:
+        state = TrainingState(**json.load(fp))
+    load_random_state(path / "random.pkl")
+    return state
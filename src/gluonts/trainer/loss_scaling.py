@@ -0,0 +1,109 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Standard library imports
+import logging
+
+# Third-party imports
+import mxnet as mx
+import mxnet.gluon.nn as nn
+import numpy as np
+
+logger = logging.getLogger("trainer")
+
+
+def has_float16_parameters(net: nn.Block) -> bool:
+    return any(
+        np.dtype(param.dtype) == np.float16
+        for param in net.collect_params().values()
+    )
+
+
+def reset_master_weights(trainer: mx.gluon.Trainer) -> None:
+    """
+    Copies the float16 parameters of `trainer` to the float32 master copies
+    updated by its optimizer in mixed precision, which must be done whenever
+    the parameters are set, e.g. restored from an earlier epoch: the next
+    update would otherwise overwrite them with the master copies.
+
+    The optimizer states of a float16 parameter are expected to be laid out
+    as by `mx.optimizer.Optimizer` (e.g. for Adam), as the master copy
+    followed by the original states, and to be held by the trainer, which
+    must not update the parameters in its key-value store.
+    """
+    for index, param in enumerate(trainer._params):
+        if np.dtype(param.dtype) != np.float16:
+            continue
+        # the updaters are in the order of the contexts of the parameters
+        for updater, data in zip(trainer._updaters, param.list_data()):
+            if index in updater.states:
+                updater.states[index][0][:] = data.astype("float32")
+
+
+class DynamicLossScaler:
+    """
+    Scales the loss of a network computing in float16 before back-propagation,
+    so that small gradients do not underflow, and adapts the scale: it is
+    halved whenever the gradients overflow, in which case the update must be
+    skipped, and doubled after `scale_window` updates without overflow.
+
+    Parameters
+    ----------
+    initial_scale
+        Initial scale of the loss.
+    scale_window
+        Number of updates without overflow after which the scale is doubled.
+    min_scale
+        Lower bound of the scale.
+    """
+
+    def __init__(
+        self,
+        initial_scale: float = 2.0 ** 15,
+        scale_window: int = 2000,
+        min_scale: float = 1.0,
+    ) -> None:
+        assert initial_scale > 0, "The value of `initial_scale` should be > 0"
+        assert scale_window > 0, "The value of `scale_window` should be > 0"
+
+        self.loss_scale = initial_scale
+        self.scale_window = scale_window
+        self.min_scale = min_scale
+        self._num_good_steps = 0
+
+    def has_overflow(self, net: nn.Block) -> bool:
+        """
+        Returns whether some gradient of `net` is not finite; this waits for
+        the gradients to be computed.
+        """
+        norms = [
+            grad.astype("float32").norm().as_in_context(mx.cpu())
+            for param in net.collect_params().values()
+            if param.grad_req != "null"
+            for grad in param.list_grad()
+        ]
+        return bool(norms) and not np.isfinite(mx.nd.add_n(*norms).asscalar())
+
+    def update(self, overflow: bool) -> None:
+        if overflow:
+            self.loss_scale = max(self.min_scale, self.loss_scale / 2)
+            self._num_good_steps = 0
+            logger.info(
+                f"Gradient overflow, reducing the loss scale to "
+                f"{self.loss_scale}"
+            )
+        else:
+            self._num_good_steps += 1
+            if self._num_good_steps == self.scale_window:
+                self.loss_scale *= 2
+                self._num_good_steps = 0
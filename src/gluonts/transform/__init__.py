@@ -20,6 +20,7 @@ __all__ = [
     "AdhocTransform",
     "AsNumpyArray",
     "BucketInstanceSampler",
+    "CachedTransformedDataset",
     "CanonicalInstanceSplitter",
     "cdf_to_gaussian_forward_transform",
     "CDFtoGaussianTransform",
@@ -74,7 +75,7 @@ from .convert import (
     cdf_to_gaussian_forward_transform,
 )
 
-from .dataset import TransformedDataset
+from .dataset import CachedTransformedDataset, TransformedDataset
 
 from .feature import (
     target_transformation_length,
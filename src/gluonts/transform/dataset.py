@@ -11,11 +11,30 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+# Standard library imports
+import os
+import tempfile
+import weakref
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from typing import List, Iterator
+# Third-party imports
+import numpy as np
 
+# First-party imports
 from gluonts.dataset.common import Dataset, DataEntry
-from gluonts.transform import Chain, Transformation
+from gluonts.support.shared_memory import (
+    ALIGNMENT,
+    ArrayLayout,
+    extract_arrays,
+    insert_arrays,
+)
+from gluonts.transform import (
+    AdhocTransform,
+    CDFtoGaussianTransform,
+    Chain,
+    MapTransformation,
+    Transformation,
+)
 
 
 class TransformedDataset(Dataset):
@@ -45,3 +64,205 @@ class TransformedDataset(Dataset):
 
     def __len__(self):
         return sum(1 for _ in self)
+
+
+def _is_deterministic(transformation: Transformation) -> bool:
+    # map transformations are deterministic, except those known to sample
+    # random values and ad-hoc ones, which may do anything
+    return isinstance(transformation, MapTransformation) and not isinstance(
+        transformation, (AdhocTransform, CDFtoGaussianTransform)
+    )
+
+
+def _num_bytes(data: DataEntry) -> int:
+    return sum(
+        value.nbytes
+        for value in data.values()
+        if isinstance(value, np.ndarray)
+    )
+
+
+def _copy_arrays(data: DataEntry) -> DataEntry:
+    return {
+        name: value.copy() if isinstance(value, np.ndarray) else value
+        for name, value in data.items()
+    }
+
+
+class CachedTransformedDataset(Dataset):
+    """
+    A dataset that corresponds to applying a list of transformations to each
+    element in the base_dataset, where the results of the deterministic
+    prefix of the transformations are computed once and cached.
+
+    The prefix consists of the leading map transformations (e.g.
+    AsNumpyArray, AddObservedValuesIndicator, AddTimeFeatures, AddAgeFeature,
+    VstackFeatures) of the chain, except for those which sample random values.
+    The remaining transformations (e.g. InstanceSplitter) are applied at every
+    iteration. The number of elements is counted during the first complete
+    iteration and cached as well.
+
+    Cached entries are kept in memory up to `max_cache_bytes` bytes of array
+    data. Those which do not fit are written to a file in `spill_dir` and
+    read back through a memory map, or, if no `spill_dir` is given, are
+    recomputed at every iteration. Once all entries are cached, the base
+    dataset is not read anymore.
+
+    To use it for training, pass it to a TrainDataLoader together with the
+    `Identity` transformation.
+
+    Parameters
+    ----------
+    base_dataset
+        Dataset to transform
+    transformations
+        List of transformations to apply
+    is_train
+        Whether to apply the transformations in training mode.
+    max_cache_bytes
+        Size in bytes of the arrays kept in memory. If None, all entries are
+        kept in memory.
+    spill_dir
+        Directory in which to write the entries which do not fit in memory.
+    """
+
+    def __init__(
+        self,
+        base_dataset: Dataset,
+        transformations: List[Transformation],
+        is_train: bool = True,
+        max_cache_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        self.base_dataset = base_dataset
+        self.transformations = Chain(transformations)
+        self.is_train = is_train
+        self.max_cache_bytes = max_cache_bytes
+        self.spill_dir = spill_dir
+
+        num_cached = 0
+        for transformation in self.transformations.transformations:
+            if not _is_deterministic(transformation):
+                break
+            num_cached += 1
+
+        self.cached_transformations = Chain(
+            self.transformations.transformations[:num_cached]
+        )
+        self.live_transformations = Chain(
+            self.transformations.transformations[num_cached:]
+        )
+
+        self._memory_cache: Dict[int, DataEntry] = {}
+        self._memory_cache_bytes = 0
+        self._spill_cache: Dict[int, Tuple[DataEntry, List[ArrayLayout]]] = {}
+        self._spill_path: Optional[str] = None
+        self._spill_size = 0
+        self._num_base_entries: Optional[int] = None
+        self._len: Optional[int] = None
+
+    def _is_complete(self) -> bool:
+        return (
+            self._num_base_entries is not None
+            and self._num_base_entries
+            == (len(self._memory_cache) + len(self._spill_cache))
+        )
+
+    def _spill(self, index: int, data: DataEntry) -> None:
+        if self._spill_path is None:
+            fd, self._spill_path = tempfile.mkstemp(
+                prefix="gluonts-cache-", suffix=".bin", dir=self.spill_dir
+            )
+            os.close(fd)
+            weakref.finalize(self, os.remove, self._spill_path)
+
+        arrays: List[np.ndarray] = []
+        skeleton = extract_arrays(data, arrays, {})
+        layouts = []
+        with open(self._spill_path, "ab") as spill_file:
+            for array in arrays:
+                padding = -self._spill_size % ALIGNMENT
+                spill_file.write(b"\0" * padding)
+                self._spill_size += padding
+                layouts.append(
+                    ArrayLayout(
+                        offset=self._spill_size,
+                        shape=array.shape,
+                        dtype=array.dtype.str,
+                    )
+                )
+                spill_file.write(np.ascontiguousarray(array).tobytes())
+                self._spill_size += array.nbytes
+        self._spill_cache[index] = skeleton, layouts
+
+    def _cache(self, index: int, data: DataEntry) -> None:
+        num_bytes = _num_bytes(data)
+        if (
+            self.max_cache_bytes is None
+            or self._memory_cache_bytes + num_bytes <= self.max_cache_bytes
+        ):
+            self._memory_cache[index] = data
+            self._memory_cache_bytes += num_bytes
+        elif self.spill_dir is not None:
+            self._spill(index, data)
+
+    def _iterate_cached(self) -> Iterator[DataEntry]:
+        # the spill file is mapped in copy-on-write mode, and the arrays
+        # kept in memory are copied, so that later transformations may
+        # modify them in place
+        spilled = (
+            np.memmap(self._spill_path, dtype=np.uint8, mode="c")
+            if self._spill_size > 0
+            else None
+        )
+
+        def cached_entry(index: int) -> Optional[DataEntry]:
+            if index in self._memory_cache:
+                return _copy_arrays(self._memory_cache[index])
+            if index in self._spill_cache:
+                skeleton, layouts = self._spill_cache[index]
+                arrays = [
+                    np.ndarray(
+                        shape=layout.shape,
+                        dtype=layout.dtype,
+                        buffer=spilled,
+                        offset=layout.offset,
+                    )
+                    for layout in layouts
+                ]
+                return insert_arrays(skeleton, arrays)
+            return None
+
+        if self._is_complete():
+            for index in range(self._num_base_entries):
+                yield cached_entry(index)
+            return
+
+        num_base_entries = 0
+        for index, data in enumerate(self.base_dataset):
+            num_base_entries += 1
+            entry = cached_entry(index)
+            if entry is None:
+                entry = next(
+                    self.cached_transformations(iter([data]), self.is_train)
+                )
+                self._cache(index, entry)
+                if index in self._memory_cache:
+                    entry = _copy_arrays(entry)
+            yield entry
+        self._num_base_entries = num_base_entries
+
+    def __iter__(self) -> Iterator[DataEntry]:
+        num_entries = 0
+        for data in self.live_transformations(
+            self._iterate_cached(), self.is_train
+        ):
+            num_entries += 1
+            yield data
+        self._len = num_entries
+
+    def __len__(self):
+        if self._len is None:
+            for _ in self:
+                pass
+        return self._len
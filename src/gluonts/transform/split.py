@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 from functools import lru_cache
-from typing import Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -21,6 +21,7 @@ from gluonts.core.component import validated
 from gluonts.core.exception import GluonTSDateBoundsError
 from gluonts.dataset.common import DataEntry
 from gluonts.dataset.field_names import FieldName
+from gluonts.runtime_params import GLUONTS_MAX_IDLE_TRANSFORMS
 
 from ._base import FlatMapTransformation
 from .sampler import InstanceSampler, ContinuousTimePointSampler
@@ -151,11 +152,7 @@ class InstanceSplitter(FlatMapTransformation):
     def _future(self, col_name):
         return f"future_{col_name}"
 
-    def flatmap_transform(
-        self, data: DataEntry, is_train: bool
-    ) -> Iterator[DataEntry]:
-        pl = self.future_length
-        slice_cols = self.ts_fields + [self.target_field]
+    def _sample_indices(self, data: DataEntry, is_train: bool) -> np.ndarray:
         target = data[self.target_field]
 
         len_target = target.shape[-1]
@@ -177,14 +174,22 @@ class InstanceSplitter(FlatMapTransformation):
             # too short during training, so we just skip these.
             # If we want to include them we would need to pad and to
             # mask the loss.
-            sampled_indices = (
+            return (
                 np.array([], dtype=int)
                 if len_target < minimum_length
                 else self.train_sampler(target, *sampling_bounds)
             )
         else:
             assert self.pick_incomplete or len_target >= self.past_length
-            sampled_indices = np.array([len_target], dtype=int)
+            return np.array([len_target], dtype=int)
+
+    def flatmap_transform(
+        self, data: DataEntry, is_train: bool
+    ) -> Iterator[DataEntry]:
+        pl = self.future_length
+        slice_cols = self.ts_fields + [self.target_field]
+        sampled_indices = self._sample_indices(data, is_train)
+
         for i in sampled_indices:
             pad_length = max(self.past_length - i, 0)
             if not self.pick_incomplete:
@@ -231,6 +236,158 @@ class InstanceSplitter(FlatMapTransformation):
             )
             yield d
 
+    def sample_instances(
+        self, data_it: Iterator[DataEntry], is_train: bool
+    ) -> Iterator[Tuple[DataEntry, int]]:
+        """
+        Yields the pairs (entry, index) of the instances that this
+        transformation would produce from `data_it`, in the same order and
+        drawing the same sampling indices, without splitting them. The
+        instances can then be split in batches with `split_batch`.
+        """
+        num_idle_transforms = 0
+        for data in data_it:
+            num_idle_transforms += 1
+            for i in self._sample_indices(data, is_train):
+                num_idle_transforms = 0
+                yield data, int(i)
+            if num_idle_transforms > GLUONTS_MAX_IDLE_TRANSFORMS:
+                raise Exception(
+                    f"Reached maximum number of idle transformation calls.\n"
+                    f"This means the transformation looped over "
+                    f"GLUONTS_MAX_IDLE_TRANSFORMS={GLUONTS_MAX_IDLE_TRANSFORMS} "
+                    f"inputs without returning any output.\n"
+                    f"This occurred in the following transformation:\n{self}"
+                )
+
+    def split_batch(
+        self, data: List[DataEntry], indices: Sequence[int]
+    ) -> Dict[str, Any]:
+        """
+        Splits a batch of instances at once: ``data[k]`` is split at
+        ``indices[k]``, with the same result as `flatmap_transform`.
+
+        The past and future windows of the time series fields, and the
+        padding indicator, are written to arrays whose first axis is the
+        batch; the remaining fields are returned as lists with one value per
+        instance, as they would be collected from the individual instances.
+
+        The windows are taken from a strided view on each entry, which is
+        padded at most once, so the cost per instance is a copy of its
+        windows.
+        """
+        indices = np.asarray(indices, dtype=int)
+        assert len(data) == len(indices) > 0
+        if not self.pick_incomplete:
+            assert np.all(
+                indices >= self.past_length
+            ), "pad_length should be zero"
+
+        # instances taken from the same entry are processed together
+        groups: Dict[int, Tuple[DataEntry, List[int]]] = {}
+        for k, d in enumerate(data):
+            groups.setdefault(id(d), (d, []))[1].append(k)
+
+        slice_cols = self.ts_fields + [self.target_field]
+        batch: Dict[str, Any] = {
+            field: [d[field] for d in data]
+            for field in data[0]
+            if field not in slice_cols
+        }
+
+        for ts_field in slice_cols:
+            past_pieces = []
+            future_pieces = []
+            for d, rows in groups.values():
+                x = np.asarray(d[ts_field])
+                idx = indices[rows]
+                if np.any(idx < self.past_length):
+                    # same padding, hence same dtype, as flatmap_transform
+                    pad_block = (
+                        np.ones(
+                            x.shape[:-1] + (self.past_length,), dtype=x.dtype
+                        )
+                        * self.dummy_value
+                    )
+                    past = np.concatenate([pad_block, x], axis=-1)
+                    past_start = idx
+                else:
+                    past = x
+                    past_start = idx - self.past_length
+                past_pieces.append(
+                    _sliding_windows(past, self.past_length)[
+                        ..., past_start, :
+                    ]
+                )
+
+                future_length = np.clip(
+                    x.shape[-1] - idx, 0, self.future_length
+                )
+                assert np.all(future_length == future_length[0]), (
+                    f"future_{ts_field} has different lengths in the "
+                    f"same batch"
+                )
+                future_pieces.append(
+                    _sliding_windows(x, future_length[0])[..., idx, :]
+                )
+
+            batch[self._past(ts_field)] = self._stack_windows(
+                groups, past_pieces
+            )
+            batch[self._future(ts_field)] = self._stack_windows(
+                groups, future_pieces
+            )
+
+        # a single mask for the whole batch: position t of instance k is
+        # padding iff t < past_length - indices[k]
+        batch[self._past(self.is_pad_field)] = (
+            np.arange(self.past_length)[np.newaxis, :]
+            < (self.past_length - indices)[:, np.newaxis]
+        ).astype(float)
+        batch[self.forecast_start_field] = [
+            shift_timestamp(d[self.start_field], i)
+            for d, i in zip(data, indices)
+        ]
+        return batch
+
+    def _stack_windows(
+        self,
+        groups: Dict[int, Tuple[DataEntry, List[int]]],
+        pieces: List[np.ndarray],
+    ) -> np.ndarray:
+        # pieces[g] has shape (..., num_instances_in_group, length)
+        first = pieces[0]
+        batch_size = sum(len(rows) for _, rows in groups.values())
+        instance_shape = first.shape[:-2] + first.shape[-1:]
+        if self.output_NTC:
+            instance_shape = instance_shape[::-1]
+        out = np.empty(
+            (batch_size,) + instance_shape,
+            dtype=np.result_type(*[piece.dtype for piece in pieces]),
+        )
+        for (_, rows), piece in zip(groups.values(), pieces):
+            piece = np.moveaxis(piece, -2, 0)
+            if self.output_NTC:
+                piece = piece.transpose(
+                    [0] + list(range(piece.ndim - 1, 0, -1))
+                )
+            out[rows] = piece
+        return out
+
+
+def _sliding_windows(x: np.ndarray, length: int) -> np.ndarray:
+    """
+    Returns a read-only view with shape ``x.shape[:-1] + (n, length)`` on the
+    ``n = x.shape[-1] - length + 1`` windows of the given length along the
+    last axis of `x`.
+    """
+    return np.lib.stride_tricks.as_strided(
+        x,
+        shape=x.shape[:-1] + (x.shape[-1] - length + 1, length),
+        strides=x.strides + x.strides[-1:],
+        writeable=False,
+    )
+
 
 class CanonicalInstanceSplitter(FlatMapTransformation):
     """
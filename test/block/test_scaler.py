@@ -205,3 +205,16 @@ def test_nopscaler(target, observed):
 
     assert mx.nd.norm(target - target_scaled) == 0
     assert mx.nd.norm(mx.nd.ones_like(target).mean(axis=1) - scale) == 0
+
+
+def test_float16_mean_scaler():
+    s = scaler.MeanScaler(dtype=np.float16)
+    # the sum of the values over time overflows in float16
+    target = mx.nd.array([[10000.0] * 50, [0.0] * 50], dtype=np.float16)
+    observed = mx.nd.ones_like(target)
+
+    target_scaled, scale = s(target, observed)
+
+    assert scale.dtype == np.float16
+    assert np.allclose(scale.asnumpy(), [10000.0, 5000.0])
+    assert np.allclose(target_scaled.asnumpy()[0], 1.0)
@@ -18,6 +18,7 @@ from pathlib import Path
 from typing import Any, Iterator
 
 # Third-party imports
+import mxnet as mx
 import numpy as np
 import pandas as pd
 import pytest
@@ -35,9 +36,17 @@ from gluonts.dataset.common import (
 )
 from gluonts.dataset.common import ProcessDataEntry
 from gluonts.dataset.artificial import ComplexSeasonalTimeSeries
+from gluonts.dataset.field_names import FieldName
 from gluonts.dataset.jsonl import JsonLinesFile
+from gluonts.dataset.loader import TrainDataLoader
 from gluonts.dataset.util import find_files
 from gluonts.support.util import Timer
+from gluonts.transform import (
+    AsNumpyArray,
+    Chain,
+    ExpectedNumInstanceSampler,
+    InstanceSplitter,
+)
 
 
 def baseline(path: Path, freq: str) -> Iterator[Any]:
@@ -188,3 +197,130 @@ def test_timeseries_item_serialization() -> None:
 
     deserialized_ts_item = TimeSeriesItem(**serialized_data)
     assert deserialized_ts_item == ts_item
+
+
+def make_train_loader(**kwargs) -> TrainDataLoader:
+    dataset = ListDataset(
+        [
+            {"start": "2014-09-07", "target": np.arange(20 + k)}
+            for k in range(7)
+        ],
+        freq="D",
+    )
+    transform = Chain(
+        [
+            AsNumpyArray(field=FieldName.TARGET, expected_ndim=1),
+            InstanceSplitter(
+                target_field=FieldName.TARGET,
+                is_pad_field=FieldName.IS_PAD,
+                start_field=FieldName.START,
+                forecast_start_field=FieldName.FORECAST_START,
+                train_sampler=ExpectedNumInstanceSampler(num_instances=1),
+                past_length=10,
+                future_length=5,
+            ),
+        ]
+    )
+    return TrainDataLoader(
+        dataset=dataset,
+        transform=transform,
+        batch_size=4,
+        ctx=mx.cpu(),
+        num_batches_per_epoch=5,
+        **kwargs,
+    )
+
+
+def test_file_dataset_shard(tmp_path) -> None:
+    lines = [
+        json.dumps({"start": "2014-09-07", "target": [float(i)] * 3})
+        for i in range(7)
+    ]
+    # the lines of the other shards are not decoded
+    lines[1] = "not json"
+    (tmp_path / "a.json").write_text("\n".join(lines[:3]) + "\n")
+    (tmp_path / "b.json").write_text("\n".join(lines[3:]) + "\n")
+    dataset = FileDataset(tmp_path, freq="D")
+
+    targets = [
+        entry["target"][0] for entry in dataset.shard(shard_id=0, num_shards=2)
+    ]
+    assert targets == [0.0, 2.0, 4.0, 6.0]
+
+
+@pytest.mark.parametrize("num_workers", [2, 3, 10])
+@pytest.mark.parametrize("shared_memory_size", [None, 2 ** 16])
+def test_train_loader_multiprocessing(
+    num_workers: int, shared_memory_size
+) -> None:
+    def load(loader: TrainDataLoader):
+        np.random.seed(0)
+        try:
+            return [
+                batch["past_target"].asnumpy()
+                for _ in range(2)
+                for batch in loader
+            ]
+        finally:
+            loader.terminate()
+
+    batches = load(
+        make_train_loader(
+            num_workers=num_workers, shared_memory_size=shared_memory_size
+        )
+    )
+
+    assert len(batches) == 10
+    for batch in batches:
+        assert batch.shape == (4, 10)
+
+    # loading is deterministic given the seed of the calling process
+    batches_again = load(
+        make_train_loader(
+            num_workers=num_workers, shared_memory_size=shared_memory_size
+        )
+    )
+    for batch, batch_again in zip(batches, batches_again):
+        assert np.array_equal(batch, batch_again)
+
+
+@pytest.mark.parametrize("num_workers", [None, 2])
+def test_train_loader_batched_split(num_workers) -> None:
+    def load(loader: TrainDataLoader):
+        np.random.seed(0)
+        try:
+            return [
+                {
+                    k: v.asnumpy()
+                    for k, v in batch.items()
+                    if isinstance(v, mx.nd.NDArray)
+                }
+                for _ in range(2)
+                for batch in loader
+            ]
+        finally:
+            loader.terminate()
+
+    batches = load(make_train_loader(num_workers=num_workers))
+    batches_split = load(
+        make_train_loader(num_workers=num_workers, batched_split=True)
+    )
+
+    assert len(batches_split) == len(batches)
+    for batch, batch_split in zip(batches, batches_split):
+        assert batch.keys() == batch_split.keys()
+        for key in batch:
+            assert np.array_equal(batch[key], batch_split[key])
+
+
+def test_train_loader_multiprocessing_empty_dataset() -> None:
+    loader = TrainDataLoader(
+        dataset=ListDataset([], freq="D"),
+        transform=Chain([]),
+        batch_size=4,
+        ctx=mx.cpu(),
+        num_batches_per_epoch=5,
+        num_workers=2,
+    )
+    with pytest.raises(Exception, match="empty dataset"):
+        next(iter(loader))
@@ -0,0 +1,185 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Standard library imports
+import tempfile
+from pathlib import Path
+
+# Third-party imports
+import numpy as np
+import pytest
+
+# First-party imports
+from gluonts.core.exception import GluonTSDataError
+from gluonts.dataset.common import (
+    ListDataset,
+    MetaData,
+    TrainDatasets,
+    load_datasets,
+    save_datasets,
+)
+from gluonts.dataset.memmap import (
+    MemmapDataset,
+    save_memmap_dataset,
+    save_memmap_datasets,
+)
+
+
+def make_target(i: int, one_dim_target: bool) -> np.ndarray:
+    if one_dim_target:
+        return np.arange(10 + i)
+    # multivariate target of shape (dim, length)
+    return np.arange(20 + 2 * i).reshape(2, -1)
+
+
+def make_dataset(one_dim_target: bool = True) -> ListDataset:
+    return ListDataset(
+        [
+            {
+                "start": f"2014-09-0{i + 1}",
+                "target": make_target(i, one_dim_target),
+                "item_id": f"item_{i}",
+                "feat_static_cat": [i, 0],
+                "feat_dynamic_real": np.ones((3, 10 + i)) * i,
+            }
+            for i in range(5)
+        ],
+        freq="D",
+        one_dim_target=one_dim_target,
+    )
+
+
+def assert_same_entries(expected, actual) -> None:
+    assert len(list(expected)) == len(list(actual))
+    for exp, act in zip(expected, actual):
+        assert exp["start"] == act["start"]
+        assert exp["item_id"] == act["item_id"]
+        for field in ["target", "feat_static_cat", "feat_dynamic_real"]:
+            assert exp[field].dtype == act[field].dtype
+            assert np.array_equal(exp[field], act[field])
+
+
+@pytest.mark.parametrize("one_dim_target", [True, False])
+def test_memmap_dataset(one_dim_target: bool) -> None:
+    dataset = make_dataset(one_dim_target)
+
+    with tempfile.TemporaryDirectory() as path:
+        save_memmap_dataset(dataset, Path(path))
+        memmap_dataset = MemmapDataset(Path(path), freq="D")
+
+        assert len(memmap_dataset) == len(dataset)
+        assert_same_entries(dataset, memmap_dataset)
+
+        # in-place changes are neither written to disk nor seen by later
+        # iterations
+        for entry in memmap_dataset:
+            entry["target"][...] = -1
+        assert_same_entries(dataset, memmap_dataset)
+
+
+def test_memmap_dataset_shard() -> None:
+    dataset = make_dataset(one_dim_target=True)
+
+    with tempfile.TemporaryDirectory() as path:
+        save_memmap_dataset(dataset, Path(path))
+        memmap_dataset = MemmapDataset(Path(path), freq="D")
+
+        for shard_id in range(3):
+            assert_same_entries(
+                list(dataset)[shard_id::3],
+                list(memmap_dataset.shard(shard_id, 3)),
+            )
+
+
+def test_memmap_dataset_extra_fields() -> None:
+    dataset = [
+        {
+            "start": "2014-09-07",
+            "target": np.arange(10),
+            "item_id": i,
+            "tags": [i, "a"],
+            "weight": np.float64(0.5),
+            "observed": np.arange(10 + i) % 2 == 0,
+            "lags": np.arange(2 * (10 + i), dtype=np.int64).reshape(2, -1),
+        }
+        for i in range(3)
+    ]
+
+    with tempfile.TemporaryDirectory() as path:
+        save_memmap_dataset(dataset, Path(path))
+        memmap_dataset = list(MemmapDataset(Path(path), freq="D"))
+
+    assert len(memmap_dataset) == len(dataset)
+    for exp, act in zip(dataset, memmap_dataset):
+        assert act["item_id"] == exp["item_id"]
+        assert act["tags"] == exp["tags"]
+        assert act["weight"] == 0.5
+        for field in ["observed", "lags"]:
+            assert act[field].dtype == exp[field].dtype
+            assert np.array_equal(act[field], exp[field])
+
+
+def test_memmap_dataset_object_arrays() -> None:
+    dataset = [
+        {
+            "start": "2014-09-07",
+            "target": np.arange(10),
+            "names": np.array(["a", None]),
+        }
+    ]
+
+    with tempfile.TemporaryDirectory() as path:
+        with pytest.raises(GluonTSDataError):
+            save_memmap_dataset(dataset, Path(path))
+
+
+def test_memmap_dataset_inconsistent_fields() -> None:
+    dataset = [
+        {"start": "2014-09-07", "target": np.arange(10)},
+        {
+            "start": "2014-09-07",
+            "target": np.arange(10),
+            "feat_static_cat": [0],
+        },
+    ]
+
+    with tempfile.TemporaryDirectory() as path:
+        with pytest.raises(GluonTSDataError):
+            save_memmap_dataset(dataset, Path(path))
+
+
+def test_convert_train_datasets() -> None:
+    dataset = TrainDatasets(
+        metadata=MetaData(freq="D"), train=make_dataset(), test=make_dataset()
+    )
+
+    with tempfile.TemporaryDirectory() as path:
+        json_path = Path(path) / "json"
+        memmap_path = Path(path) / "memmap"
+
+        save_datasets(dataset, json_path)
+        json_datasets = load_datasets(
+            json_path / "metadata", json_path / "train", json_path / "test"
+        )
+
+        save_memmap_datasets(json_datasets, memmap_path)
+        memmap_datasets = load_datasets(
+            memmap_path / "metadata",
+            memmap_path / "train",
+            memmap_path / "test",
+        )
+
+        assert isinstance(memmap_datasets.train, MemmapDataset)
+        assert memmap_datasets.metadata == json_datasets.metadata
+        assert_same_entries(json_datasets.train, memmap_datasets.train)
+        assert_same_entries(json_datasets.test, memmap_datasets.test)
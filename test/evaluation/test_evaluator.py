@@ -589,6 +589,42 @@ def test_metrics_multivariate(
             )
 
 
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_streaming_multivariate_evaluation(chunk_size, tmp_path):
+    item_metrics_path = tmp_path / "item_metrics.csv"
+
+    def evaluate(**kwargs):
+        evaluator = MultivariateEvaluator(
+            quantiles=QUANTILES, target_agg_funcs={"sum": np.sum}, **kwargs
+        )
+        return calculate_metrics(
+            TIMESERIES_MULTIVARIATE[3].copy(),
+            evaluator,
+            pd.DataFrame,
+            forecaster=naive_multivariate_forecaster,
+        )
+
+    agg_metrics, item_metrics = evaluate()
+    streaming_agg_metrics, streaming_item_metrics = evaluate(
+        chunk_size=chunk_size,
+        streaming=True,
+        item_metrics_path=str(item_metrics_path),
+    )
+
+    assert streaming_item_metrics is None
+    assert streaming_agg_metrics.keys() == agg_metrics.keys()
+    for key, value in agg_metrics.items():
+        np.testing.assert_allclose(
+            streaming_agg_metrics[key], value, rtol=1e-12, err_msg=key
+        )
+
+    written_item_metrics = pd.read_csv(item_metrics_path)
+    pd.testing.assert_frame_equal(
+        written_item_metrics[item_metrics.columns],
+        item_metrics.reset_index(drop=True),
+    )
+
+
 def test_evaluation_with_QuantileForecast():
     start = "2012-01-01"
     target = [2.4, 1.0, 3.0, 4.4, 5.5, 4.9] * 10
@@ -611,6 +647,133 @@ def test_evaluation_with_QuantileForecast():
     assert np.isfinite(agg_metric["wQuantileLoss[0.5]"])
 
 
+def make_evaluation_data(num_series: int, prediction_length: int, freq: str):
+    np.random.seed(0)
+    ts_list, fcst_list = [], []
+    for i in range(num_series):
+        length = np.random.randint(prediction_length + 1, 60)
+        dtype = np.float32 if i % 2 else np.float64
+        values = np.random.normal(size=length).astype(dtype)
+        if i % 3 == 0:
+            values[np.random.random(length) < 0.3] = np.nan
+        if i == 4:
+            values[-prediction_length:] = np.nan
+        if i == 5:
+            values[:] = 0.0
+        index = pd.date_range("2019-01-01", periods=length, freq=freq)
+        ts = pd.Series(values, index=index)
+        if i % 4 == 1:
+            ts = ts.to_frame()
+
+        # some forecasts do not start at the end of the time series
+        offset = np.random.randint(0, 3)
+        start_date = index[length - prediction_length - offset]
+        if i == 7:
+            fcst = QuantileForecast(
+                start_date=start_date,
+                freq=freq,
+                forecast_arrays=np.random.normal(
+                    size=(len(QUANTILES), prediction_length)
+                ),
+                forecast_keys=QUANTILES,
+                item_id=str(i),
+            )
+        else:
+            fcst = SampleForecast(
+                samples=np.random.normal(size=(100, prediction_length)).astype(
+                    np.float32 if i % 5 else np.float64
+                ),
+                start_date=start_date,
+                freq=freq,
+                item_id=str(i),
+            )
+        ts_list.append(ts)
+        fcst_list.append(fcst)
+    return ts_list, fcst_list
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("freq", ["1H", "1D"])
+def test_chunked_evaluation(chunk_size, freq):
+    ts_list, fcst_list = make_evaluation_data(
+        num_series=20, prediction_length=7, freq=freq
+    )
+
+    agg_metrics, item_metrics = Evaluator(quantiles=QUANTILES)(
+        iter(ts_list), iter(fcst_list), num_series=len(ts_list)
+    )
+    chunked_agg_metrics, chunked_item_metrics = Evaluator(
+        quantiles=QUANTILES, chunk_size=chunk_size
+    )(iter(ts_list), iter(fcst_list), num_series=len(ts_list))
+
+    # the results must be identical, not only close
+    pd.testing.assert_frame_equal(
+        chunked_item_metrics, item_metrics, check_exact=True
+    )
+    assert chunked_agg_metrics.keys() == agg_metrics.keys()
+    for key, value in agg_metrics.items():
+        assert (
+            chunked_agg_metrics[key] == value
+            or np.isnan(value)
+            and np.isnan(chunked_agg_metrics[key])
+        ), key
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_parallel_evaluation(chunk_size):
+    ts_list, fcst_list = make_evaluation_data(
+        num_series=20, prediction_length=7, freq="1H"
+    )
+
+    agg_metrics, item_metrics = Evaluator(quantiles=QUANTILES)(
+        iter(ts_list), iter(fcst_list), num_series=len(ts_list)
+    )
+    parallel_agg_metrics, parallel_item_metrics = Evaluator(
+        quantiles=QUANTILES, chunk_size=chunk_size, num_workers=2
+    )(iter(ts_list), iter(fcst_list), num_series=len(ts_list))
+
+    pd.testing.assert_frame_equal(
+        parallel_item_metrics, item_metrics, check_exact=True
+    )
+    assert parallel_agg_metrics.keys() == agg_metrics.keys()
+    for key, value in agg_metrics.items():
+        assert (
+            parallel_agg_metrics[key] == value
+            or np.isnan(value)
+            and np.isnan(parallel_agg_metrics[key])
+        ), key
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_streaming_evaluation(chunk_size, tmp_path):
+    ts_list, fcst_list = make_evaluation_data(
+        num_series=20, prediction_length=7, freq="1D"
+    )
+    item_metrics_path = tmp_path / "item_metrics.csv"
+
+    agg_metrics, item_metrics = Evaluator(quantiles=QUANTILES)(
+        iter(ts_list), iter(fcst_list), num_series=len(ts_list)
+    )
+    streaming_agg_metrics, streaming_item_metrics = Evaluator(
+        quantiles=QUANTILES,
+        chunk_size=chunk_size,
+        streaming=True,
+        item_metrics_path=str(item_metrics_path),
+    )(iter(ts_list), iter(fcst_list), num_series=len(ts_list))
+
+    assert streaming_item_metrics is None
+    assert streaming_agg_metrics.keys() == agg_metrics.keys()
+    for key, value in agg_metrics.items():
+        np.testing.assert_allclose(
+            streaming_agg_metrics[key], value, rtol=1e-12, err_msg=key
+        )
+
+    written_item_metrics = pd.read_csv(item_metrics_path)
+    pd.testing.assert_frame_equal(
+        written_item_metrics[item_metrics.columns], item_metrics
+    )
+
+
 @pytest.mark.parametrize(
     "freq, expected_seasonality",
     [
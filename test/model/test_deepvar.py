@@ -11,9 +11,11 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-# First-party imports
+# Third-party imports
+import numpy as np
 import pytest
 
+# First-party imports
 from gluonts.dataset.artificial import constant_dataset
 from gluonts.distribution import (
     MultivariateGaussianOutput,
@@ -126,3 +128,21 @@ def test_deepvar(
     )
 
     assert agg_metrics["ND"] < 1.5
+
+
+def test_deepvar_dtype():
+    estimator = DeepVAREstimator(
+        num_cells=20,
+        num_layers=1,
+        target_dim=target_dim,
+        prediction_length=metadata.prediction_length,
+        freq=metadata.freq,
+        dtype=np.float64,
+    )
+
+    # the RNN, the embedding and the projection of the distribution
+    network = estimator.create_training_network()
+    assert all(
+        param.dtype == np.float64
+        for param in network.collect_params().values()
+    )
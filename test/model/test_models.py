@@ -16,6 +16,7 @@ import tempfile
 from pathlib import Path
 
 # Third-party imports
+import numpy as np
 import pytest
 from flaky import flaky
 
@@ -23,6 +24,7 @@ from flaky import flaky
 from gluonts import time_feature
 from gluonts.core.serde import load_code
 from gluonts.dataset.artificial import constant_dataset
+from gluonts.distribution import StudentTOutput
 from gluonts.evaluation.backtest import backtest_metrics
 from gluonts.model.deepar import DeepAREstimator
 from gluonts.model.deep_factor import DeepFactorEstimator
@@ -333,3 +335,19 @@ def test_serialize(Estimator, hyperparameters):
         predictor_exp = Predictor.deserialize(Path(temp_dir))
         # TODO: DeepFactorEstimator does not pass this assert
         assert predictor_act == predictor_exp
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_transformer_dtype(dtype):
+    Estimator, hyperparameters = transformer_estimator()
+    estimator = Estimator.from_hyperparameters(
+        freq=freq,
+        # not the default instance, whose dtype would be changed
+        distr_output=StudentTOutput(),
+        dtype=dtype,
+        **hyperparameters,
+    )
+    predictor = estimator.train(train_ds)
+    forecasts = list(predictor.predict(test_ds))
+    assert all(forecast.samples.dtype == dtype for forecast in forecasts)
+    assert len(forecasts) == len(list(test_ds))
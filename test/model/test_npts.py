@@ -23,6 +23,7 @@ import pytest
 from gluonts.core.exception import GluonTSDataError
 from gluonts.dataset.common import Dataset, ListDataset, DataEntry
 from gluonts.model.npts import KernelType, NPTSPredictor
+from gluonts.model.npts._model import NPTS
 from gluonts.model.npts._weighted_sampler import WeightedSampler
 
 
@@ -658,3 +659,186 @@ def test_weighted_sampler(frac_zero_weights: float) -> None:
         assert all(
             probs_ix[zeros_ix] == 0.0
         ), "Indices with sampling weight zero are sampled!"
+
+
+def test_weighted_sampler_rows() -> None:
+    """
+    Sampling the rows of a zero-padded weight matrix at once must give the
+    same indices as sampling each trimmed row in turn, including for the
+    rows whose weights are all zero.
+    """
+    row_lengths = np.array([5, 6, 7, 8])
+    weights = np.random.random((4, 8))
+    weights[np.arange(8)[np.newaxis, :] >= row_lengths[:, np.newaxis]] = 0.0
+    weights[[1, 3]] = 0.0
+
+    num_samples = 1000
+    np.random.seed(0)
+    samples_ix = WeightedSampler.sample_rows(
+        weights, num_samples, row_lengths=row_lengths
+    )
+
+    np.random.seed(0)
+    for row, length, row_samples_ix in zip(weights, row_lengths, samples_ix):
+        np.testing.assert_array_equal(
+            row_samples_ix, WeightedSampler.sample(row[:length], num_samples)
+        )
+        assert np.all(row_samples_ix < length)
+
+
+def _reference_weights(
+    train_features: np.ndarray,
+    pred_features: np.ndarray,
+    target_isnan_positions: np.ndarray,
+    kernel,
+    do_exp: bool,
+):
+    # computes the sampling weights one pair of time points at a time
+    train_length = train_features.shape[1]
+    for pred_t in range(pred_features.shape[1]):
+        sampling_weights = np.zeros(train_length + pred_t)
+        for train_t in range(train_length):
+            sampling_weights[train_t] = kernel(
+                train_features[:, train_t], pred_features[:, pred_t]
+            )
+        for t in range(pred_t):
+            sampling_weights[train_length + t] = kernel(
+                pred_features[:, t], pred_features[:, pred_t]
+            )
+        if do_exp:
+            sampling_weights -= max(sampling_weights)
+            sampling_weights = np.exp(sampling_weights)
+        sampling_weights[target_isnan_positions] = 0.0
+        if np.sum(sampling_weights) == 0:
+            sampling_weights[target_isnan_positions] = -1.0
+            sampling_weights += 1.0
+        yield sampling_weights
+
+
+@pytest.mark.parametrize(
+    "kernel_type, exp_kernel_weights",
+    [
+        (KernelType.exponential, 1.0),
+        (KernelType.exponential, [1.0, 0.5]),
+        (KernelType.uniform, 1.0),
+    ],
+)
+@pytest.mark.parametrize("nan_frac", [0.0, 0.9])
+def test_npts_vectorized_weights(
+    kernel_type: KernelType, exp_kernel_weights, nan_frac: float
+) -> None:
+    """
+    The vectorized computation of the sampling weights, and the sampling of
+    all the time steps at once, must give the same forecast as computing the
+    weights one pair of time points at a time and sampling each time step in
+    turn.
+    """
+    freq = "H"
+    prediction_length = 24
+    train_ts = get_test_data(history_length=200, freq=freq).astype(float)
+    train_ts[np.random.random(len(train_ts)) < nan_frac] = np.nan
+
+    predictor = NPTSPredictor(
+        prediction_length=prediction_length,
+        freq=freq,
+        kernel_type=kernel_type,
+        exp_kernel_weights=exp_kernel_weights,
+    )
+    train_features, pred_features = predictor._get_features(
+        train_ts.index, prediction_length
+    )
+    target_isnan_positions = np.argwhere(np.isnan(train_ts.values))
+    do_exp = kernel_type == KernelType.exponential
+
+    weight_rows = list(
+        NPTS.compute_weights(
+            train_features,
+            pred_features,
+            target_isnan_positions,
+            predictor.kernel,
+            do_exp,
+        )
+    )
+    reference_rows = list(
+        _reference_weights(
+            train_features,
+            pred_features,
+            target_isnan_positions,
+            predictor.kernel,
+            do_exp,
+        )
+    )
+    assert len(weight_rows) == len(reference_rows) == prediction_length
+    for row, reference_row in zip(weight_rows, reference_rows):
+        np.testing.assert_array_equal(row, reference_row)
+
+    num_samples = 50
+    np.random.seed(0)
+    forecast = predictor.predict_time_series(train_ts, num_samples)
+
+    np.random.seed(0)
+    samples = np.tile(
+        np.concatenate((train_ts.values, np.zeros(prediction_length))),
+        (num_samples, 1),
+    )
+    for t, sampling_weights in enumerate(reference_rows):
+        samples_ix = WeightedSampler.sample(sampling_weights, num_samples)
+        samples[:, len(train_ts) + t] = samples[
+            np.arange(num_samples), samples_ix
+        ]
+
+    np.testing.assert_array_equal(
+        forecast.samples, samples[:, len(train_ts) :]
+    )
+
+
+@pytest.mark.parametrize(
+    "kernel_type", [KernelType.exponential, KernelType.uniform]
+)
+@pytest.mark.parametrize("batch_size", [1, 3, 100])
+def test_npts_batch_prediction(
+    kernel_type: KernelType, batch_size: int
+) -> None:
+    """
+    Predicting a dataset in batches, where time series with the same index
+    share their sampling weights, must give the same forecasts as predicting
+    each time series in turn.
+    """
+    freq = "D"
+    prediction_length = 7
+    start = "2011-01-01"
+    targets = [np.random.random(50) for _ in range(5)]
+    targets[1][np.random.random(50) < 0.5] = np.nan
+    targets += [np.random.random(30), np.random.random(60)]
+    data = [{"start": start, "target": target} for target in targets]
+    data.append(
+        {
+            "start": start,
+            "target": np.random.random(50),
+            "feat_dynamic_real": [np.arange(50 + prediction_length)],
+        }
+    )
+
+    predictor = NPTSPredictor(
+        prediction_length=prediction_length,
+        context_length=40,
+        freq=freq,
+        kernel_type=kernel_type,
+        batch_size=batch_size,
+    )
+    dataset = ListDataset(data, freq=freq)
+
+    np.random.seed(0)
+    forecasts = list(predictor.predict(dataset, num_samples=20))
+
+    np.random.seed(0)
+    expected_forecasts = [
+        predictor.predict_time_series(ts, 20, custom_features)
+        for ts, custom_features in map(predictor._get_inputs, dataset)
+    ]
+
+    assert len(forecasts) == len(expected_forecasts)
+    for forecast, expected in zip(forecasts, expected_forecasts):
+        assert forecast.start_date == expected.start_date
+        assert forecast.freq == expected.freq
+        np.testing.assert_array_equal(forecast.samples, expected.samples)
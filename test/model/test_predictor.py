@@ -13,6 +13,7 @@
 
 # Third-party imports
 import numpy as np
+import pytest
 
 # First-party imports
 from gluonts.dataset.common import ListDataset
@@ -22,7 +23,8 @@ from gluonts.model.trivial.identity import IdentityPredictor
 from gluonts.model.trivial.mean import MeanEstimator
 
 
-def test_parallelized_predictor():
+@pytest.mark.parametrize("shared_memory_size", [None, 2 ** 16, 2 ** 24])
+def test_parallelized_predictor(shared_memory_size):
     dataset = ListDataset(
         data_iter=[
             {"start": "2012-01-01", "target": (np.zeros(20) + i).tolist()}
@@ -36,7 +38,10 @@ def test_parallelized_predictor():
     )
 
     predictor = ParallelizedPredictor(
-        base_predictor=base_predictor, num_workers=10, chunk_size=2
+        base_predictor=base_predictor,
+        num_workers=10,
+        chunk_size=2,
+        shared_memory_size=shared_memory_size,
     )
 
     predictions = list(base_predictor.predict(dataset))
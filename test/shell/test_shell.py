@@ -12,23 +12,58 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import asyncio
+import base64
 import json
+import multiprocessing as mp
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import ContextManager
 import sys
 
 # Third-party imports
 import numpy as np
+import pandas as pd
 import pytest
 
 # First-party imports
 from gluonts.core.component import equals
+from gluonts.model.forecast import Config as ForecastConfig, SampleForecast
+from gluonts.model.predictor import GluonPredictor
 from gluonts.model.trivial.mean import MeanPredictor
 from gluonts.shell.sagemaker import ServeEnv, TrainEnv
 from gluonts.shell.train import run_train_and_test
 
 try:
-    from gluonts.shell.serve import Settings
-    from gluonts.shell.serve.util import jsonify_floats
+    from gluonts.shell.serve import Settings, make_predictor_factory, warm_up
+    from gluonts.shell.serve.admission import (
+        AdmissionController,
+        Overloaded,
+        request_cost,
+    )
+    from gluonts.shell.serve.app import (
+        handle_batch_predictions,
+        handle_predictions,
+        make_app,
+        parse_instances,
+    )
+    from gluonts.shell.serve.batching import RequestBatcher
+    from gluonts.shell.serve.cache import (
+        LRUCache,
+        ResultCache,
+        configuration_key,
+    )
+    from gluonts.shell.serve.metrics import (
+        Histogram,
+        ServiceMetrics,
+        predict_with_metrics,
+    )
+    from gluonts.shell.serve.models import ModelRegistry, UnknownModel
+    from gluonts.shell.serve.util import (
+        encode_array,
+        encode_forecast,
+        jsonify_floats,
+    )
     from gluonts.testutil import shell as testutil
 except ImportError:
     if sys.platform != "win32":
@@ -79,6 +114,33 @@ def dynamic_server(
         yield server
 
 
+@pytest.fixture(scope="function")  # type: ignore
+def async_static_server(
+    train_env: TrainEnv,
+) -> ContextManager["testutil.ServerFacade"]:
+    predictor = MeanPredictor.from_hyperparameters(**train_env.hyperparameters)
+    predictor.serialize(train_env.path.model)
+
+    serve_env = ServeEnv(train_env.path.base)
+    settings = Settings(sagemaker_server_port=testutil.free_port())
+    with testutil.temporary_server(
+        serve_env, None, settings, backend="async"
+    ) as server:
+        yield server
+
+
+@pytest.fixture(scope="function")  # type: ignore
+def async_dynamic_server(
+    train_env: TrainEnv,
+) -> ContextManager["testutil.ServerFacade"]:
+    serve_env = ServeEnv(train_env.path.base)
+    settings = Settings(sagemaker_server_port=testutil.free_port())
+    with testutil.temporary_server(
+        serve_env, MeanPredictor, settings, backend="async"
+    ) as server:
+        yield server
+
+
 @pytest.fixture
 def batch_transform(monkeypatch, train_env):
     monkeypatch.setenv("SAGEMAKER_BATCH", "true")
@@ -152,6 +214,48 @@ def test_server_shell(
         assert equals(exp_mean, act_mean)
         assert equals(exp_samples, act_samples)
 
+    assert_request_metrics(static_server.metrics())
+
+
+def test_async_server_shell(
+    train_env: TrainEnv, async_static_server: "testutil.ServerFacade"
+) -> None:
+    execution_parameters = async_static_server.execution_parameters()
+
+    assert execution_parameters["BatchStrategy"] == "SINGLE_RECORD"
+    assert execution_parameters["MaxPayloadInMB"] == 6
+
+    configuration = {
+        "num_samples": 1,
+        "output_types": ["mean", "samples"],
+        "quantiles": [],
+    }
+
+    for entry in train_env.datasets["train"]:
+        forecast = async_static_server.invocations([entry], configuration)[0]
+
+        exp_mean = np.mean(entry["target"]) * np.ones(
+            shape=(prediction_length,)
+        )
+        assert np.array(forecast["samples"]).shape == (
+            num_samples,
+            prediction_length,
+        )
+        assert equals(exp_mean, np.array(forecast["mean"]))
+
+    assert_request_metrics(async_static_server.metrics())
+
+
+def assert_request_metrics(metrics: str) -> None:
+    lines = dict(line.rsplit(" ", 1) for line in metrics.splitlines())
+    num_requests = int(lines["gluonts_request_duration_seconds_count"])
+    assert num_requests > 0
+    for stage in ["parse", "process", "forecast", "serialize"]:
+        count = int(
+            lines[f'gluonts_stage_duration_seconds_count{{stage="{stage}"}}']
+        )
+        assert count >= num_requests
+
 
 def test_dynamic_shell(
     train_env: TrainEnv, dynamic_server: "testutil.ServerFacade", caplog
@@ -194,6 +298,8 @@ def test_dynamic_shell(
         assert equals(exp_mean, act_mean)
         assert equals(exp_samples, act_samples)
 
+    assert "predictor_cache" in dynamic_server.stats()
+
 
 def test_dynamic_batch_shell(
     batch_transform,
@@ -233,6 +339,66 @@ def test_dynamic_batch_shell(
         assert equals(exp_samples, act_samples)
 
 
+def test_warm_up(train_env: TrainEnv) -> None:
+    from gluonts.model.simple_feedforward import SimpleFeedForwardEstimator
+    from gluonts.trainer import Trainer
+
+    estimator = SimpleFeedForwardEstimator(
+        freq=train_env.hyperparameters["freq"],
+        prediction_length=prediction_length,
+        context_length=context_length,
+        trainer=Trainer(epochs=1, num_batches_per_epoch=1, hybridize=False),
+    )
+    predictor = estimator.train(train_env.datasets["train"])
+
+    assert warm_up(predictor)
+    assert warm_up(
+        MeanPredictor.from_hyperparameters(**train_env.hyperparameters)
+    )
+
+
+def test_async_batch_shell(
+    batch_transform,
+    train_env: TrainEnv,
+    async_dynamic_server: "testutil.ServerFacade",
+) -> None:
+    entries = list(train_env.datasets["train"])
+    forecasts = async_dynamic_server.batch_invocations(entries)
+
+    for entry, forecast in zip(entries, forecasts):
+        exp_mean = np.mean(entry["target"]) * np.ones(
+            shape=(prediction_length,)
+        )
+        assert equals(exp_mean, np.array(forecast["mean"]))
+
+
+def test_batch_predictions_are_streamed(train_env: TrainEnv) -> None:
+    predictor = MeanPredictor.from_hyperparameters(**train_env.hyperparameters)
+    configuration = ForecastConfig(output_types=["mean"], quantiles=[])
+
+    num_parsed = 0
+
+    def lines():
+        nonlocal num_parsed
+        for entry in train_env.datasets["train"]:
+            num_parsed += 1
+            yield json.dumps(
+                {"start": str(entry["start"]), "target": [1.0, 2.0, 3.0]}
+            )
+
+    response = handle_batch_predictions(
+        predictor, parse_instances(lines()), configuration
+    )
+
+    first_line = next(response)
+    assert len(json.loads(first_line)["mean"]) == prediction_length
+    assert num_parsed == 1
+
+    other_lines = list(response)
+    assert all(line.startswith("\n") for line in other_lines)
+    assert num_parsed == len(other_lines) + 1
+
+
 def test_as_json_dict_outputs_valid_json():
     non_compliant_json = {
         "a": float("nan"),
@@ -251,3 +417,567 @@ def test_as_json_dict_outputs_valid_json():
 
     output_json = jsonify_floats(non_compliant_json)
     json.dumps(output_json, allow_nan=False)
+
+
+class CountingPredictor:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, dataset, num_samples=None):
+        entries = list(dataset)
+        self.batches.append(entries)
+        yield from (entry["target"] for entry in entries)
+
+
+@pytest.mark.parametrize(
+    "max_batch_size, batch_sizes", [(8, [8]), (3, [2, 3, 3]), (1, [1] * 8)]
+)
+def test_request_batcher(max_batch_size, batch_sizes):
+    predictor = CountingPredictor()
+    batcher = RequestBatcher(max_delay=1.0, max_batch_size=max_batch_size)
+    results = {}
+
+    def request(i):
+        results[i] = batcher.predict(predictor, [{"target": i}], num_samples=1)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # each request gets its own forecast back
+    assert results == {i: [i] for i in range(8)}
+    assert sorted(map(len, predictor.batches)) == batch_sizes
+
+
+def test_lru_cache(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+
+    cache = LRUCache(max_size=2, ttl=10)
+    assert cache.get_or_create("a", lambda: 1) == 1
+    assert cache.get_or_create("a", lambda: 2) == 1
+    assert cache.get_or_create("b", lambda: 3) == 3
+    # "a" is used more recently than "b", which is evicted
+    assert cache.get_or_create("a", lambda: 4) == 1
+    assert cache.get_or_create("c", lambda: 5) == 5
+    assert cache.get_or_create("b", lambda: 6) == 6
+    assert cache.stats() == {"size": 2, "hits": 2, "misses": 4}
+
+    now[0] = 10.0
+    assert cache.get_or_create("b", lambda: 7) == 7
+
+
+def test_configuration_key():
+    assert configuration_key({"a": 1, "b": [1, 2]}) == configuration_key(
+        {"b": [1, 2], "a": 1}
+    )
+    assert configuration_key({"a": 1}) != configuration_key({"a": 2})
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.array(1.5),
+        np.arange(5),
+        np.random.normal(size=(3, 4)).astype(np.float32),
+        np.random.normal(size=(2, 3, 4)),
+        np.array([[1.0, np.nan], [np.inf, -np.inf]]),
+        np.empty((0,)),
+        np.empty((2, 0)),
+    ],
+)
+def test_encode_array(array):
+    assert encode_array(array) == json.dumps(
+        jsonify_floats(array.tolist()), separators=(",", ":")
+    )
+
+    encoded = json.loads(encode_array(array, "base64"))
+    decoded = np.frombuffer(
+        base64.b64decode(encoded["data"]), dtype="<f4"
+    ).reshape(encoded["shape"])
+    np.testing.assert_array_equal(decoded, array.astype(np.float32))
+
+
+def test_encode_forecast():
+    forecast = SampleForecast(
+        samples=np.random.normal(size=(100, prediction_length)),
+        start_date=pd.Timestamp("2020-01-01", freq="D"),
+        freq="D",
+    )
+    forecast.samples[0, 0] = np.nan
+    config = ForecastConfig(output_types=["mean", "quantiles", "samples"])
+
+    assert json.loads(
+        encode_forecast(forecast, config, extra={"debug": {"timing": 1.0}})
+    ) == {
+        **jsonify_floats(forecast.as_json_dict(config)),
+        "debug": {"timing": 1.0},
+    }
+
+
+def test_histogram():
+    histogram = Histogram(buckets=[0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.to_prometheus("latency", 'stage="a",') == [
+        'latency_bucket{stage="a",le="0.1"} 2',
+        'latency_bucket{stage="a",le="1.0"} 3',
+        'latency_bucket{stage="a",le="+Inf"} 4',
+        'latency_sum{stage="a"} 2.65',
+        'latency_count{stage="a"} 4',
+    ]
+
+
+def test_nested_stage_timers(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("time.perf_counter", lambda: now[0])
+    metrics = ServiceMetrics()
+
+    def instances():
+        now[0] += 1.0
+        yield {}
+
+    with metrics.timer("forecast"):
+        now[0] += 2.0
+        list(metrics.time_iterator("parse", instances()))
+        now[0] += 4.0
+
+    # the time of the stages nested in a stage is not counted in its time
+    assert metrics.stages["forecast"].sum == 6.0
+    assert metrics.stages["parse"].sum == 1.0
+    assert metrics.stages["parse"].count == 2
+
+
+def test_predict_with_metrics_hooks():
+    # the stages are timed through the hooks of the predictor's own predict
+    class DoublingPredictor(GluonPredictor):
+        def predict(
+            self,
+            dataset,
+            num_samples=None,
+            wrap_data_loader=None,
+            wrap_prediction_net=None,
+        ):
+            prediction_net = wrap_prediction_net(self.prediction_net)
+            for entry in wrap_data_loader(dataset):
+                yield prediction_net(entry["target"])
+
+    predictor = DoublingPredictor(
+        input_names=["target"],
+        prediction_net=lambda target: 2 * target,
+        batch_size=1,
+        prediction_length=3,
+        freq="D",
+        ctx=None,
+        input_transform=None,
+    )
+    metrics = ServiceMetrics()
+    dataset = [{"target": np.arange(3)}, {"target": np.ones(3)}]
+
+    outputs = list(predict_with_metrics(predictor, dataset, None, metrics))
+
+    assert len(outputs) == 2
+    assert np.array_equal(outputs[0], 2 * np.arange(3))
+    assert np.array_equal(outputs[1], 2 * np.ones(3))
+    assert metrics.stages["forward"].count == 2
+    for stage in ["transform", "forecast"]:
+        assert metrics.stages[stage].count >= 2
+
+
+def test_admission_controller():
+    admission = AdmissionController(max_items=10, retry_after=5)
+
+    with admission.admit(6):
+        with pytest.raises(Overloaded) as error:
+            with admission.admit(5):
+                pass
+        assert error.value.retry_after == 5
+        with admission.admit(4):
+            assert admission.load()["InFlightItems"] == 10
+
+    # a request larger than the budget is admitted when it is alone
+    with admission.admit(20):
+        pass
+
+    assert admission.load() == {
+        "InFlightItems": 0,
+        "InFlightRequests": 0,
+        "MaxInFlightItems": 10,
+        "RejectedRequests": 1,
+    }
+
+
+def test_overloaded_server():
+    predictor = MeanPredictor(
+        freq="1H",
+        prediction_length=prediction_length,
+        num_samples=num_samples,
+        context_length=context_length,
+    )
+    admission = AdmissionController(
+        max_items=request_cost(1, prediction_length, num_samples),
+        retry_after=3,
+    )
+    app = make_app(
+        lambda request: predictor,
+        {"BatchStrategy": "SINGLE_RECORD"},
+        batch_transform_config=None,
+        admission=admission,
+    )
+    data = {
+        "instances": [{"start": "2000-01-01 00:00:00", "target": [1.0] * 10}],
+        "configuration": {"num_samples": num_samples},
+    }
+
+    with app.test_client() as client:
+        assert client.post("/invocations", json=data).status_code == 200
+
+        with admission.admit(1):
+            response = client.post("/invocations", json=data)
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "3"
+
+            execution_parameters = client.get("/execution-parameters").json
+            assert execution_parameters["BatchStrategy"] == "SINGLE_RECORD"
+            assert execution_parameters["InFlightItems"] == 1
+            assert execution_parameters["RejectedRequests"] == 1
+
+
+def test_admission_controller_shared_by_processes():
+    admission = AdmissionController(max_items=10)
+
+    def admit_in_worker():
+        try:
+            with admission.admit(5):
+                pass
+        except Overloaded:
+            sys.exit(1)
+
+    def run_worker() -> int:
+        worker = mp.get_context("fork").Process(target=admit_in_worker)
+        worker.start()
+        worker.join()
+        return worker.exitcode
+
+    # the budget used by this process is seen by the forked workers, and
+    # the other way around
+    with admission.admit(6):
+        assert run_worker() == 1
+    assert run_worker() == 0
+    assert admission.load()["RejectedRequests"] == 1
+
+
+class BlockingPredictor:
+    """
+    Predictor waiting for `finish` before predicting, after setting `started`.
+    """
+
+    def __init__(self) -> None:
+        self.predictor = MeanPredictor(
+            freq="1H",
+            prediction_length=prediction_length,
+            num_samples=num_samples,
+            context_length=context_length,
+        )
+        self.freq = self.predictor.freq
+        self.prediction_length = self.predictor.prediction_length
+        self.started = threading.Event()
+        self.finish = threading.Event()
+
+    def predict(self, dataset, num_samples=None):
+        self.started.set()
+        self.finish.wait(10)
+        yield from self.predictor.predict(dataset, num_samples=num_samples)
+
+
+def overload_data() -> dict:
+    return {
+        "instances": [{"start": "2000-01-01 00:00:00", "target": [1.0] * 10}],
+        "configuration": {"num_samples": num_samples},
+    }
+
+
+def test_overloaded_server_concurrent_requests():
+    predictor = BlockingPredictor()
+    admission = AdmissionController(
+        max_items=request_cost(1, prediction_length, num_samples)
+    )
+    app = make_app(
+        lambda request: predictor,
+        {},
+        batch_transform_config=None,
+        admission=admission,
+    )
+    status_codes = []
+
+    def post() -> None:
+        with app.test_client() as client:
+            response = client.post("/invocations", json=overload_data())
+            status_codes.append(response.status_code)
+
+    thread = threading.Thread(target=post)
+    thread.start()
+    try:
+        assert predictor.started.wait(10)
+        with app.test_client() as client:
+            response = client.post("/invocations", json=overload_data())
+            assert response.status_code == 503
+    finally:
+        predictor.finish.set()
+        thread.join()
+
+    assert status_codes == [200]
+
+
+def test_async_overloaded_server_queued_requests():
+    pytest.importorskip("aiohttp")
+    from aiohttp.test_utils import TestClient, TestServer
+    from gluonts.shell.serve.async_app import make_app as make_async_app
+
+    predictor = BlockingPredictor()
+    admission = AdmissionController(
+        max_items=request_cost(1, prediction_length, num_samples)
+    )
+
+    async def run() -> None:
+        # with a single thread, the second request would wait for the
+        # first one in the pool, instead of being rejected right away
+        app = make_async_app(
+            lambda request: predictor,
+            {},
+            batch_transform_config=None,
+            max_workers=1,
+            max_content_length=2 ** 20,
+            admission=admission,
+        )
+        async with TestClient(TestServer(app)) as client:
+            first = asyncio.ensure_future(
+                client.post("/invocations", json=overload_data())
+            )
+            loop = asyncio.get_event_loop()
+            assert await loop.run_in_executor(None, predictor.started.wait, 10)
+            second = await client.post("/invocations", json=overload_data())
+            assert second.status == 503
+            predictor.finish.set()
+            assert (await first).status == 200
+
+    try:
+        asyncio.run(run())
+    finally:
+        predictor.finish.set()
+
+    assert admission.load()["InFlightRequests"] == 0
+
+
+def test_async_admission_released_on_submission_error():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+    from gluonts.shell.serve.async_app import inference_invocations
+
+    predictor = BlockingPredictor()
+    admission = AdmissionController(
+        max_items=request_cost(1, prediction_length, num_samples)
+    )
+    # submitting a prediction to a shut down executor fails
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    async def run() -> None:
+        app = web.Application()
+        app.router.add_post(
+            "/invocations",
+            inference_invocations(
+                lambda request: predictor, executor, admission=admission
+            ),
+        )
+        async with TestClient(TestServer(app)) as client:
+            response = await client.post("/invocations", json=overload_data())
+            assert response.status == 500
+
+    asyncio.run(run())
+
+    assert admission.load()["InFlightRequests"] == 0
+    assert admission.load()["InFlightItems"] == 0
+
+
+def test_result_cache(tmp_path):
+    cache = ResultCache(max_bytes=6, path=tmp_path)
+    cache.put("a", "aaa")
+    cache.put("b", "bbb")
+    assert cache.get("a") == "aaa"
+    # "b" is evicted from memory, but is still on disk
+    cache.put("c", "ccc")
+    assert len(cache) == 2
+    assert cache.get("b") == "bbb"
+    assert cache.get("d") is None
+    assert cache.stats() == {
+        "size": 2,
+        "bytes": 6,
+        "hits": 1,
+        "disk_hits": 1,
+        "misses": 1,
+    }
+
+    # the disk tier is shared with other caches
+    assert ResultCache(max_bytes=6, path=tmp_path).get("a") == "aaa"
+
+
+def test_cached_predictions():
+    predictor = MeanPredictor(
+        freq="1H",
+        prediction_length=prediction_length,
+        num_samples=num_samples,
+        context_length=context_length,
+    )
+    cache = ResultCache(max_bytes=1024 * 1024, seed=0)
+    configuration = ForecastConfig(num_samples=num_samples)
+    instances = [
+        {"start": "2000-01-01 00:00:00", "target": [float(i)] * 10}
+        for i in range(3)
+    ]
+
+    expected = handle_predictions(predictor, instances, configuration)
+    assert (
+        handle_predictions(
+            predictor, instances[:2], configuration, result_cache=cache
+        )
+        == expected[:2]
+    )
+    assert (
+        handle_predictions(
+            predictor, instances, configuration, result_cache=cache
+        )
+        == expected
+    )
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+    # the key depends on the configuration
+    assert cache.key(instances[0], configuration) != cache.key(
+        instances[0], ForecastConfig(num_samples=1)
+    )
+
+    with cache.random_state("a"):
+        first = np.random.rand()
+    with cache.random_state("a"):
+        assert np.random.rand() == first
+    with cache.random_state("b"):
+        assert np.random.rand() != first
+
+
+class SamplingPredictor:
+    freq = "1H"
+    prediction_length = prediction_length
+
+    def predict(self, dataset, num_samples=None):
+        for entry in dataset:
+            yield SampleForecast(
+                samples=np.random.rand(num_samples, prediction_length),
+                start_date=pd.Timestamp("2000-01-01 10:00:00", freq="1H"),
+                freq="1H",
+            )
+
+
+def test_seeded_cached_predictions():
+    predictor = SamplingPredictor()
+    configuration = ForecastConfig(
+        num_samples=num_samples, output_types=["samples"]
+    )
+    instances = [
+        {"start": "2000-01-01 00:00:00", "target": [float(i)] * 10}
+        for i in range(3)
+    ]
+
+    # the forecast of a time series does not depend on the other time
+    # series predicted with it
+    alone = handle_predictions(
+        predictor,
+        instances[2:],
+        configuration,
+        result_cache=ResultCache(max_bytes=1024 * 1024, seed=0),
+    )
+    together = handle_predictions(
+        predictor,
+        instances,
+        configuration,
+        result_cache=ResultCache(max_bytes=1024 * 1024, seed=0),
+    )
+    assert together[2] == alone[0]
+    assert together[0] != together[1]
+
+
+def test_model_registry(tmp_path):
+    for name, size in [("a", 4), ("b", 4), ("c", 8)]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "model").write_bytes(b"0" * size)
+
+    loaded = []
+
+    def load(path):
+        loaded.append(path.name)
+        return path.name
+
+    metrics = ServiceMetrics()
+    registry = ModelRegistry(tmp_path, max_bytes=8, metrics=metrics, load=load)
+    assert registry.model_names() == ["a", "b", "c"]
+
+    assert [registry.get(name) for name in "abab"] == list("abab")
+    # "a" and "b" are evicted to make room for "c"
+    assert registry.get("c") == "c"
+    assert registry.get("a") == "a"
+    assert loaded == ["a", "b", "c", "a"]
+    assert metrics.stages["load"].count == 4
+
+    stats = registry.stats()
+    assert stats["size"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["evictions"] == 3
+
+    for name in ["d", "..", "", "a/../b"]:
+        with pytest.raises(UnknownModel):
+            registry.get(name)
+
+
+def test_multi_model_server(tmp_path):
+    for name, prediction_length in [("short", 2), ("long", 4)]:
+        (tmp_path / name).mkdir()
+        MeanPredictor(
+            freq="1H",
+            prediction_length=prediction_length,
+            num_samples=num_samples,
+            context_length=context_length,
+        ).serialize(tmp_path / name)
+
+    registry = ModelRegistry(tmp_path, max_bytes=1024 * 1024)
+    app = make_app(
+        make_predictor_factory(
+            None, None, Settings(), model_registry=registry
+        ),
+        {},
+        batch_transform_config=None,
+    )
+    instance = {"start": "2000-01-01 00:00:00", "target": [1.0] * 10}
+
+    with app.test_client() as client:
+        for name, prediction_length in [("short", 2), ("long", 4)]:
+            response = client.post(
+                "/invocations",
+                json={
+                    "instances": [instance],
+                    "configuration": {"model": name},
+                },
+            )
+            assert response.status_code == 200
+            forecast = response.json["predictions"][0]
+            assert len(forecast["mean"]) == prediction_length
+
+        response = client.post(
+            "/invocations",
+            json={"instances": [instance], "configuration": {"model": "x"}},
+        )
+        assert response.status_code == 404
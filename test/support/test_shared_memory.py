@@ -0,0 +1,60 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Standard library imports
+import multiprocessing as mp
+
+# Third-party imports
+import numpy as np
+
+# First-party imports
+from gluonts.support.shared_memory import ArrayRingBuffer
+
+
+def make_message(i: int):
+    target = np.arange(10 * i, dtype=np.float32).reshape(2, -1)
+    return [{"target": target, "item_id": str(i)}, (target, i)]
+
+
+def send_messages(ring: ArrayRingBuffer, queue: mp.Queue, n: int) -> None:
+    for i in range(n):
+        queue.put(ring.pack(make_message(i)))
+    queue.put(ring.pack({"large": np.zeros(1000)}))
+
+
+def test_array_ring_buffer() -> None:
+    ring = ArrayRingBuffer(slot_size=1024, num_slots=2)
+    queue: mp.Queue = mp.Queue()
+
+    process = mp.Process(target=send_messages, args=(ring, queue, 10))
+    process.start()
+
+    for i in range(10):
+        message = queue.get()
+        # small messages go through the shared memory
+        assert message[0] is not None
+
+        entry, (target, j) = ring.unpack(message)
+        expected = make_message(i)[0]["target"]
+
+        assert entry["item_id"] == str(i) and j == i
+        assert entry["target"].dtype == np.float32
+        assert np.array_equal(entry["target"], expected)
+        assert target is entry["target"]
+
+    # messages larger than a slot are pickled
+    message = queue.get()
+    assert message[0] is None
+    assert np.array_equal(ring.unpack(message)["large"], np.zeros(1000))
+
+    process.join()
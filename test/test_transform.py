@@ -247,6 +247,68 @@ def test_InstanceSplitter(
     # assert np.alltrue(out['age'] == np.log10(2.0 + np.arange(expected_length)))
 
 
+@pytest.mark.parametrize("output_NTC", [True, False])
+@pytest.mark.parametrize(
+    "pick_incomplete", TEST_VALUES["allow_target_padding"]
+)
+@pytest.mark.parametrize("is_train", TEST_VALUES["is_train"])
+@pytest.mark.parametrize("target_dim", [None, 3])
+def test_InstanceSplitter_split_batch(
+    target_dim, is_train: bool, pick_incomplete: bool, output_NTC: bool
+):
+    train_length = 40
+    pred_length = 13
+    t = transform.InstanceSplitter(
+        target_field=FieldName.TARGET,
+        is_pad_field=FieldName.IS_PAD,
+        start_field=FieldName.START,
+        forecast_start_field=FieldName.FORECAST_START,
+        train_sampler=transform.UniformSplitSampler(p=1.0),
+        past_length=train_length,
+        future_length=pred_length,
+        output_NTC=output_NTC,
+        time_series_fields=["some_time_feature", "some_int_feature"],
+        pick_incomplete=pick_incomplete,
+    )
+
+    lengths = [20, 45, 60] if pick_incomplete else [45, 60]
+    dataset = [
+        {
+            "start": TEST_VALUES["start"][0],
+            "target": np.random.rand(length)
+            if target_dim is None
+            else np.random.rand(target_dim, length),
+            "some_time_feature": np.random.rand(
+                2, length + pred_length
+            ).astype(np.float32),
+            "some_int_feature": np.arange(length + pred_length),
+            "feat_static_cat": np.array([k]),
+            "some_other_col": "ABC",
+        }
+        for k, length in enumerate(lengths)
+    ]
+
+    expected = list(t(iter(dataset), is_train=is_train))
+    instances = list(t.sample_instances(iter(dataset), is_train=is_train))
+    assert len(instances) == len(expected)
+
+    # the instances of a batch can come from any entries, in any order
+    perm = np.random.permutation(len(instances))
+    batch = t.split_batch(
+        [instances[k][0] for k in perm], [instances[k][1] for k in perm]
+    )
+
+    assert batch.keys() == expected[0].keys()
+    for key, value in batch.items():
+        expected_value = [expected[k][key] for k in perm]
+        if isinstance(value, np.ndarray):
+            expected_value = np.asarray(expected_value)
+            assert value.dtype == expected_value.dtype
+            assert np.array_equal(value, expected_value)
+        else:
+            assert value == expected_value
+
+
 @pytest.mark.parametrize("is_train", TEST_VALUES["is_train"])
 @pytest.mark.parametrize("target", TEST_VALUES["target"])
 @pytest.mark.parametrize("start", TEST_VALUES["start"])
@@ -367,6 +429,95 @@ def test_Transformation():
         print(u)
 
 
+def make_cacheable_chain(pred_length: int) -> transform.Chain:
+    return transform.Chain(
+        trans=[
+            transform.AsNumpyArray(field=FieldName.TARGET, expected_ndim=1),
+            transform.AddObservedValuesIndicator(
+                target_field=FieldName.TARGET, output_field="observed_values"
+            ),
+            transform.AddTimeFeatures(
+                start_field=FieldName.START,
+                target_field=FieldName.TARGET,
+                output_field="time_feat",
+                time_features=[time_feature.DayOfWeek()],
+                pred_length=pred_length,
+            ),
+            transform.InstanceSplitter(
+                target_field=FieldName.TARGET,
+                is_pad_field=FieldName.IS_PAD,
+                start_field=FieldName.START,
+                forecast_start_field=FieldName.FORECAST_START,
+                train_sampler=transform.ExpectedNumInstanceSampler(
+                    num_instances=4
+                ),
+                past_length=10,
+                future_length=pred_length,
+                time_series_fields=["time_feat", "observed_values"],
+            ),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "max_cache_bytes, use_spill_dir",
+    [(None, False), (0, False), (1000, False), (0, True), (1000, True)],
+)
+def test_CachedTransformedDataset(
+    max_cache_bytes, use_spill_dir, tmp_path
+) -> None:
+    def make_dataset():
+        return ListDataset(
+            [
+                {
+                    "start": "2012-01-01",
+                    "target": [np.nan] + [float(i)] * (20 + i),
+                }
+                for i in range(10)
+            ],
+            freq="1D",
+        )
+
+    # the chains are not shared, as the instance sampler is stateful
+    ds = make_dataset()
+    chain = make_cacheable_chain(pred_length=5)
+    cached_ds = transform.CachedTransformedDataset(
+        make_dataset(),
+        make_cacheable_chain(pred_length=5).transformations,
+        max_cache_bytes=max_cache_bytes,
+        spill_dir=str(tmp_path) if use_spill_dir else None,
+    )
+
+    # only the InstanceSplitter is applied at every iteration
+    assert len(cached_ds.cached_transformations.transformations) == 3
+    assert len(cached_ds.live_transformations.transformations) == 1
+
+    for _ in range(3):
+        np.random.seed(0)
+        expected = list(chain(iter(ds), is_train=True))
+        np.random.seed(0)
+        # not list(cached_ds), which would count the elements first
+        actual = [data for data in cached_ds]
+
+        assert len(actual) == len(expected)
+        for exp, act in zip(expected, actual):
+            assert exp.keys() == act.keys()
+            for name in exp:
+                if isinstance(exp[name], np.ndarray):
+                    assert np.array_equal(exp[name], act[name])
+                else:
+                    assert exp[name] == act[name]
+
+        # in-place changes do not affect the cache
+        for entry in actual:
+            entry["past_observed_values"][...] = -1
+
+    assert len(cached_ds) == len(expected)
+    assert cached_ds._is_complete() == (
+        max_cache_bytes is None or use_spill_dir
+    )
+
+
 @pytest.mark.parametrize("is_train", TEST_VALUES["is_train"])
 def test_multi_dim_transformation(is_train):
     train_length = 10
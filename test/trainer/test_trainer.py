@@ -15,10 +15,19 @@
 from typing import Any, List
 
 # Third-party imports
+import mxnet as mx
+import numpy as np
 import pytest
 
 # First-party imports
+from gluonts.dataset.artificial import constant_dataset
+from gluonts.model.simple_feedforward import SimpleFeedForwardEstimator
 from gluonts.trainer import Trainer
+from gluonts.trainer._base import ParameterSnapshot
+from gluonts.trainer.loss_scaling import (
+    DynamicLossScaler,
+    reset_master_weights,
+)
 
 
 def test_epochs() -> None:
@@ -64,6 +73,194 @@ def test_learning_rate_decay_factor() -> None:
     )
 
 
+def test_loss_sync_interval() -> None:
+    assert_valid_param(param_name="loss_sync_interval", param_values=[1, 10])
+    assert_invalid_param(
+        param_name="loss_sync_interval",
+        param_values=[-1, 0],
+        exp_msg="The value of `loss_sync_interval` should be > 0 (type=value_error)",
+    )
+
+
+def test_contexts() -> None:
+    trainer = Trainer(contexts=["cpu(0)", "cpu(1)"])
+    assert trainer.ctx == mx.cpu(0)
+    assert trainer.contexts == [mx.cpu(0), mx.cpu(1)]
+
+    assert Trainer(ctx=mx.cpu(1)).contexts == [mx.cpu(1)]
+
+
+def test_data_parallel_training() -> None:
+    dataset_info, train_ds, test_ds = constant_dataset()
+    estimator = SimpleFeedForwardEstimator(
+        freq=dataset_info.metadata.freq,
+        prediction_length=dataset_info.prediction_length,
+        trainer=Trainer(
+            contexts=[mx.cpu(0), mx.cpu(1)],
+            epochs=2,
+            num_batches_per_epoch=2,
+            batch_size=5,
+        ),
+    )
+
+    predictor = estimator.train(train_ds)
+
+    assert len(list(predictor.predict(test_ds))) == len(list(test_ds))
+
+
+@pytest.mark.parametrize("in_memory_snapshots", [False, True])
+def test_data_parallel_best_epoch_snapshots(
+    tmp_path, in_memory_snapshots: bool
+) -> None:
+    # the parameters of the best epoch are restored after every epoch, and
+    # the states of the optimizer are then saved to the checkpoints
+    dataset_info, train_ds, test_ds = constant_dataset()
+    estimator = SimpleFeedForwardEstimator(
+        freq=dataset_info.metadata.freq,
+        prediction_length=dataset_info.prediction_length,
+        trainer=Trainer(
+            contexts=[mx.cpu(0), mx.cpu(1)],
+            epochs=3,
+            num_batches_per_epoch=2,
+            batch_size=5,
+            learning_rate_decay_factor=0.1,
+            patience=0,
+            in_memory_snapshots=in_memory_snapshots,
+            checkpoint_dir=str(tmp_path),
+        ),
+    )
+
+    predictor = estimator.train(train_ds)
+
+    assert len(list(predictor.predict(test_ds))) == len(list(test_ds))
+    assert (tmp_path / "checkpoint-0003" / "trainer.states").exists()
+
+
+def test_parameter_snapshot() -> None:
+    net = mx.gluon.nn.Dense(units=2, in_units=3)
+    net.initialize()
+    expected = net.weight.data().asnumpy()
+
+    snapshot = ParameterSnapshot(net)
+    net.weight.set_data(mx.nd.zeros((2, 3)))
+    snapshot.restore(net)
+
+    assert (net.weight.data().asnumpy() == expected).all()
+
+
+@pytest.mark.parametrize("in_memory_snapshots", [False, True])
+def test_best_epoch_snapshots(in_memory_snapshots: bool) -> None:
+    dataset_info, train_ds, test_ds = constant_dataset()
+    estimator = SimpleFeedForwardEstimator(
+        freq=dataset_info.metadata.freq,
+        prediction_length=dataset_info.prediction_length,
+        trainer=Trainer(
+            epochs=3,
+            num_batches_per_epoch=2,
+            batch_size=5,
+            learning_rate_decay_factor=0.1,
+            patience=0,
+            in_memory_snapshots=in_memory_snapshots,
+            loss_sync_interval=3,
+            progress_bar_refresh_interval=1.0,
+        ),
+    )
+
+    predictor = estimator.train(train_ds)
+
+    assert len(list(predictor.predict(test_ds))) == len(list(test_ds))
+
+
+def test_resume_training(tmp_path) -> None:
+    dataset_info, train_ds, test_ds = constant_dataset()
+
+    def make_estimator(epochs: int) -> SimpleFeedForwardEstimator:
+        return SimpleFeedForwardEstimator(
+            freq=dataset_info.metadata.freq,
+            prediction_length=dataset_info.prediction_length,
+            trainer=Trainer(
+                epochs=epochs,
+                num_batches_per_epoch=2,
+                batch_size=5,
+                checkpoint_dir=str(tmp_path),
+            ),
+        )
+
+    make_estimator(epochs=2).train(train_ds, resume_from=str(tmp_path))
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "checkpoint-0002"
+    ]
+    assert sorted(
+        path.name for path in (tmp_path / "checkpoint-0002").iterdir()
+    ) == [
+        "best.params",
+        "params",
+        "random.pkl",
+        "state.json",
+        "trainer.states",
+    ]
+
+    # the training resumes at the third epoch
+    predictor = make_estimator(epochs=3).train(
+        train_ds, resume_from=str(tmp_path)
+    )
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "checkpoint-0003"
+    ]
+    assert len(list(predictor.predict(test_ds))) == len(list(test_ds))
+
+
+def test_dynamic_loss_scaler() -> None:
+    net = mx.gluon.nn.Dense(units=2, in_units=3, dtype="float16")
+    net.initialize()
+    loss_scaler = DynamicLossScaler(initial_scale=8.0, scale_window=2)
+
+    net.weight.grad()[:] = 1.0
+    assert not loss_scaler.has_overflow(net)
+
+    net.weight.grad()[:] = np.inf
+    assert loss_scaler.has_overflow(net)
+
+    loss_scaler.update(overflow=True)
+    assert loss_scaler.loss_scale == 4.0
+    loss_scaler.update(overflow=False)
+    loss_scaler.update(overflow=False)
+    assert loss_scaler.loss_scale == 8.0
+
+
+def test_reset_master_weights() -> None:
+    learning_rate = 0.1
+    net = mx.gluon.nn.Dense(units=2, in_units=3, dtype="float16")
+    net.initialize()
+    trainer = mx.gluon.Trainer(
+        net.collect_params(),
+        optimizer=mx.optimizer.Adam(
+            learning_rate=learning_rate, multi_precision=True
+        ),
+    )
+
+    def step() -> None:
+        with mx.autograd.record():
+            loss = net(mx.nd.ones((1, 3), dtype="float16")).sum()
+        loss.backward()
+        trainer.step(batch_size=1)
+
+    step()
+    snapshot = ParameterSnapshot(net)
+    for _ in range(10):
+        step()
+
+    snapshot.restore(net)
+    reset_master_weights(trainer)
+    step()
+
+    # an update moves each parameter by about the learning rate, from the
+    # restored parameters rather than from the last ones
+    for name, param in net._collect_params_with_prefix().items():
+        difference = param.data().asnumpy() - snapshot.arrays[name].asnumpy()
+        assert (np.abs(difference) < 2 * learning_rate).all()
+
+
 def assert_valid_param(param_name: str, param_values: List[Any]) -> None:
     try:
         for x in param_values: